@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
 # --- Nodos y Lista para Polinomios ---
 
 class PolyNode:
@@ -39,6 +44,59 @@ class LinkedList:
             last_node = last_node.next
         last_node.next = new_node
 
+class TermArray:
+    """Almacenamiento compacto de términos en dos arreglos paralelos.
+    Los grados (array('q')) se mantienen ordenados de menor a mayor y cada
+    coeficiente (array('d')) ocupa la misma posición que su grado, por lo que
+    las búsquedas son binarias y los recorridos son sobre memoria contigua.
+    """
+    def __init__(self, degrees=None, coefficients=None):
+        """Inicializa el almacenamiento, opcionalmente con arreglos ya ordenados.
+
+        Args:
+            degrees (array, optional): Grados en orden ascendente. Defaults to None.
+            coefficients (array, optional): Coeficientes alineados con los grados. Defaults to None.
+            También se aceptan memoryviews de solo lectura (por ejemplo, sobre un archivo
+            mapeado en memoria); se copian a arreglos la primera vez que se modifican.
+        """
+        self.degrees = degrees if degrees is not None else array('q')
+        self.coefficients = coefficients if coefficients is not None else array('d')
+
+    def make_writable(self):
+        """Copia las columnas a arreglos propios si todavía son vistas de solo lectura."""
+        if not isinstance(self.degrees, array):
+            self.degrees = array('q', self.degrees)
+        if not isinstance(self.coefficients, array):
+            self.coefficients = array('d', self.coefficients)
+
+    def __len__(self):
+        """Devuelve el número de términos almacenados."""
+        return len(self.degrees)
+
+    def find(self, degree):
+        """Devuelve la posición del grado, o None si no está almacenado."""
+        index = bisect_left(self.degrees, degree)
+        if index < len(self.degrees) and self.degrees[index] == degree:
+            return index
+        return None
+
+    def insert(self, coefficient, degree):
+        """Inserta un grado nuevo en su posición ordenada."""
+        self.make_writable()
+        index = bisect_left(self.degrees, degree)
+        self.degrees.insert(index, degree)
+        self.coefficients.insert(index, coefficient)
+
+    def remove_at(self, index):
+        """Elimina el término en la posición indicada."""
+        self.make_writable()
+        del self.degrees[index]
+        del self.coefficients[index]
+
+    def copy(self):
+        """Devuelve una copia independiente de ambos arreglos."""
+        return TermArray(array('q', self.degrees), array('d', self.coefficients))
+
 # --- Estructuras Genéricas (Pila y Cola) ---
 
 class Node:
@@ -120,3 +178,74 @@ class Queue:
         if self.is_empty():
             return None
         return self.head.value
+
+class LRUCache:
+    """Caché LRU (Least Recently Used) limitada por un presupuesto de bytes.
+    Cada entrada se guarda con un tamaño estimado; al superar el presupuesto se
+    descartan las entradas usadas hace más tiempo. Lleva contadores de aciertos,
+    fallos y desalojos. Es segura entre hilos: incluso get reordena las entradas.
+    """
+    def __init__(self, max_bytes):
+        """Inicializa una caché vacía.
+
+        Args:
+            max_bytes (int): Tamaño total máximo (estimado) de las entradas.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict() # clave -> (valor, tamaño), de la menos a la más reciente
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Devuelve el número de entradas guardadas."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Comprueba si hay una entrada para la clave (sin contarlo como acceso)."""
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Devuelve el valor de la clave y la marca como la más reciente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        """Guarda un valor con su tamaño estimado, desalojando las entradas más antiguas si hace falta."""
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return # Una entrada mayor que todo el presupuesto no se guarda.
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Elimina todas las entradas (los contadores se conservan)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Devuelve los contadores y la ocupación de la caché."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Mediciones de rendimiento del modelo de polinomios.
+Se ejecuta directamente (python pol_benchmark.py) y no forma parte de la aplicación Flet.
+"""
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import pol_model
+import pol_roots
+from pol_model import Polynomial
+
+
+def _timed(func, *args, **kwargs):
+    """Ejecuta una función y devuelve su resultado junto con el tiempo transcurrido en segundos."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def benchmark_multipoint(sizes=(1024, 2048, 4096, 8192, 16384, 32768, 65536), seed=0):
+    """
+    Compara Horner con la evaluación multipunto por árbol de subproductos.
+    Para cada n evalúa un polinomio denso de n términos en n puntos repartidos por la
+    circunferencia unidad (el caso en que el árbol está bien condicionado).
+
+    Returns:
+        int or None: El menor n en que el árbol fue más rápido que Horner.
+    """
+    rng = np.random.default_rng(seed)
+    crossover = None
+    print(f"{'n':>8} {'horner (s)':>12} {'árbol (s)':>12} {'error rel.':>12}")
+    for n in sizes:
+        poly = Polynomial._from_dense(rng.standard_normal(n))
+        points = np.exp(2j * np.pi * (np.arange(n) + rng.uniform(-0.3, 0.3, n)) / n)
+        horner, horner_time = _timed(poly.evaluate, points, method="horner")
+        tree, tree_time = _timed(poly.evaluate, points, method="multipoint")
+        error = np.abs(horner - tree).max() / np.abs(horner).max()
+        print(f"{n:>8} {horner_time:>12.4f} {tree_time:>12.4f} {error:>12.2e}")
+        if crossover is None and tree_time < horner_time:
+            crossover = n
+    print(f"Cruce: {crossover} (MULTIPOINT_THRESHOLD = {pol_model.MULTIPOINT_THRESHOLD})")
+    return crossover
+
+
+def benchmark_backends(n=1_000_000, searches=10_000, seed=0):
+    """
+    Compara el almacenamiento enlazado (PolyNode) con el de arreglos (TermArray)
+    para un polinomio de n términos: memoria ocupada, construcción, suma y búsquedas.
+    """
+    rng = random.Random(seed)
+    terms = [(rng.uniform(-10, 10), 2 * degree) for degree in range(n)]
+    others = [(rng.uniform(-10, 10), 3 * degree) for degree in range(n)]
+    lookups = [rng.randrange(2 * n) for _ in range(searches)]
+    print(f"{'backend':>8} {'memoria (MB)':>13} {'construir (s)':>14} {'sumar (s)':>10} {'buscar (s)':>11}")
+    for backend in ("linked", "array"):
+        poly_class = pol_model.BACKENDS[backend]
+        tracemalloc.start()
+        poly, build_time = _timed(poly_class.from_terms, terms)
+        memory = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+        other = poly_class.from_terms(others)
+        _, add_time = _timed(poly.__add__, other)
+        # En la lista enlazada cada búsqueda recorre la lista: se mide una muestra.
+        sample = lookups if backend == "array" else lookups[:20]
+        _, search_time = _timed(lambda: [poly.search_term(degree) for degree in sample])
+        search_time *= len(lookups) / len(sample)
+        print(f"{backend:>8} {memory:>13.1f} {build_time:>14.3f} {add_time:>10.3f} {search_time:>11.3f}")
+
+
+def benchmark_serialization(n=1_000_000, seed=0):
+    """
+    Compara guardar y cargar un polinomio de n términos como texto y en el formato binario
+    de pol_io, para ambos backends.
+    """
+    rng = random.Random(seed)
+    terms = [(rng.uniform(-10, 10), 2 * degree) for degree in range(n)]
+    print(f"{'backend':>8} {'formato':>8} {'tamaño (MB)':>12} {'guardar (s)':>12} {'cargar (s)':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in ("linked", "array"):
+            poly_class = pol_model.BACKENDS[backend]
+            poly = poly_class.from_terms(terms)
+            text_path = os.path.join(directory, f"{backend}.txt")
+            binary_path = os.path.join(directory, f"{backend}.poly")
+
+            def save_text():
+                with open(text_path, "w", encoding="utf-8") as file:
+                    file.write(str(poly))
+
+            _, save_time = _timed(save_text)
+            loaded, load_time = _timed(poly_class.load_text, text_path)
+            print(f"{backend:>8} {'texto':>8} {os.path.getsize(text_path) / 2**20:>12.1f} {save_time:>12.3f} {load_time:>11.3f}")
+            _, save_time = _timed(poly.save_binary, binary_path)
+            loaded, load_time = _timed(poly_class.load_binary, binary_path)
+            assert loaded._desc_pairs() == poly._desc_pairs()
+            print(f"{backend:>8} {'binario':>8} {os.path.getsize(binary_path) / 2**20:>12.1f} {save_time:>12.3f} {load_time:>11.3f}")
+            del loaded
+
+
+def _naive_compose(p, q):
+    """Composición por expansión directa: suma c_i·q^i, obteniendo cada potencia de la anterior."""
+    result = type(p)()
+    power = type(p).from_terms([(1.0, 0)])
+    exponent = 0
+    for degree, coefficient in reversed(p._desc_pairs()):
+        while exponent < degree:
+            power = power * q
+            exponent += 1
+        result = result + type(p).from_terms((coefficient * c, d) for c, d in power._iter_terms())
+    return result
+
+
+def benchmark_composition(degrees=(250, 500, 1000, 2000, 4000), inner_degree=3, naive_limit=1000, seed=0):
+    """
+    Compara Polynomial.compose con la expansión directa para un p denso de cada grado y
+    un q denso de grado inner_degree. La expansión directa solo se mide hasta naive_limit.
+    Los coeficientes de q son pequeños para que las potencias altas no desborden.
+    """
+    rng = np.random.default_rng(seed)
+    inner = Polynomial._from_dense(rng.uniform(-1, 1, inner_degree + 1) / (inner_degree + 1))
+    print(f"{'grado':>8} {'compose (s)':>12} {'directa (s)':>12} {'aceleración':>12}")
+    for degree in degrees:
+        outer = Polynomial._from_dense(rng.uniform(-1, 1, degree + 1))
+        _, compose_time = _timed(outer.compose, inner)
+        if degree <= naive_limit:
+            _, naive_time = _timed(_naive_compose, outer, inner)
+            print(f"{degree:>8} {compose_time:>12.4f} {naive_time:>12.3f} {naive_time / compose_time:>11.0f}x")
+        else:
+            print(f"{degree:>8} {compose_time:>12.4f} {'-':>12} {'-':>12}")
+
+
+def benchmark_roots(degrees=(32, 64, 128, 256, 512, 1000, 2000), eigen_limit=1000, real_limit=500, seed=0):
+    """
+    Compara la matriz compañera con la iteración de Aberth para polinomios densos con
+    coeficientes normales de cada grado, y mide el aislamiento exacto de las raíces reales
+    hasta real_limit. La caché de raíces se vacía antes de cada medición.
+
+    Returns:
+        int or None: El menor grado en que Aberth fue más rápido que la matriz compañera.
+    """
+    rng = np.random.default_rng(seed)
+    crossover = None
+    print(f"{'grado':>8} {'compañera (s)':>14} {'aberth (s)':>12} {'distancia':>12} {'reales (s)':>12}")
+    for degree in degrees:
+        poly = Polynomial._from_dense(rng.standard_normal(degree + 1))
+        pol_roots._cache.clear()
+        aberth, aberth_time = _timed(pol_roots.complex_roots, poly, method="aberth")
+        eigen_text = distance_text = real_text = "-"
+        if degree <= eigen_limit:
+            eigen, eigen_time = _timed(pol_roots.complex_roots, poly, method="eigen")
+            # Distancia de cada raíz de Aberth a la más cercana de la matriz compañera.
+            distance = np.abs(aberth[:, None] - eigen[None, :]).min(axis=1).max()
+            eigen_text, distance_text = f"{eigen_time:.4f}", f"{distance:.2e}"
+            if crossover is None and aberth_time < eigen_time:
+                crossover = degree
+        if degree <= real_limit:
+            _, real_time = _timed(pol_roots.real_roots, poly)
+            real_text = f"{real_time:.3f}"
+        print(f"{degree:>8} {eigen_text:>14} {aberth_time:>12.4f} {distance_text:>12} {real_text:>12}")
+    print(f"Cruce: {crossover} (EIGEN_MAX_DEGREE = {pol_roots.EIGEN_MAX_DEGREE})")
+    return crossover
+
+
+if __name__ == "__main__":
+    benchmark_multipoint()
+    benchmark_backends()
+    benchmark_serialization()
+    benchmark_composition()
+    benchmark_roots()
@@ -2,10 +2,33 @@
 """
 Este módulo contiene la implementación del controlador para la aplicación de polinomios.
 """
+import functools
+import threading
+from collections import namedtuple
+
 import flet as ft
 
 from pol_model import PolynomialModel
+from pol_parser import PolynomialSyntaxError
 from pol_view import PolynomialView
+from pol_worker import QueueWorker, WorkerEvent
+
+# Segundos sin escribir antes de recalcular el resultado en vivo.
+LIVE_DELAY = 0.15
+
+# Resultado de un cálculo en vivo, publicado por el pubsub de la página: el número de la
+# edición que lo originó y (vista previa, editable) del resultado, o None y el mensaje
+# que explica por qué no se calculó.
+LiveResult = namedtuple("LiveResult", "generation result message")
+
+
+def _with_model_lock(handler):
+    """Ejecuta el manejador sosteniendo model.lock, para no modificar el estado a la vez que el hilo de la cola."""
+    @functools.wraps(handler)
+    def wrapper(self, e):
+        with self.model.lock:
+            return handler(self, e)
+    return wrapper
 
 class PolynomialController:
     """
@@ -27,10 +50,15 @@ class PolynomialController:
         self.view = PolynomialView(
             on_add=self.handle_add,
             on_subtract=self.handle_subtract,
+            on_multiply=self.handle_multiply,
+            on_compose=self.handle_compose,
             on_delete=self.handle_delete,
             on_search=self.handle_search,
             on_sort_asc=self.handle_sort_asc,
             on_sort_desc=self.handle_sort_desc,
+            on_derivative=self.handle_derivative,
+            on_integral=self.handle_integral,
+            on_roots=self.handle_roots,
             on_add_term=self.handle_add_term,
             on_clear_history=self.handle_clear_history,
             on_undo=self.handle_undo,
@@ -41,76 +69,206 @@ class PolynomialController:
             on_enqueue_sort_asc=self.handle_enqueue_sort_asc,
             on_enqueue_sort_desc=self.handle_enqueue_sort_desc,
             on_process_queue=self.handle_process_queue,
+            on_drain_queue=self.handle_drain_queue,
+            on_export=self.handle_export,
+            on_export_result=self.handle_export_result,
+            on_result_edit=self.handle_result_edit,
+            on_show_more=self.handle_show_more,
+            on_poly_input=self.handle_poly_input,
         )
+        # El selector de archivos es un control no visual: debe vivir en la capa superpuesta de la página.
+        self.page.overlay.append(self.view.export_picker)
+        # La cola se procesa en un hilo de trabajo que publica su progreso por el pubsub de la página,
+        # que es seguro entre hilos.
+        self.worker = QueueWorker(model, self.page.pubsub.send_all)
+        self.page.pubsub.subscribe(self._on_worker_event)
+        # Cálculo en vivo: cada edición de un operando incrementa la generación y reprograma el
+        # temporizador; un cálculo cuya generación ya no es la última se abandona o se descarta.
+        self._live_operation = "add" # La última operación elegida con los botones
+        self._live_generation = 0
+        self._live_timer = None
+        self.page.pubsub.subscribe(self._on_live_result)
+
+    def show_model_state(self):
+        """Muestra en la vista el estado actual del modelo (por ejemplo, tras restaurar una sesión)."""
+        for field, poly in ((self.view.poly1_input, self.model.poly1), (self.view.poly2_input, self.model.poly2)):
+            text = str(poly)
+            field.value = "" if text == "0" else text # Un operando vacío deja el campo vacío.
+        self.view.update_result(*self.model.get_result_view())
+        self.update_data_views()
 
     def update_data_views(self):
         """Actualiza las vistas de datos (historial y cola) en la UI."""
-        self.view.update_history(self.model.get_history_list())
-        self.view.update_queue(self.model.get_queue_list())
-
-    def _get_result_poly(self):
-        """Obtiene el polinomio actual del campo de resultado de la vista y lo actualiza en el modelo."""
-        result_str = self.view.result_value.value or "0"
-        self.model.result = self.model._parse_poly(result_str)
+        # Solo se piden las filas visibles; la vista aplica las diferencias con lo que ya muestra.
+        self.view.update_history(*self.model.history_window(self.view.history_limit))
+        self.view.update_queue(*self.model.queue_window(self.view.queue_limit))
 
     def _update_views_with_new_result(self, e):
         """Actualiza la UI con el nuevo resultado del modelo y guarda el estado en el historial."""
         self.view.update_message("") # Limpia mensajes anteriores.
-        new_result_str = str(self.model.result)
-        self.view.update_result(new_result_str)
+        # Solo se muestra la vista previa; el texto completo se genera al exportar.
+        self.view.update_result(*self.model.get_result_view())
         self.update_data_views()
         e.page.update() # Actualiza la página de Flet para reflejar los cambios.
 
-    def handle_add(self, e):
-        """Manejador para la operación de suma."""
+    def _sync_result(self, e) -> bool:
+        """
+        Si el usuario editó el texto del resultado, lo analiza antes de operar con él.
+        Sin ediciones no se analiza nada: el modelo ya tiene el resultado.
+        """
+        try:
+            self.model.sync_result()
+        except ValueError as error:
+            self.view.update_message(f"Resultado no válido: {error}")
+            e.page.update()
+            return False
+        return True
+
+    def handle_result_edit(self, e):
+        """Registra en el modelo que el usuario editó el texto del resultado."""
+        with self.model.lock:
+            self._cancel_live()
+            self.model.edit_result(e.control.value or "")
+
+    def _load_operands(self, e) -> bool:
+        """Carga en el modelo los polinomios de la vista; si alguno no es válido, muestra el error."""
         poly1_str = self.view.get_poly1_str()
         poly2_str = self.view.get_poly2_str()
-        self.model.set_polynomials(poly1_str, poly2_str)
+        try:
+            self.model.set_polynomials(poly1_str, poly2_str)
+        except ValueError as error:
+            self.view.update_message(f"Polinomio no válido: {error}")
+            e.page.update()
+            return False
+        return True
+
+    def handle_poly_input(self, e):
+        """Programa el cálculo en vivo para cuando el usuario deje de escribir."""
+        self._live_generation += 1
+        if self._live_timer is not None:
+            self._live_timer.cancel()
+        self._live_timer = threading.Timer(
+            LIVE_DELAY, self._live_compute,
+            (self._live_generation, self.view.get_poly1_str(), self.view.get_poly2_str()))
+        self._live_timer.daemon = True
+        self._live_timer.start()
+
+    def _cancel_live(self):
+        """
+        Descarta el cálculo en vivo programado o en curso, porque el resultado va a cambiar por
+        otra vía (un botón, una edición o la cola): publicarlo después lo sobrescribiría.
+        """
+        self._live_generation += 1
+        if self._live_timer is not None:
+            self._live_timer.cancel()
+            self._live_timer = None
+
+    def _live_compute(self, generation, poly1_str, poly2_str):
+        """Calcula el resultado en vivo (en el hilo del temporizador) y lo publica si sigue vigente."""
+        stale = lambda: generation != self._live_generation
+        try:
+            computed = self.model.live_compute(self._live_operation, poly1_str, poly2_str, stale)
+        except PolynomialSyntaxError:
+            return # Mientras se escribe, un texto a medias no es un error que mostrar.
+        except ValueError as error:
+            if not stale():
+                self.page.pubsub.send_all(LiveResult(generation, None, str(error)))
+            return
+        if computed and not stale():
+            with self.model.lock:
+                view = self.model.get_result_view()
+            self.page.pubsub.send_all(LiveResult(generation, view, ""))
+
+    def _on_live_result(self, message):
+        """Muestra un resultado en vivo, salvo que ya haya una edición más reciente."""
+        if not isinstance(message, LiveResult) or message.generation != self._live_generation: return
+        if message.result is not None:
+            self.view.update_result(*message.result)
+        self.view.update_message(message.message)
+        self.page.update()
+
+    @_with_model_lock
+    def handle_add(self, e):
+        """Manejador para la operación de suma."""
+        self._cancel_live()
+        self._live_operation = "add"
+        if not self._load_operands(e): return
         self.model.add()
-        self.model.history.push(self.model.result.clone()) # Guarda el resultado en el historial.
+        self.model.push_history() # Guarda el resultado en el historial.
         self._update_views_with_new_result(e)
 
+    @_with_model_lock
     def handle_subtract(self, e):
         """Manejador para la operación de resta."""
-        poly1_str = self.view.get_poly1_str()
-        poly2_str = self.view.get_poly2_str()
-        self.model.set_polynomials(poly1_str, poly2_str)
+        self._cancel_live()
+        self._live_operation = "subtract"
+        if not self._load_operands(e): return
         self.model.subtract()
-        self.model.history.push(self.model.result.clone())
+        self.model.push_history()
         self._update_views_with_new_result(e)
 
+    @_with_model_lock
+    def handle_multiply(self, e):
+        """Manejador para la operación de multiplicación."""
+        self._cancel_live()
+        self._live_operation = "multiply"
+        if not self._load_operands(e): return
+        self.model.multiply()
+        self.model.push_history()
+        self._update_views_with_new_result(e)
+
+    @_with_model_lock
+    def handle_compose(self, e):
+        """Manejador para la composición p1(p2(x))."""
+        self._cancel_live()
+        self._live_operation = "compose"
+        if not self._load_operands(e): return
+        try:
+            self.model.compose()
+        except ValueError as error:
+            self.view.update_message(f"No se puede componer: {error}")
+            e.page.update()
+            return
+        self.model.push_history()
+        self._update_views_with_new_result(e)
+
+    @_with_model_lock
     def handle_add_term(self, e):
         """Manejador para añadir un término al polinomio de resultado."""
+        self._cancel_live()
         coeff_str = self.view.get_coeff_str()
         degree_str = self.view.get_degree_term_str()
         if not coeff_str or not degree_str: return
+        if not self._sync_result(e): return
 
-        self._get_result_poly() # Obtiene el polinomio actual de la vista.
         self.model.result.add_term(coeff_str, degree_str)
-        self.model.history.push(self.model.result.clone())
+        self.model.push_history()
         self._update_views_with_new_result(e)
 
+    @_with_model_lock
     def handle_delete(self, e):
         """Manejador para eliminar un término del polinomio de resultado."""
+        self._cancel_live()
         degree_str = self.view.get_degree_str()
         if not degree_str: return
+        if not self._sync_result(e): return
 
-        self._get_result_poly()
         deleted = self.model.result.delete_term(degree_str)
         
         if deleted:
-            self.model.history.push(self.model.result.clone())
+            self.model.push_history()
             self._update_views_with_new_result(e)
         else:
             self.view.update_message(f"Término con grado {degree_str} no encontrado.")
             e.page.update()
 
+    @_with_model_lock
     def handle_search(self, e):
         """Manejador para buscar un término en el polinomio de resultado."""
         degree_str = self.view.get_degree_str()
         if not degree_str: return
+        if not self._sync_result(e): return
 
-        self._get_result_poly()
         coefficient = self.model.result.search_term(degree_str)
 
         if coefficient is not None:
@@ -123,20 +281,83 @@ class PolynomialController:
         self.update_data_views()
         e.page.update()
 
+    @_with_model_lock
     def handle_sort_asc(self, e):
         """Manejador para ordenar el polinomio de resultado de forma ascendente."""
-        self._get_result_poly()
+        self._cancel_live()
+        if not self._sync_result(e): return
         self.model.result.sort_terms(ascending=True)
-        self.model.history.push(self.model.result.clone())
+        self.model.push_history()
         self._update_views_with_new_result(e)
 
+    @_with_model_lock
     def handle_sort_desc(self, e):
         """Manejador para ordenar el polinomio de resultado de forma descendente."""
-        self._get_result_poly()
+        self._cancel_live()
+        if not self._sync_result(e): return
         self.model.result.sort_terms(ascending=False)
-        self.model.history.push(self.model.result.clone())
+        self.model.push_history()
+        self._update_views_with_new_result(e)
+
+    @_with_model_lock
+    def handle_derivative(self, e):
+        """Manejador para derivar el polinomio de resultado."""
+        self._cancel_live()
+        if not self._sync_result(e): return
+        self.model.result.derivative()
+        self.model.push_history()
+        self._update_views_with_new_result(e)
+
+    @_with_model_lock
+    def handle_integral(self, e):
+        """Manejador para reemplazar el polinomio de resultado por su primitiva."""
+        self._cancel_live()
+        if not self._sync_result(e): return
+        try:
+            self.model.result.integral()
+        except ValueError as error:
+            self.view.update_message(f"No se puede integrar: {error}")
+            e.page.update()
+            return
+        self.model.push_history()
         self._update_views_with_new_result(e)
 
+    @_with_model_lock
+    def handle_roots(self, e):
+        """Manejador para mostrar las raíces del polinomio de resultado."""
+        if not self._sync_result(e): return
+        try:
+            message = self.model.get_result_roots_view()
+        except ValueError as error:
+            message = f"No se pueden calcular las raíces: {error}"
+        # Las raíces solo se muestran como mensaje, no modifican el resultado.
+        self.view.update_message(message)
+        self.update_data_views()
+        e.page.update()
+
+    def handle_show_more(self, e):
+        """Rellena el historial y la cola después de ampliar su ventana visible."""
+        self.update_data_views()
+        e.page.update()
+
+    def handle_export(self, e):
+        """Manejador para exportar el resultado completo: abre el diálogo para elegir el archivo."""
+        self.view.ask_export_path()
+
+    def handle_export_result(self, e: ft.FilePickerResultEvent):
+        """Escribe el resultado completo en el archivo elegido en el diálogo de exportación."""
+        if not e.path: return # El usuario canceló el diálogo.
+        with self.model.lock:
+            if not self._sync_result(e): return
+        try:
+            self.model.export_result(e.path)
+        except OSError as error:
+            self.view.update_message(f"No se pudo exportar el resultado: {error}")
+        else:
+            self.view.update_message(f"Resultado exportado a {e.path}")
+        e.page.update()
+
+    @_with_model_lock
     def handle_clear_history(self, e):
         """Manejador para limpiar el historial de operaciones."""
         self.view.update_message("")
@@ -145,67 +366,89 @@ class PolynomialController:
         self.view.container.update()
         e.page.update()
 
+    @_with_model_lock
     def handle_undo(self, e):
         """Manejador para la acción de deshacer la última operación."""
+        self._cancel_live()
         self.model.undo()
         self._update_views_with_new_result(e)
 
     # --- Manejadores para la Cola de Operaciones ---
 
+    def _enqueue(self, e, operation_type, *args):
+        """Encola una operación en el modelo; si sus argumentos no son válidos, muestra el error."""
+        try:
+            self.model.enqueue_operation(operation_type, *args)
+        except ValueError as error:
+            self.view.update_message(f"Operación no válida: {error}")
+        else:
+            self.update_data_views()
+        e.page.update()
+
     def handle_enqueue_add(self, e):
         """Encola una operación de suma."""
         poly1_str = self.view.get_poly1_str()
         poly2_str = self.view.get_poly2_str()
-        self.model.enqueue_operation("add", poly1_str, poly2_str)
-        self.update_data_views()
-        e.page.update()
+        self._enqueue(e, "add", poly1_str, poly2_str)
 
     def handle_enqueue_subtract(self, e):
         """Encola una operación de resta."""
         poly1_str = self.view.get_poly1_str()
         poly2_str = self.view.get_poly2_str()
-        self.model.enqueue_operation("subtract", poly1_str, poly2_str)
-        self.update_data_views()
-        e.page.update()
+        self._enqueue(e, "subtract", poly1_str, poly2_str)
 
     def handle_enqueue_add_term(self, e):
         """Encola una operación para añadir un término."""
         coeff_str = self.view.get_coeff_str()
         degree_str = self.view.get_degree_term_str()
         if not coeff_str or not degree_str: return
-        self.model.enqueue_operation("add_term", coeff_str, degree_str)
-        self.update_data_views()
-        e.page.update()
+        self._enqueue(e, "add_term", coeff_str, degree_str)
 
     def handle_enqueue_delete_term(self, e):
         """Encola una operación para eliminar un término."""
         degree_str = self.view.get_degree_str()
         if not degree_str: return
-        self.model.enqueue_operation("delete_term", degree_str)
-        self.update_data_views()
-        e.page.update()
+        self._enqueue(e, "delete_term", degree_str)
 
     def handle_enqueue_sort_asc(self, e):
         """Encola una operación para ordenar ascendentemente."""
-        self.model.enqueue_operation("sort_asc")
-        self.update_data_views()
-        e.page.update()
+        self._enqueue(e, "sort_asc")
 
     def handle_enqueue_sort_desc(self, e):
         """Encola una operación para ordenar descendentemente."""
-        self.model.enqueue_operation("sort_desc")
-        self.update_data_views()
-        e.page.update()
+        self._enqueue(e, "sort_desc")
 
     def handle_process_queue(self, e):
-        """Procesa la siguiente operación en la cola."""
-        # Antes de procesar, se asegura que el modelo tenga los polinomios más recientes de la vista.
-        poly1_str = self.view.get_poly1_str()
-        poly2_str = self.view.get_poly2_str()
-        self.model.set_polynomials(poly1_str, poly2_str)
+        """Pide al hilo de trabajo que procese la cola operación por operación."""
+        # Las operaciones parten del resultado: una edición pendiente se analiza antes de procesarlas.
+        with self.model.lock:
+            self._cancel_live()
+            if not self._sync_result(e): return
+        # Las operaciones llevan sus operandos capturados al encolarlas: no se leen de la vista.
+        self.worker.process()
+        self.view.update_message("Procesando la cola...")
+        e.page.update()
 
-        was_processed = self.model.process_queue()
-        if was_processed:
-            # Si se procesó una operación, se guarda el resultado y se actualiza la UI.
-            self.model.history.push(self.model.result.clone())
-            self._update_views_with_new_result(e)
+    def handle_drain_queue(self, e):
+        """Pide al hilo de trabajo que procese toda la cola de una vez (un solo guardado en el historial)."""
+        with self.model.lock:
+            self._cancel_live()
+            if not self._sync_result(e): return
+        self.worker.drain()
+        self.view.update_message("Procesando la cola completa...")
+        e.page.update()
+
+    def _on_worker_event(self, event):
+        """Muestra en la vista el progreso publicado por el hilo de trabajo."""
+        if not isinstance(event, WorkerEvent): return
+        if event.kind == "start":
+            self.view.update_message(f"Procesando: {event.description} ({event.pending} en cola)")
+        elif event.kind == "done":
+            self.view.update_result(*event.result)
+            self.view.update_message(f"Terminado: {event.description} ({event.processed} procesadas, {event.pending} en cola)")
+        elif event.kind == "error":
+            self.view.update_message(f"Error en {event.description}: {event.result}")
+        else:
+            self.view.update_message("Cola procesada.")
+        self.update_data_views()
+        self.page.update()
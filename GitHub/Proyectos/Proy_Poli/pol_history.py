@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo contiene el historial acotado de resultados usado para deshacer.
+En lugar de guardar cada polinomio completo, guarda cada cierto número de pasos
+un fotograma clave (todos los términos) y, entre ellos, solo los términos que
+cambiaron respecto al paso anterior. El historial tiene un límite de entradas y
+de bytes; al superarlo descarta las entradas más antiguas.
+
+Guardar un paso cuesta lo que ocupan sus cambios: el número de términos de la cima se
+lleva al día con los cambios y la vista previa de cada entrada se calcula la primera vez
+que se muestra, no al guardarla.
+"""
+
+import functools
+import threading
+from array import array
+from collections import deque
+from itertools import islice
+
+# Número máximo de entradas que conserva el historial.
+HISTORY_MAX_ENTRIES = 500
+# Presupuesto (estimado) en bytes de todas las entradas.
+HISTORY_MAX_BYTES = 64 * 2**20
+# Cada cuántas entradas se guarda un fotograma clave completo.
+KEYFRAME_INTERVAL = 16
+
+def _locked(method):
+    """Ejecuta el método sosteniendo el candado del historial."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# Memoria fija estimada de cada entrada (objeto, arreglos vacíos, referencias y una vista
+# previa de 2·PREVIEW_TERMS términos, que se reserva aunque aún no se haya calculado).
+_ENTRY_OVERHEAD = 1200
+
+
+class HistoryEntry:
+    """
+    Una entrada del historial. Los términos se guardan en arreglos compactos de mayor a menor grado:
+    si es un fotograma clave son todos los términos; si no, son los cambios respecto a la
+    entrada anterior, donde un coeficiente 0.0 indica que el término se eliminó.
+    """
+    __slots__ = ("keyframe", "degrees", "coefficients", "ascending", "preview", "size", "serial")
+
+    def __init__(self, keyframe, pairs, ascending, preview):
+        """
+        Args:
+            keyframe (bool): True si la entrada guarda el polinomio completo.
+            pairs (list): Pares (grado, coeficiente) descendentes.
+            ascending (bool): Si el polinomio se mostraba en orden ascendente.
+            preview (str | None): Vista previa del polinomio, o None si se calculará al mostrarla.
+        """
+        self._set(keyframe, array('q', [degree for degree, _ in pairs]),
+                  array('d', [coeff for _, coeff in pairs]), ascending, preview)
+
+    @classmethod
+    def from_columns(cls, keyframe, degrees, coefficients, ascending, preview):
+        """
+        Crea una entrada a partir de columnas ya empaquetadas, sin copiarlas.
+        Se usa al restaurar una sesión: las columnas pueden ser memoryviews sobre el
+        archivo mapeado, que solo se leen cuando la entrada se reconstruye.
+        """
+        entry = cls.__new__(cls)
+        entry._set(keyframe, degrees, coefficients, ascending, preview)
+        return entry
+
+    def _set(self, keyframe, degrees, coefficients, ascending, preview):
+        """Asigna los campos y estima el tamaño de la entrada."""
+        self.keyframe = keyframe
+        self.degrees = degrees
+        self.coefficients = coefficients
+        self.ascending = ascending
+        self.preview = preview
+        self.size = _ENTRY_OVERHEAD + 16 * len(degrees)
+        self.serial = None # Número único que le asigna el historial (identifica su fila en la vista)
+
+    def detach(self):
+        """Copia las columnas a arreglos propios si todavía son vistas sobre un archivo."""
+        if not isinstance(self.degrees, array):
+            degrees, coefficients = array('q'), array('d')
+            degrees.frombytes(self.degrees.cast('B'))
+            coefficients.frombytes(self.coefficients.cast('B'))
+            self.degrees, self.coefficients = degrees, coefficients
+
+    def pairs(self):
+        """Devuelve los términos guardados como lista de pares (grado, coeficiente)."""
+        return list(zip(self.degrees.tolist(), self.coefficients.tolist()))
+
+
+class PolynomialHistory:
+    """
+    Pila de resultados con límite de memoria. Ofrece la interfaz de la pila original
+    (push, pop, peek, is_empty) y mantiene el estado de la cima ya construido, de modo
+    que peek no reconstruye nada; solo pop reconstruye la nueva cima a partir de su
+    fotograma clave y, como mucho, KEYFRAME_INTERVAL - 1 cambios.
+
+    Tiene su propio candado: la UI puede leer las entradas (window) sin esperar a
+    model.lock, que el hilo de trabajo sostiene durante toda una operación.
+    """
+
+    def __init__(self, poly_class, max_entries=HISTORY_MAX_ENTRIES, max_bytes=HISTORY_MAX_BYTES,
+                 keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Args:
+            poly_class (type): Clase de Polynomial con la que se reconstruyen los estados.
+            max_entries (int): Número máximo de entradas.
+            max_bytes (int): Presupuesto estimado en bytes de las entradas.
+            keyframe_interval (int): Cada cuántas entradas se guarda un fotograma clave.
+        """
+        self.poly_class = poly_class
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.evictions = 0
+        self._next_serial = 0 # No se reinicia al vaciar: los números nunca se repiten.
+        self._lock = threading.RLock()
+        self.clear()
+
+    @_locked
+    def clear(self):
+        """Vacía el historial."""
+        self._entries = deque() # de la más antigua a la más reciente
+        self._top = None        # estado ya construido de la entrada más reciente (None = aún sin construir)
+        self._top_count = None  # términos de la cima (None = aún sin contar)
+        self._bytes = 0
+        self._since_keyframe = 0
+
+    @_locked
+    def entries(self) -> list:
+        """Devuelve las entradas (HistoryEntry) de la más antigua a la más reciente."""
+        return list(self._entries)
+
+    @_locked
+    def restore(self, entries):
+        """
+        Reemplaza el contenido por entradas ya codificadas, por ejemplo leídas de una sesión.
+        El estado de la cima no se reconstruye hasta que se necesita (peek, pop o push).
+
+        Args:
+            entries (list): Entradas de la más antigua a la más reciente; la primera debe ser un fotograma clave.
+        """
+        self.clear()
+        for entry in entries:
+            self._number(entry)
+        self._entries.extend(entries)
+        self._bytes = sum(entry.size for entry in entries)
+        self._count_since_keyframe()
+        self._evict()
+
+    @_locked
+    def detach(self):
+        """Copia a memoria propia las entradas que todavía leen de un archivo mapeado."""
+        for entry in self._entries:
+            entry.detach()
+
+    @_locked
+    def __len__(self):
+        """Devuelve el número de entradas."""
+        return len(self._entries)
+
+    @_locked
+    def is_empty(self):
+        """Comprueba si el historial está vacío."""
+        return not self._entries
+
+    @_locked
+    def push(self, poly):
+        """
+        Añade el estado de un polinomio a la cima del historial.
+        Se guarda como cambios respecto a la cima anterior salvo que toque un fotograma
+        clave o que los cambios ocupen tanto como el polinomio completo. Solo un fotograma
+        clave recorre el polinomio entero; unos cambios cuestan lo que ocupan.
+
+        Args:
+            poly (Polynomial): El polinomio a guardar; el historial guarda su propia instantánea.
+        """
+        state = poly.snapshot()
+        ascending = is_ascending(state)
+        changes = None
+        if self._entries and self._since_keyframe < self.keyframe_interval - 1:
+            changes, delta = state._changes_since(self._top_state())
+            count = self._count_top() + delta
+        if changes is None or (changes and 2 * len(changes) >= count):
+            pairs = state._desc_pairs()
+            count = len(pairs)
+            entry = HistoryEntry(True, pairs, ascending, None)
+            self._since_keyframe = 0
+        else:
+            entry = HistoryEntry(False, changes, ascending, None)
+            self._since_keyframe += 1
+        self._number(entry)
+        self._entries.append(entry)
+        self._bytes += entry.size
+        self._top = state
+        self._top_count = count
+        self._evict()
+
+    @_locked
+    def peek(self):
+        """Devuelve una copia del estado de la cima sin quitarlo, o None si está vacío."""
+        if not self._entries:
+            return None
+        return self._top_state().snapshot()
+
+    @_locked
+    def pop(self):
+        """Quita la entrada de la cima y devuelve su estado, o None si el historial está vacío."""
+        if not self._entries:
+            return None
+        popped = self._top_state()
+        entry = self._entries.pop()
+        self._bytes -= entry.size
+        if not self._entries:
+            self.clear()
+            return popped
+        self._top, self._top_count = self._state_at(len(self._entries) - 1)
+        self._count_since_keyframe()
+        return popped
+
+    @_locked
+    def previews(self) -> list[str]:
+        """Devuelve la vista previa de cada entrada, de la más reciente a la más antigua."""
+        return [preview for _, preview in self.window(len(self._entries))]
+
+    @_locked
+    def window(self, count, start=0) -> list[tuple[int, str]]:
+        """
+        Devuelve (número, vista previa) de hasta count entradas, de la más reciente a la
+        más antigua, saltando las start más recientes. Cuesta O(start + count), no O(len),
+        más la vista previa de las entradas mostradas que aún no la tenían.
+        """
+        last = len(self._entries) - 1
+        rows = []
+        for offset, entry in enumerate(islice(reversed(self._entries), start, start + count)):
+            if entry.preview is None:
+                index = last - start - offset
+                state = self._top_state() if index == last else self._state_at(index)[0]
+                entry.preview = state.preview()
+            rows.append((entry.serial, entry.preview))
+        return rows
+
+    @_locked
+    def memory_footprint(self) -> dict:
+        """
+        Informa del tamaño del historial. Los bytes son una estimación de las entradas
+        guardadas; el estado de la cima se comparte con el resultado y no se cuenta.
+
+        Returns:
+            dict: Entradas, fotogramas clave, bytes usados, límites y desalojos.
+        """
+        return {
+            "entries": len(self._entries),
+            "keyframes": sum(1 for entry in self._entries if entry.keyframe),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _number(self, entry):
+        """Asigna a la entrada el siguiente número de serie."""
+        entry.serial = self._next_serial
+        self._next_serial += 1
+
+    def _top_state(self):
+        """Devuelve el estado de la cima, reconstruyéndolo si aún no se había hecho."""
+        if self._top is None:
+            self._top, self._top_count = self._state_at(len(self._entries) - 1)
+        return self._top
+
+    def _count_top(self):
+        """Devuelve el número de términos de la cima (tras restaurar una sesión se cuentan una vez)."""
+        if self._top_count is None:
+            self._top_count = len(self._top_state()._desc_pairs())
+        return self._top_count
+
+    def _count_since_keyframe(self):
+        """Cuenta los cambios que hay desde el último fotograma clave hasta la cima."""
+        self._since_keyframe = 0
+        for index in range(len(self._entries) - 1, -1, -1):
+            if self._entries[index].keyframe:
+                break
+            self._since_keyframe += 1
+
+    def _state_at(self, index):
+        """Reconstruye el polinomio de la entrada index desde su fotograma clave; devuelve (polinomio, términos)."""
+        start = index
+        while not self._entries[start].keyframe:
+            start -= 1
+        pairs = self._entries[start].pairs()
+        for position in range(start + 1, index + 1):
+            pairs = _apply_changes(pairs, self._entries[position].pairs())
+        poly = self.poly_class._from_desc_pairs(pairs)
+        if self._entries[index].ascending:
+            poly.sort_terms(ascending=True)
+        return poly, len(pairs)
+
+    def _evict(self):
+        """Descarta las entradas más antiguas mientras se superen los límites (conserva siempre la cima)."""
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = self._entries.popleft()
+            self._bytes -= oldest.size
+            self.evictions += 1
+            following = self._entries[0]
+            if following.keyframe:
+                continue
+            # La nueva entrada más antigua pasa a ser fotograma clave: se le aplican sus cambios al estado descartado.
+            pairs = _apply_changes(oldest.pairs(), following.pairs())
+            promoted = HistoryEntry(True, pairs, following.ascending, following.preview)
+            promoted.serial = following.serial # Es la misma entrada: conserva su fila en la vista.
+            self._entries[0] = promoted
+            self._bytes += promoted.size - following.size
+            if len(self._entries) == 1:
+                self._since_keyframe = 0
+
+
+def _apply_changes(pairs, changes):
+    """Mezcla en O(n + k) unos términos descendentes con sus cambios descendentes (0.0 = eliminar)."""
+    result = []
+    i = j = 0
+    while i < len(pairs) and j < len(changes):
+        degree, coeff = pairs[i]
+        change_degree, change_coeff = changes[j]
+        if degree > change_degree:
+            result.append(pairs[i])
+            i += 1
+            continue
+        if change_coeff != 0:
+            result.append((change_degree, change_coeff))
+        if degree == change_degree:
+            i += 1
+        j += 1
+    result.extend(pairs[i:])
+    result.extend(change for change in changes[j:] if change[1] != 0)
+    return result
+
+
+def is_ascending(poly):
+    """Indica si el polinomio presenta sus términos de menor a mayor grado."""
+    ascending = getattr(poly, "_ascending", None)
+    if ascending is not None:
+        # Los almacenamientos que guardan el orden de presentación aparte lo dicen sin recorrer nada.
+        return ascending
+    terms = poly._iter_terms()
+    first = next(terms, None)
+    second = next(terms, None)
+    return second is not None and first[1] < second[1]
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo contiene la lectura y escritura de polinomios en archivos.
+Los archivos se recorren con mmap por bloques, de modo que la memoria usada
+depende del número de términos y no del tamaño del texto.
+
+Formato binario (versión 1, little-endian):
+    cabecera  "PLYB" | versión (uint16) | banderas (uint16) | n (uint64)
+    grados    n × int64, de menor a mayor
+    coefs.    n × float64, alineados con los grados
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+
+from pol_parser import PolynomialSyntaxError, scan_terms
+
+# Tamaño (en bytes) de cada bloque leído del archivo de texto.
+CHUNK_SIZE = 1 << 20
+# Términos que se acumulan antes de escribirlos en el archivo binario.
+WRITE_CHUNK_TERMS = 1 << 16
+
+BINARY_MAGIC = b"PLYB"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+# Los arreglos se leen sin copiar solo si el orden de bytes de la máquina coincide con el del archivo.
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def iter_text_terms(path, chunk_size=CHUNK_SIZE):
+    """
+    Genera los términos de un polinomio guardado como texto, leyendo el archivo por bloques.
+    Cada bloque se analiza hasta el último signo que empieza un término; el resto
+    (un término que cruza el borde del bloque) se antepone al bloque siguiente.
+
+    Args:
+        path (str): Ruta del archivo de texto.
+        chunk_size (int): Tamaño de cada bloque en bytes.
+
+    Yields:
+        tuple[float, int]: Pares (coeficiente, grado).
+
+    Raises:
+        PolynomialSyntaxError: Si el texto no es válido; la posición es relativa al archivo.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            carry = ""
+            first = True
+            offset = 0
+            while offset < size:
+                text_start = offset - len(carry)
+                # latin-1 convierte cada byte en un carácter: las posiciones coinciden con el archivo.
+                text = carry + mapped[offset:offset + chunk_size].decode("latin-1")
+                offset += chunk_size
+                cut = len(text) if offset >= size else _last_term_start(text)
+                try:
+                    yield from scan_terms(text, 0, cut, first)
+                except PolynomialSyntaxError as error:
+                    raise PolynomialSyntaxError(error.reason, text_start + error.position) from None
+                if cut:
+                    first = False
+                carry = text[cut:]
+
+
+def _last_term_start(text):
+    """Devuelve el índice del último '+' o '-' que inicia un término (0 si no hay ninguno)."""
+    pos = len(text)
+    while True:
+        pos = max(text.rfind("+", 0, pos), text.rfind("-", 0, pos))
+        if pos <= 0:
+            return 0
+        # El signo de un exponente (1e-5) pertenece al coeficiente.
+        if text[pos - 1] not in "eE":
+            return pos
+
+
+def write_binary(path, terms, count, descending=True):
+    """
+    Escribe términos en formato binario sin materializarlos todos a la vez.
+    Los términos se acumulan en bloques de WRITE_CHUNK_TERMS y cada bloque se escribe
+    directamente en su posición final de ambas columnas; si llegan en orden descendente,
+    las columnas se rellenan desde el final del archivo hacia el principio.
+
+    Args:
+        path (str): Ruta del archivo.
+        terms (iterable): Pares (grado, coeficiente) ordenados, sin repetidos.
+        count (int): Número exacto de términos.
+        descending (bool): True si los términos llegan de mayor a menor grado.
+    """
+    degrees_start = _HEADER.size
+    coefficients_start = degrees_start + 8 * count
+    with _replacing(path) as file:
+        file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, count))
+        file.truncate(coefficients_start + 8 * count)
+        written = 0
+        degrees, coefficients = array("q"), array("d")
+        for degree, coefficient in terms:
+            degrees.append(degree)
+            coefficients.append(coefficient)
+            if len(degrees) == WRITE_CHUNK_TERMS:
+                written = _flush(file, degrees, coefficients, written, count, descending)
+                degrees, coefficients = array("q"), array("d")
+        if degrees:
+            written = _flush(file, degrees, coefficients, written, count, descending)
+        if written != count:
+            raise ValueError(f"Se esperaban {count} términos y se recibieron {written}.")
+
+
+def write_binary_arrays(path, degrees, coefficients):
+    """Escribe en formato binario dos columnas ya ordenadas de menor a mayor grado (arreglos o memoryviews)."""
+    with _replacing(path) as file:
+        file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, len(degrees)))
+        for column, typecode in ((degrees, "q"), (coefficients, "d")):
+            if _NATIVE_LITTLE_ENDIAN:
+                file.write(column)
+            else:
+                swapped = array(typecode, column)
+                swapped.byteswap()
+                swapped.tofile(file)
+
+
+@contextmanager
+def _replacing(path):
+    """
+    Abre un archivo temporal junto a path y, si la escritura termina bien, lo pone en su lugar.
+    Los términos pueden ser vistas sobre el mmap del propio path (un polinomio cargado con
+    read_binary que se guarda en el mismo archivo): truncarlo invalidaría esas vistas, mientras
+    que reemplazarlo deja el archivo anterior vivo hasta que se cierre su último mapeo.
+    """
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _flush(file, degrees, coefficients, written, count, descending):
+    """Escribe un bloque de términos en su posición de ambas columnas y devuelve el total escrito."""
+    if descending:
+        degrees.reverse()
+        coefficients.reverse()
+        index = count - written - len(degrees)
+    else:
+        index = written
+    if index < 0:
+        raise ValueError(f"Se recibieron más de {count} términos.")
+    if not _NATIVE_LITTLE_ENDIAN:
+        degrees.byteswap()
+        coefficients.byteswap()
+    file.seek(_HEADER.size + 8 * index)
+    degrees.tofile(file)
+    file.seek(_HEADER.size + 8 * count + 8 * index)
+    coefficients.tofile(file)
+    return written + len(degrees)
+
+
+def read_binary(path):
+    """
+    Abre un archivo binario de polinomio y devuelve sus columnas sin copiarlas.
+    Las columnas son memoryviews de solo lectura sobre el mmap del archivo (o arreglos
+    copiados si la máquina es big-endian), ordenadas de menor a mayor grado.
+
+    Args:
+        path (str): Ruta del archivo.
+
+    Returns:
+        tuple: (grados, coeficientes) con formato 'q' y 'd'.
+
+    Raises:
+        ValueError: Si el archivo no tiene el formato esperado.
+    """
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Archivo binario de polinomio incompleto.")
+        magic, version, _, count = _HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError("El archivo no es un polinomio en formato binario.")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        if os.fstat(file.fileno()).st_size < _HEADER.size + 16 * count:
+            raise ValueError("Archivo binario de polinomio incompleto.")
+        if count == 0:
+            return array("q"), array("d")
+        # El mmap sigue abierto mientras existan las memoryviews que lo referencian.
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    degrees = view[_HEADER.size:_HEADER.size + 8 * count].cast("q")
+    coefficients = view[_HEADER.size + 8 * count:_HEADER.size + 16 * count].cast("d")
+    if not _NATIVE_LITTLE_ENDIAN:
+        degrees, coefficients = array("q", degrees), array("d", coefficients)
+        degrees.byteswap()
+        coefficients.byteswap()
+    return degrees, coefficients
+
+
+def read_binary_numpy(path):
+    """Devuelve las columnas de un archivo binario como arreglos de NumPy de solo lectura, sin copiarlas."""
+    import numpy as np
+
+    degrees, coefficients = read_binary(path)
+    return np.frombuffer(degrees, dtype=np.int64), np.frombuffer(coefficients, dtype=np.float64)
@@ -4,9 +4,24 @@ Este es el módulo principal que inicia la aplicación de la Calculadora de Poli
 Configura la ventana de la aplicación y ensambla los componentes del patrón MVC (Modelo-Vista-Controlador).
 """
 
+import os
+
 import flet as ft
 from pol_controller import PolynomialController
 from pol_model import PolynomialModel
+from pol_session import load_session, save_session
+
+# Archivo donde se guarda la sesión al cerrar y del que se restaura al iniciar.
+SESSION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sesion_polinomios.bin")
+
+def load_model() -> PolynomialModel:
+    """Restaura el modelo de la sesión anterior o, si no hay una sesión válida, crea uno nuevo."""
+    if os.path.exists(SESSION_FILE):
+        try:
+            return load_session(SESSION_FILE)
+        except (OSError, ValueError) as error:
+            print(f"No se pudo restaurar la sesión: {error}")
+    return PolynomialModel()
 
 def main(page: ft.Page):
     """
@@ -23,8 +38,9 @@ def main(page: ft.Page):
 
     # --- Inicialización del Patrón MVC ---
     
-    # 1. Crear la instancia del Modelo, que contiene los datos y la lógica de negocio.
-    model = PolynomialModel()
+    # 1. Crear la instancia del Modelo, que contiene los datos y la lógica de negocio
+    #    (restaurada de la sesión anterior si existe).
+    model = load_model()
     
     # 2. Crear la instancia del Controlador, que actúa como intermediario.
     #    Se le pasa el modelo para que pueda manipular los datos y la página para interactuar con la UI.
@@ -32,6 +48,26 @@ def main(page: ft.Page):
     
     # 3. La Vista se crea dentro del Controlador. Aquí, añadimos el contenedor principal de la vista a la página.
     page.add(controller.view.container)
+    controller.show_model_state()
+
+    # 4. Al cerrar la ventana se guarda la sesión antes de destruirla.
+    def on_window_event(e):
+        if e.type == ft.WindowEventType.CLOSE:
+            controller.worker.stop() # Espera a que termine la operación en curso.
+            controller.model.pool.shutdown()
+            try:
+                controller.model.sync_result() # Conserva una edición del resultado aún sin analizar.
+            except ValueError:
+                pass # Un texto no válido no impide guardar el último resultado correcto.
+            try:
+                save_session(controller.model, SESSION_FILE)
+            except OSError as error:
+                print(f"No se pudo guardar la sesión: {error}")
+            page.window.destroy()
+
+    page.window.prevent_close = True
+    page.window.on_event = on_window_event
+    page.update()
 
 # --- Punto de Entrada de la Aplicación ---
 if __name__ == "__main__":
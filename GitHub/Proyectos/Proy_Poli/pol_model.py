@@ -3,18 +3,96 @@
 Este módulo contiene la implementación del modelo para la aplicación de polinomios.
 """
 
-import re
-from data_structures import LinkedList, Node, Stack, Queue, PolyNode # Import PolyNode
+import heapq
+import sys
+import threading
+from array import array
+from collections import Counter, deque
+from operator import add, itemgetter, mul, sub
+import pol_roots
+from data_structures import LinkedList, Node, Queue, PolyNode, TermArray, LRUCache # Import PolyNode
+from pol_history import HISTORY_MAX_BYTES, HISTORY_MAX_ENTRIES, PolynomialHistory, is_ascending
+from pol_io import iter_text_terms, read_binary, write_binary, write_binary_arrays
+from pol_pool import OffloadPool
+from pol_parser import IncrementalParser, scan_terms
+
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: sin él se usan las rutas en Python puro.
+    np = None
+
+# Densidad mínima (términos / (grado + 1)) a partir de la cual ambos operandos
+# se multiplican como vectores de coeficientes en lugar de mezclar con un montículo.
+DENSE_DENSITY = 0.25
+# Longitud del cociente a partir de la cual la división densa usa la inversión
+# de Newton de la serie de potencias en lugar de la división larga.
+NEWTON_THRESHOLD = 256
+# Presupuesto por defecto (en bytes) de las cachés de PolynomialModel.
+CACHE_BYTES = 64 * 2**20
+# Número de puntos que se evalúan juntos para que los vectores intermedios quepan en caché.
+EVAL_CHUNK = 1 << 16
+# Evaluación multipunto con árbol de subproductos: se usa a partir de este número
+# de puntos y de términos. Con 16384 el árbol apenas gana (0,31 s frente a 0,39 s) y pierde
+# precisión; con 32768 tarda 0,44 s frente a 1,24 s de Horner (ver pol_benchmark.py).
+MULTIPOINT_THRESHOLD = 32768
+# Puntos por hoja del árbol: cada hoja se evalúa con Horner sobre su resto.
+MULTIPOINT_LEAF = 32
+# Mayor coeficiente admitido en el árbol de subproductos en modo "auto"; por encima,
+# el error de redondeo de los restos domina y se vuelve a Horner.
+MULTIPOINT_MAX_GROWTH = 1e6
+# Longitud mínima de ambos factores para multiplicar mediante FFT.
+FFT_THRESHOLD = 512
+# Términos que la vista previa muestra en cada extremo de un polinomio.
+PREVIEW_TERMS = 20
+# Términos del polinomio exterior en cada hoja de la composición por divide y vencerás:
+# todas las hojas se evalúan a la vez con un producto de matrices por las potencias q^0..q^(hoja-1).
+COMPOSE_LEAF = 32
+# Tolerancia relativa bajo la cual un coeficiente de la composición densa se toma como
+# ruido de redondeo, cuando alguno de los productos se hizo por FFT.
+COMPOSE_TOLERANCE = 1e-12
+# Límites del cálculo en vivo, por encima de los cuales se espera al botón de la operación:
+# productos n·m de la multiplicación dispersa y (grado + 1)·(grado + 1) de la composición
+# (unos 0,5 s cada uno), y términos de la suma, la resta y la multiplicación densa.
+LIVE_MAX_PRODUCTS = 250_000
+LIVE_MAX_TERMS = 100_000
+# Términos editados hasta los que el operando en vivo se actualiza término a término: cada
+# cambio recorre la lista hasta su grado, así que con más conviene reconstruirlo.
+LIVE_SPLICE_TERMS = 16
+# Raíces del resultado que se muestran en el mensaje de la vista.
+ROOTS_PREVIEW = 10
+# Tolerancia relativa (a max(1, |z|)) bajo la cual una parte de una raíz se muestra como cero:
+# el método numérico deja residuos de redondeo como 1e-28i en raíces reales.
+ROOT_TOLERANCE = 1e-12
+# Grado hasta el que ese mensaje incluye también las raíces reales exactas: aislarlas
+# cuesta O(n²) sumas de enteros por intervalo (ver benchmark_roots en pol_benchmark.py).
+EXACT_ROOTS_MAX_DEGREE = 256
 
 class Polynomial:
     """
     Clase que representa un polinomio.
     Utiliza una lista enlazada para almacenar los términos del polinomio.
     Cada nodo de la lista (PolyNode) contiene un coeficiente y un grado.
+
+    Con Polynomial(backend="array") se obtiene en su lugar un ArrayPolynomial,
+    que guarda los términos en arreglos compactos con la misma interfaz, y con
+    backend="persistent" un PersistentPolynomial, cuyas versiones comparten nodos.
     """
 
-    def __init__(self):
-        """Inicializa un polinomio vacío."""
+    def __new__(cls, backend="linked"):
+        """Crea la instancia de la clase que corresponde al almacenamiento pedido."""
+        if cls is Polynomial:
+            if backend not in BACKENDS:
+                raise ValueError(f"Almacenamiento desconocido: {backend}")
+            cls = BACKENDS[backend]
+        return super().__new__(cls)
+
+    def __init__(self, backend="linked"):
+        """Inicializa un polinomio vacío.
+
+        Args:
+            backend (str): "linked" (lista enlazada), "array" (arreglos compactos)
+                o "persistent" (lista enlazada con nodos compartidos entre versiones).
+        """
         self.terms = LinkedList()
 
     def add_term(self, coefficient, degree):
@@ -72,7 +150,7 @@ class Polynomial:
         Returns:
             Polynomial: Un nuevo polinomio que es la suma de los dos.
         """
-        result = Polynomial()
+        result = type(self)()
         p1_curr = self.terms.head
         p2_curr = other.terms.head
         
@@ -123,49 +201,594 @@ class Polynomial:
         Returns:
             Polynomial: Un nuevo polinomio que es la resta de los dos.
         """
-        neg_other = Polynomial()
-        current = other.terms.head
+        return self + (-other)
+
+    def __neg__(self):
+        """Devuelve un nuevo polinomio con todos los coeficientes cambiados de signo."""
+        # Los pares ya están ordenados y sin repetidos: no hace falta pasar por from_terms.
+        return self._from_desc_pairs([(degree, -coefficient) for degree, coefficient in self._desc_pairs()])
+
+    def __mul__(self, other):
+        """
+        Multiplica dos polinomios.
+        Si ambos operandos son densos se convolucionan sus vectores de coeficientes;
+        si no, se mezclan los productos parciales con un montículo (heap), lo que
+        cuesta O(n·m·log min(n, m)) y produce los términos ya ordenados.
+
+        Args:
+            other (Polynomial): El polinomio por el que se multiplica.
+
+        Returns:
+            Polynomial: Un nuevo polinomio que es el producto de los dos.
+        """
+        a = self._desc_pairs()
+        b = other._desc_pairs()
+        if not a or not b:
+            return type(self)()
+        if _is_dense(a) and _is_dense(b):
+            return self._from_dense(_convolve(_dense_coefficients(a), _dense_coefficients(b)))
+
+        # Cada término del operando más corto genera un flujo de productos en orden
+        # descendente; el montículo solo contiene la cabeza de cada flujo.
+        if len(a) > len(b):
+            a, b = b, a
+        len_b = len(b)
+        top_degree = b[0][0]
+        heap = [(-(deg_a + top_degree), i, 0) for i, (deg_a, _) in enumerate(a)]
+        heapq.heapify(heap)
+
+        pairs = []
+        current_degree = None
+        current_coeff = 0.0
+        while heap:
+            neg_degree, i, j = heap[0]
+            deg_a, coeff_a = a[i]
+            coeff = coeff_a * b[j][1]
+            if j + 1 < len_b:
+                heapq.heapreplace(heap, (-(deg_a + b[j + 1][0]), i, j + 1))
+            else:
+                heapq.heappop(heap)
+            # Los productos llegan agrupados por grado: se acumulan hasta que cambia.
+            if -neg_degree == current_degree:
+                current_coeff += coeff
+            else:
+                if current_coeff != 0:
+                    pairs.append((current_degree, current_coeff))
+                current_degree = -neg_degree
+                current_coeff = coeff
+        if current_coeff != 0:
+            pairs.append((current_degree, current_coeff))
+        return self._from_desc_pairs(pairs)
+
+    def __divmod__(self, other):
+        """
+        Divide este polinomio entre otro y devuelve el cociente y el resto.
+        Los operandos densos se dividen como vectores de coeficientes (con inversión
+        de Newton si el cociente es largo); los dispersos, con una división larga que
+        recorre los términos en orden descendente guardando el resto en un diccionario.
+
+        Args:
+            other (Polynomial): El divisor.
+
+        Returns:
+            tuple[Polynomial, Polynomial]: El cociente y el resto de la división.
+
+        Raises:
+            ZeroDivisionError: Si el divisor es el polinomio cero.
+        """
+        b = other._desc_pairs()
+        if not b:
+            raise ZeroDivisionError("División entre el polinomio cero.")
+        a = self._desc_pairs()
+        if not a or a[0][0] < b[0][0]:
+            return type(self)(), self._from_desc_pairs(a)
+        if _is_dense(a) and _is_dense(b):
+            quotient, remainder = _divmod_dense(_dense_coefficients(a), _dense_coefficients(b))
+            return self._from_dense(quotient), self._from_dense(remainder)
+
+        lead_degree, lead_coeff = b[0]
+        divisor_tail = b[1:]
+        remainder = dict(a)
+        pending = [-degree for degree, _ in a]
+        heapq.heapify(pending)
+        quotient = []
+        while pending:
+            degree = -heapq.heappop(pending)
+            coeff = remainder.pop(degree, 0)
+            if coeff == 0:
+                continue
+            if degree < lead_degree:
+                # Lo que queda tiene grado menor que el divisor: es el resto.
+                remainder[degree] = coeff
+                break
+            q_coeff = coeff / lead_coeff
+            q_degree = degree - lead_degree
+            quotient.append((q_degree, q_coeff))
+            for b_degree, b_coeff in divisor_tail:
+                new_degree = q_degree + b_degree
+                if new_degree in remainder:
+                    remainder[new_degree] -= q_coeff * b_coeff
+                else:
+                    remainder[new_degree] = -q_coeff * b_coeff
+                    heapq.heappush(pending, -new_degree)
+        remainder_pairs = sorted(((degree, coeff) for degree, coeff in remainder.items() if coeff != 0), reverse=True)
+        return self._from_desc_pairs(quotient), self._from_desc_pairs(remainder_pairs)
+
+    def __floordiv__(self, other):
+        """Devuelve el cociente de la división entre otro polinomio."""
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        """Devuelve el resto de la división entre otro polinomio."""
+        return divmod(self, other)[1]
+
+    def gcd(self, other):
+        """
+        Calcula el máximo común divisor mónico de dos polinomios.
+        El MCD se calcula en aritmética entera exacta con el método modular (ver
+        pol_roots.gcd_coefficients): Euclides en coma flotante con una tolerancia fija
+        pierde el MCD por cancelación en cuanto los grados pasan de unas decenas. Cada
+        coeficiente cuenta con el valor exacto de su float, igual que en real_roots.
+
+        Args:
+            other (Polynomial): El otro polinomio.
+
+        Returns:
+            Polynomial: El MCD mónico (el polinomio cero si ambos son cero).
+
+        Raises:
+            ValueError: Si alguno de los polinomios tiene grados negativos o coeficientes no finitos.
+        """
+        a = self._desc_pairs()
+        b = other._desc_pairs()
+        if (a and a[-1][0] < 0) or (b and b[-1][0] < 0):
+            raise ValueError("El MCD requiere grados no negativos.")
+        if not a and not b:
+            return type(self)()
+        if not a or not b:
+            pairs = a or b
+            return self._from_desc_pairs([(degree, coefficient / pairs[0][1]) for degree, coefficient in pairs])
+        integers = pol_roots.gcd_coefficients(self, other)
+        top = len(integers) - 1
+        return self._from_desc_pairs([(top - k, c / integers[0]) for k, c in enumerate(integers) if c])
+
+    def compose(self, other):
+        """
+        Calcula la composición p(q(x)), donde p es este polinomio y q es other.
+        Si ambos son densos y está NumPy, se usa divide y vencerás: con p = p_bajo + x^h·p_alto,
+        p(q) = p_bajo(q) + q^h·p_alto(q), donde las potencias q^h se obtienen elevando al
+        cuadrado y los productos se hacen por FFT, en O(M(n·m)·log n). Si no, se aplica Horner
+        sobre los términos de p, saltando los huecos entre grados con potencias de q
+        (calculadas una vez por hueco) y multiplicando con __mul__.
+
+        Args:
+            other (Polynomial): El polinomio interior q.
+
+        Returns:
+            Polynomial: Un nuevo polinomio p(q(x)).
+
+        Raises:
+            ValueError: Si alguno de los polinomios tiene grados negativos, o si en la ruta
+                densa algún coeficiente del resultado desborda el rango de float.
+        """
+        a = self._desc_pairs()
+        b = other._desc_pairs()
+        if (a and a[-1][0] < 0) or (b and b[-1][0] < 0):
+            raise ValueError("La composición requiere grados no negativos.")
+        if not a or not b:
+            # p(0) es el término independiente de p.
+            constant = a[-1][1] if a and a[-1][0] == 0 else 0.0
+            return self._from_desc_pairs([(0, constant)] if constant else [])
+        if np is not None and _is_dense(a) and _is_dense(b):
+            return self._from_dense(_compose_dense(_dense_coefficients(a), _dense_coefficients(b)))
+        inner = self._from_desc_pairs(b)
+        powers = {1: inner}
+        result = self._from_desc_pairs([(0, a[0][1])])
+        for (degree, _), (next_degree, coefficient) in zip(a, a[1:] + [(0, 0.0)]):
+            if degree != next_degree:
+                result = result * _power(inner, degree - next_degree, powers)
+            if coefficient:
+                result = result + self._from_desc_pairs([(0, coefficient)])
+        return result
+
+    def derivative(self):
+        """
+        Reemplaza el polinomio, en su lugar, por su derivada.
+        Cada nodo pasa de c·x^n a (c·n)·x^(n-1) en una sola pasada por la lista, sin crear
+        nodos; el del término independiente se desenlaza.
+        """
+        prev = None
+        current = self.terms.head
         while current:
-            neg_other.add_term(-current.coefficient, current.degree)
+            if current.degree == 0:
+                if prev:
+                    prev.next = current.next
+                else:
+                    self.terms.head = current.next
+            else:
+                current.coefficient *= current.degree
+                current.degree -= 1
+                prev = current
             current = current.next
-        return self + neg_other
 
-    def __str__(self):
+    def integral(self, constant=0.0):
         """
-        Devuelve una representación en cadena del polinomio.
-        Formatea el polinomio de una manera legible, por ejemplo, "3x^2 + 2x - 5".
+        Reemplaza el polinomio, en su lugar, por su primitiva más constant.
+        Cada nodo pasa de c·x^n a c/(n+1)·x^(n+1) en una sola pasada por la lista, sin crear
+        nodos (salvo el de la constante, si no es cero). El orden de la lista se conserva.
+
+        Args:
+            constant (float): Término independiente de la primitiva. Defaults to 0.0.
+
+        Raises:
+            ValueError: Si hay un término x^-1 (su primitiva es un logaritmo). Se comprueba
+                antes de modificar nada.
+        """
+        constant = float(constant)
+        if self.search_term(-1) is not None:
+            raise ValueError("La primitiva de x^-1 no es un polinomio.")
+        # Tras integrar ningún grado es 0: la constante va entre los grados positivos y los negativos.
+        last_positive = last_negative = tail = None
+        current = self.terms.head
+        while current:
+            current.degree += 1
+            current.coefficient /= current.degree
+            if current.degree > 0:
+                last_positive = current
+            else:
+                last_negative = current
+            tail = current
+            current = current.next
+        if constant:
+            descending = tail is None or self.terms.head.degree >= tail.degree
+            anchor = last_positive if descending else last_negative
+            if anchor is None:
+                self.terms.head = PolyNode(constant, 0, self.terms.head)
+            else:
+                anchor.next = PolyNode(constant, 0, anchor.next)
+
+    def definite_integral(self, a, b):
+        """
+        Calcula la integral definida de a a b como F(b) - F(a), con F la primitiva.
+        a y b pueden ser escalares o arreglos de NumPy que se difunden entre sí: los
+        extremos de todos los intervalos se evalúan juntos con el Horner vectorial de
+        evaluate, así que millones de intervalos cuestan una sola llamada.
+
+        Args:
+            a (float | numpy.ndarray): Extremo inferior de cada intervalo.
+            b (float | numpy.ndarray): Extremo superior de cada intervalo.
 
         Returns:
-            str: La representación en cadena del polinomio.
+            float | numpy.ndarray | list: El área de cada intervalo (con la forma difundida de a y b;
+            sin NumPy, una lista si a y b son listas).
+
+        Raises:
+            ValueError: Si hay un término x^-1.
+        """
+        pairs = self._desc_pairs()
+        if any(degree == -1 for degree, _ in pairs):
+            raise ValueError("La primitiva de x^-1 no es un polinomio.")
+        antiderivative = self._from_desc_pairs([(degree + 1, coefficient / (degree + 1))
+                                                for degree, coefficient in pairs])
+        if np is None:
+            if isinstance(a, (list, tuple)):
+                return [upper - lower for lower, upper in
+                        zip(antiderivative.evaluate(list(a)), antiderivative.evaluate(list(b)))]
+            return antiderivative.evaluate(b) - antiderivative.evaluate(a)
+        lower, upper = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+        if lower.ndim == 0:
+            return antiderivative.evaluate(upper.item()) - antiderivative.evaluate(lower.item())
+        values = antiderivative.evaluate(np.stack((lower, upper)), method="horner")
+        return values[1] - values[0]
+
+    def roots(self, method="auto"):
+        """
+        Calcula todas las raíces complejas, repetidas según su multiplicidad (ver
+        pol_roots.complex_roots). Se guardan en caché por valor del polinomio.
+
+        Args:
+            method (str): "auto", "eigen" (matriz compañera) o "aberth".
+
+        Returns:
+            numpy.ndarray | list: Las raíces ordenadas (un arreglo de solo lectura, o una lista sin NumPy).
+
+        Raises:
+            ValueError: Si el polinomio es cero, tiene grados negativos, coeficientes no finitos
+                o un grado excesivo.
+        """
+        return pol_roots.complex_roots(self, method)
+
+    def real_roots(self, tolerance=1e-12):
+        """
+        Calcula las raíces reales distintas, aisladas en aritmética exacta y refinadas
+        hasta tolerance (ver pol_roots.real_roots).
+
+        Raises:
+            ValueError: Si el polinomio es cero o tiene grados negativos o coeficientes no finitos.
+        """
+        return pol_roots.real_roots(self, tolerance)
+
+    def evaluate(self, xs, method="auto"):
+        """
+        Evalúa el polinomio con el esquema de Horner.
+        Los términos se recorren en orden descendente y los huecos entre grados se
+        saltan multiplicando por x^(hueco), con las potencias de cada hueco calculadas
+        una sola vez. Con NumPy cada paso es una operación vectorial sobre todo el lote.
+
+        Para polinomios densos de grado alto evaluados en un número de puntos parecido,
+        se puede usar un árbol de subproductos que reduce por restos en O(n log² n).
+        Con method="auto" se elige a partir de MULTIPOINT_THRESHOLD, siempre que el árbol
+        de los puntos esté bien condicionado (p. ej. puntos repartidos en la circunferencia
+        unidad); si no, se usa Horner. El árbol se abandona en el primer nivel cuyos
+        coeficientes superan MULTIPOINT_MAX_GROWTH, así que descartarlo cuesta poco.
+
+        Args:
+            xs (float | list | numpy.ndarray): Un punto o una colección de puntos.
+            method (str): "auto", "horner" o "multipoint".
+
+        Returns:
+            float | numpy.ndarray | list: El valor en el punto, o los valores en cada punto
+            (un arreglo de NumPy si está disponible, una lista si no).
+
+        Raises:
+            ValueError: Si el método es desconocido, o si "multipoint" recibe un polinomio
+                con grados negativos o disperso, o puntos para los que el árbol está mal
+                condicionado (nunca se devuelven valores NaN del árbol).
         """
-        if not self.terms.head:
-            return "0"
-        terms_list = []
+        pairs = self._desc_pairs()
+        if np is None:
+            if isinstance(xs, (list, tuple)):
+                return [_horner(pairs, x) for x in xs]
+            return _horner(pairs, xs)
+
+        x = np.asarray(xs)
+        if x.dtype.kind in 'biu':
+            x = x.astype(float)
+        if x.ndim == 0:
+            return _horner(pairs, x.item())
+        flat = x.reshape(-1)
+        if method == "auto":
+            if (len(flat) >= MULTIPOINT_THRESHOLD and len(pairs) >= MULTIPOINT_THRESHOLD
+                    and _is_dense(pairs)):
+                values = _multipoint_evaluate(_dense_coefficients(pairs), flat)
+                if values is not None:
+                    return values.reshape(x.shape)
+            method = "horner"
+        elif method == "multipoint":
+            if not pairs:
+                return np.zeros(x.shape)
+            if pairs[-1][0] < 0:
+                raise ValueError("La evaluación multipunto requiere grados no negativos.")
+            if not _is_dense(pairs):
+                raise ValueError("La evaluación multipunto requiere un polinomio denso: use method=\"horner\".")
+            values = _multipoint_evaluate(_dense_coefficients(pairs), flat)
+            if values is None:
+                raise ValueError("El árbol de subproductos está mal condicionado para estos puntos: use method=\"horner\".")
+            return values.reshape(x.shape)
+        if method != "horner":
+            raise ValueError(f"Método de evaluación desconocido: {method}")
+        out = np.empty_like(flat, dtype=np.result_type(flat, float))
+        for start in range(0, len(flat), EVAL_CHUNK):
+            chunk = flat[start:start + EVAL_CHUNK]
+            out[start:start + EVAL_CHUNK] = _horner_vector(pairs, chunk)
+        return out.reshape(x.shape)
+
+    def _desc_pairs(self):
+        """Devuelve los términos como una lista de pares (grado, coeficiente) en orden descendente."""
+        pairs = []
         current = self.terms.head
-        is_first = True
         while current:
-            coeff, degree = current.coefficient, current.degree
+            pairs.append((current.degree, current.coefficient))
+            current = current.next
+        # Tras sort_terms(ascending=True) la lista queda en orden ascendente.
+        if len(pairs) > 1 and pairs[0][0] < pairs[-1][0]:
+            pairs.reverse()
+        return pairs
+
+    def _changes_since(self, previous):
+        """
+        Devuelve los términos que cambiaron respecto a previous, como pares (grado, coeficiente)
+        de mayor a menor grado (un coeficiente 0.0 indica que el término ya no existe), y cuántos
+        términos más (o menos) tiene este polinomio.
+        """
+        old = dict(previous._desc_pairs())
+        changes = []
+        added = 0
+        for degree, coeff in self._desc_pairs():
+            previous_coeff = old.pop(degree, None)
+            if previous_coeff != coeff:
+                changes.append((degree, coeff))
+                added += previous_coeff is None
+        changes.extend((degree, 0.0) for degree in old)
+        changes.sort(key=itemgetter(0), reverse=True)
+        return changes, added - len(old)
+
+    def freeze(self):
+        """Devuelve una copia inmutable y hashable (FrozenPolynomial) en O(n)."""
+        return FrozenPolynomial._from_desc_pairs(self._desc_pairs())
+
+    def _iter_terms(self):
+        """Recorre los términos en el orden de la lista, como pares (coeficiente, grado)."""
+        current = self.terms.head
+        while current:
+            yield current.coefficient, current.degree
+            current = current.next
+
+    @classmethod
+    def from_terms(cls, terms):
+        """
+        Construye un polinomio a partir de términos en cualquier orden.
+        Los términos se acumulan en un búfer, se ordenan por grado de mayor a menor,
+        se combinan los grados repetidos en una sola pasada y los nodos se enlazan
+        desde la cola, por lo que el costo es O(n log n) en lugar de O(n²) con add_term.
+
+        Args:
+            terms (iterable): Pares (coeficiente, grado).
+
+        Returns:
+            Polynomial: El polinomio con los términos combinados y sin coeficientes nulos.
+        """
+        buffered = [(int(degree), float(coefficient)) for coefficient, degree in terms]
+        buffered.sort(key=itemgetter(0), reverse=True)
+        pairs = []
+        for degree, coefficient in buffered:
+            if pairs and pairs[-1][0] == degree:
+                pairs[-1] = (degree, pairs[-1][1] + coefficient)
+                continue
+            if pairs and pairs[-1][1] == 0:
+                pairs.pop()
+            pairs.append((degree, coefficient))
+        if pairs and pairs[-1][1] == 0:
+            pairs.pop()
+        return cls._from_desc_pairs(pairs)
+
+    @classmethod
+    def load_text(cls, path):
+        """
+        Lee un polinomio desde un archivo de texto sin cargar el texto completo en memoria.
+        El archivo se recorre con mmap por bloques y los términos pasan directamente a from_terms.
+
+        Args:
+            path (str): Ruta del archivo.
+
+        Returns:
+            Polynomial: El polinomio leído.
+        """
+        return cls.from_terms(iter_text_terms(path))
+
+    def save_binary(self, path):
+        """
+        Guarda el polinomio en el formato binario de pol_io (grados int64 y coeficientes
+        float64), escribiendo por bloques sin construir el archivo completo en memoria.
+
+        Args:
+            path (str): Ruta del archivo.
+        """
+        count = 0
+        current = self.terms.head
+        last = None
+        while current:
+            count += 1
+            last = current
+            current = current.next
+        descending = count < 2 or self.terms.head.degree > last.degree
+        write_binary(path, _iter_nodes(self.terms.head), count, descending)
+
+    @classmethod
+    def load_binary(cls, path):
+        """
+        Carga un polinomio guardado con save_binary.
+
+        Args:
+            path (str): Ruta del archivo.
+
+        Returns:
+            Polynomial: El polinomio leído.
+        """
+        degrees, coefficients = read_binary(path)
+        # tolist convierte cada columna de una vez, mucho más rápido que indexar la vista término a término.
+        return cls._from_desc_pairs(list(zip(degrees.tolist(), coefficients.tolist()))[::-1])
+
+    @classmethod
+    def _from_desc_pairs(cls, pairs):
+        """Crea un polinomio enlazando los nodos desde la cola a partir de pares ya ordenados y sin ceros."""
+        poly = cls()
+        head = None
+        for degree, coefficient in reversed(pairs):
+            head = PolyNode(coefficient, degree, head)
+        poly.terms.head = head
+        return poly
+
+    @classmethod
+    def _from_dense(cls, coefficients):
+        """Crea un polinomio a partir de un vector de coeficientes indexado por grado."""
+        if np is not None and isinstance(coefficients, np.ndarray):
+            degrees = np.flatnonzero(coefficients)[::-1]
+            pairs = list(zip(degrees.tolist(), coefficients[degrees].tolist()))
+        else:
+            pairs = [(degree, float(coefficients[degree]))
+                     for degree in range(len(coefficients) - 1, -1, -1) if coefficients[degree] != 0]
+        return cls._from_desc_pairs(pairs)
+
+    def iter_render(self):
+        """
+        Genera la representación en cadena del polinomio término a término, sin construir
+        la cadena completa. Concatenar lo generado da el mismo texto que str().
+
+        Yields:
+            str: El texto de cada término con su signo ("3x^2", " + 2x", " - 5"), o "0".
+        """
+        is_first = True
+        for coeff, degree in self._iter_terms():
             if coeff == 0:
-                current = current.next
                 continue
-            
-            # Determina el signo del término.
-            sign = '' if is_first else (' + ' if coeff > 0 else ' - ')
-            if is_first and coeff < 0: sign = '-'
-            
-            coeff_abs = abs(coeff)
-            # Formatea el coeficiente.
-            coeff_str = '' if coeff_abs == 1 and degree != 0 else str(round(coeff_abs, 2) if not float(coeff_abs).is_integer() else int(coeff_abs))
-            
-            # Formatea el término según el grado.
-            if degree == 0: term_str = f"{coeff_str}"
-            elif degree == 1: term_str = f"{coeff_str}x"
-            else: term_str = f"{coeff_str}x^{degree}"
-            
-            terms_list.append(f"{sign}{term_str}")
+            yield _format_term(coeff, degree, is_first)
             is_first = False
-            current = current.next
-        return "".join(terms_list).lstrip(" +")
+        if is_first:
+            yield "0"
+
+    def write_to(self, fp, batch=4096):
+        """
+        Escribe la representación completa del polinomio en un archivo de texto abierto,
+        agrupando los términos en bloques para no crear la cadena entera en memoria.
+
+        Args:
+            fp: Objeto de archivo con método write.
+            batch (int): Términos por cada llamada a write.
+        """
+        pieces = []
+        for piece in self.iter_render():
+            pieces.append(piece)
+            if len(pieces) == batch:
+                fp.write("".join(pieces))
+                pieces.clear()
+        if pieces:
+            fp.write("".join(pieces))
+
+    def preview(self, k=None):
+        """
+        Devuelve una vista acotada del polinomio: si tiene más de 2k términos muestra los
+        k primeros, "…", los k últimos y el total. Usa memoria O(k) sin importar su tamaño.
+
+        Args:
+            k (int, optional): Términos a mostrar en cada extremo. Defaults to PREVIEW_TERMS.
+
+        Returns:
+            str: La vista previa del polinomio.
+        """
+        return self._preview(k)[0]
+
+    def _preview(self, k=None):
+        """Devuelve la vista previa y si está recortada (False si muestra el polinomio completo)."""
+        k = PREVIEW_TERMS if k is None else k
+        head = []
+        tail = deque(maxlen=k)
+        count = 0
+        for coeff, degree in self._iter_terms():
+            if coeff == 0:
+                continue
+            if count < k:
+                head.append(_format_term(coeff, degree, count == 0))
+            else:
+                tail.append((coeff, degree))
+            count += 1
+        if count == 0:
+            return "0", False
+        if count <= 2 * k:
+            return "".join(head) + "".join(_format_term(coeff, degree, False) for coeff, degree in tail), False
+        # Los términos intermedios ya salieron del deque: solo se formatean los que se muestran.
+        return (f"{''.join(head)} …{''.join(_format_term(coeff, degree, False) for coeff, degree in tail)}"
+                f" ({count} términos)"), True
+
+    def __str__(self):
+        """
+        Devuelve una representación en cadena del polinomio.
+        Formatea el polinomio de una manera legible, por ejemplo, "3x^2 + 2x - 5".
+
+        Returns:
+            str: La representación en cadena del polinomio.
+        """
+        return "".join(self.iter_render())
     
     def delete_term(self, degree) -> bool:
         """
@@ -238,163 +861,1321 @@ class Polynomial:
 
     def clone(self):
         """Crea y devuelve una copia profunda de este polinomio."""
-        cloned_poly = Polynomial()
-        current = self.terms.head
-        while current:
-            cloned_poly.add_term(current.coefficient, current.degree)
-            current = current.next
-        return cloned_poly
+        return self.from_terms(self._iter_terms())
 
-class PolynomialModel:
+    def snapshot(self):
+        """
+        Devuelve una copia del estado actual para guardarla en el historial.
+        Como los nodos de esta lista se modifican en su lugar, la copia es completa (clone).
+        """
+        return self.clone()
+
+class ArrayPolynomial(Polynomial):
     """
-    Clase que representa el modelo de la aplicación.
-    Contiene la lógica de negocio y el estado de la calculadora de polinomios.
+    Polinomio con almacenamiento compacto (TermArray): grados en array('q') y
+    coeficientes en array('d'), ordenados por grado. Ofrece la misma interfaz que
+    Polynomial, con búsquedas binarias y sumas/restas como mezclas lineales.
+    El orden de presentación (sort_terms) es solo una marca; los arreglos siguen ordenados.
     """
-    def __init__(self):
-        """Inicializa el modelo."""
-        self.poly1 = Polynomial()  # Primer polinomio operando
-        self.poly2 = Polynomial()  # Segundo polinomio operando
-        self.result = Polynomial() # Polinomio resultado
-        self.history = Stack()     # Pila para almacenar el historial de resultados (para la función de deshacer)
-        self.operations_queue = Queue() # Cola para las operaciones en espera
-        self._initialize_queue()
-        # Se añade un polinomio vacío al historial como estado inicial.
-        self.history.push(Polynomial())
 
-    def _initialize_queue(self):
-        """Inicializa la cola con operaciones predefinidas si es necesario."""
-        pass # Actualmente no se encolan operaciones iniciales.
+    def __init__(self, backend="array"):
+        """Inicializa un polinomio vacío con almacenamiento en arreglos."""
+        self.terms = TermArray()
+        self._ascending = False
 
-    def _parse_poly(self, poly_str: str) -> Polynomial:
+    def add_term(self, coefficient, degree):
         """
-        Analiza una cadena de texto y la convierte en un objeto Polynomial.
-        Utiliza expresiones regulares para identificar los términos.
+        Añade un término al polinomio, sumando coeficientes si el grado ya existe.
+        Si el coeficiente resultante es cero, elimina el término.
 
         Args:
-            poly_str (str): La cadena que representa el polinomio.
+            coefficient (float): El coeficiente del término.
+            degree (int): El grado del término.
+        """
+        coefficient = float(coefficient)
+        degree = int(degree)
+        if coefficient == 0: return
+        index = self.terms.find(degree)
+        if index is None:
+            self.terms.insert(coefficient, degree)
+            return
+        self.terms.make_writable()
+        self.terms.coefficients[index] += coefficient
+        if self.terms.coefficients[index] == 0:
+            self.terms.remove_at(index)
 
-        Returns:
-            Polynomial: El objeto Polynomial correspondiente.
+    def delete_term(self, degree) -> bool:
         """
-        poly = Polynomial()
-        poly_str = poly_str.strip().replace(" ", "")
-        if not poly_str:
-            return poly
+        Elimina un término del polinomio dado su grado.
 
-        # Añade un signo de más al principio si no hay signo, para facilitar el análisis.
-        if poly_str[0] not in ['+', '-']:
-            poly_str = '+' + poly_str
+        Returns:
+            bool: True si el término fue eliminado, False en caso contrario.
+        """
+        index = self.terms.find(int(degree))
+        if index is None:
+            return False
+        self.terms.remove_at(index)
+        return True
 
-        # Expresión regular para encontrar todos los términos en la cadena.
-        term_pattern = re.compile(r'([+-][^+-]+)')
-        terms = term_pattern.findall(poly_str)
+    def search_term(self, degree):
+        """
+        Busca un término en el polinomio por su grado.
 
-        for term in terms:
-            if not term:
-                continue
+        Returns:
+            float or None: El coeficiente del término si se encuentra, de lo contrario None.
+        """
+        index = self.terms.find(int(degree))
+        return None if index is None else self.terms.coefficients[index]
 
-            # Valores por defecto para coeficiente y grado.
-            coeff = 1.0
-            degree = 0
-
-            if 'x' in term:
-                parts = term.split('x')
-                coeff_part = parts[0]
-
-                # Extrae el coeficiente.
-                if coeff_part == '+':
-                    coeff = 1.0
-                elif coeff_part == '-':
-                    coeff = -1.0
-                elif coeff_part:
-                    coeff = float(coeff_part)
-
-                # Extrae el grado.
-                if len(parts) > 1 and parts[1]:
-                    if '^' in parts[1]:
-                        degree = int(parts[1][1:])
-                    else:
-                        degree = 1
-                else: # Caso para 'x' sin exponente explícito.
-                    degree = 1
-            else: # Término constante.
-                coeff = float(term)
-                degree = 0
+    def sort_terms(self, ascending=True):
+        """Cambia el orden en que se presentan los términos (los arreglos ya están ordenados)."""
+        self._ascending = ascending
 
-            if coeff != 0:
-                poly.add_term(coeff, degree)
-        return poly
+    def derivative(self):
+        """
+        Reemplaza el polinomio, en su lugar, por su derivada, reescribiendo ambos arreglos.
+        Con NumPy se opera directamente sobre la memoria de los arreglos.
+        """
+        terms = self.terms
+        terms.make_writable()
+        constant = terms.find(0)
+        if constant is not None:
+            terms.remove_at(constant)
+        _shift_columns(terms, -1)
 
-    def set_polynomials(self, poly1_str: str, poly2_str: str = None):
+    def integral(self, constant=0.0):
         """
-        Establece los polinomios operandos a partir de sus representaciones en cadena.
+        Reemplaza el polinomio, en su lugar, por su primitiva más constant, reescribiendo ambos arreglos.
 
-        Args:
-            poly1_str (str): Cadena del primer polinomio.
-            poly2_str (str, optional): Cadena del segundo polinomio. Defaults to None.
+        Raises:
+            ValueError: Si hay un término x^-1.
         """
-        self.poly1 = self._parse_poly(poly1_str)
-        if poly2_str is not None:
-            self.poly2 = self._parse_poly(poly2_str)
+        constant = float(constant)
+        terms = self.terms
+        if terms.find(-1) is not None:
+            raise ValueError("La primitiva de x^-1 no es un polinomio.")
+        terms.make_writable()
+        _shift_columns(terms, 1)
+        if constant:
+            terms.insert(constant, 0)
 
-    def add_term_to_poly1(self, coeff, degree):
-        """Añade un término al primer polinomio."""
-        self.poly1.add_term(coeff, degree)
+    def __add__(self, other):
+        """Suma dos polinomios con una mezcla lineal de los arreglos ordenados."""
+        return self._merge(other, 1.0)
 
-    def add(self):
-        """Suma los dos polinomios operandos y guarda el resultado."""
-        self.result = self.poly1 + self.poly2
+    def __sub__(self, other):
+        """Resta dos polinomios con una mezcla lineal, sin construir el opuesto."""
+        return self._merge(other, -1.0)
 
-    def subtract(self):
-        """Resta el segundo polinomio del primero y guarda el resultado."""
-        self.result = self.poly1 - self.poly2
+    def __radd__(self, other):
+        """Suma con un polinomio enlazado a la izquierda (la suma es conmutativa)."""
+        return self._merge(other, 1.0)
 
-    def undo(self):
-        """
-        Deshace la última operación.
-        Restaura el polinomio de resultado al estado anterior guardado en el historial.
-        """
-        if not self.history.is_empty():
-            self.history.pop() # Elimina el estado actual.
-            if not self.history.is_empty():
-                # Restaura al estado anterior (la cima de la pila).
-                self.result = self.history.peek().clone()
+    def __rsub__(self, other):
+        """Resta este polinomio de un polinomio enlazado a la izquierda."""
+        return -self._merge(other, -1.0)
+
+    def _merge(self, other, sign):
+        """Mezcla los términos de ambos operandos, multiplicando los de other por sign."""
+        a_degrees, a_coeffs = self.terms.degrees, self.terms.coefficients
+        if isinstance(other, ArrayPolynomial):
+            b_degrees, b_coeffs = other.terms.degrees, other.terms.coefficients
+        else:
+            pairs = other._desc_pairs()[::-1]
+            b_degrees = array('q', [degree for degree, _ in pairs])
+            b_coeffs = array('d', [coeff for _, coeff in pairs])
+        degrees = array('q')
+        coefficients = array('d')
+        i = j = 0
+        n, m = len(a_degrees), len(b_degrees)
+        while i < n and j < m:
+            a_degree, b_degree = a_degrees[i], b_degrees[j]
+            if a_degree < b_degree:
+                degrees.append(a_degree)
+                coefficients.append(a_coeffs[i])
+                i += 1
+            elif b_degree < a_degree:
+                degrees.append(b_degree)
+                coefficients.append(sign * b_coeffs[j])
+                j += 1
             else:
-                # Si la pila queda vacía, el resultado es un polinomio cero.
-                self.result = Polynomial()
+                coeff = a_coeffs[i] + sign * b_coeffs[j]
+                if coeff != 0:
+                    degrees.append(a_degree)
+                    coefficients.append(coeff)
+                i += 1
+                j += 1
+        degrees.extend(a_degrees[i:])
+        coefficients.extend(a_coeffs[i:])
+        degrees.extend(b_degrees[j:])
+        coefficients.extend(b_coeffs[j:] if sign > 0 else array('d', [-coeff for coeff in b_coeffs[j:]]))
+        result = ArrayPolynomial()
+        result.terms = TermArray(degrees, coefficients)
+        return result
+
+    def _iter_terms(self):
+        """Recorre los términos en el orden de presentación, como pares (coeficiente, grado)."""
+        degrees, coefficients = self.terms.degrees, self.terms.coefficients
+        indices = range(len(degrees)) if self._ascending else range(len(degrees) - 1, -1, -1)
+        for i in indices:
+            yield coefficients[i], degrees[i]
+
+    def _desc_pairs(self):
+        """Devuelve los términos como pares (grado, coeficiente) en orden descendente."""
+        return list(zip(reversed(self.terms.degrees), reversed(self.terms.coefficients)))
+
+    @classmethod
+    def _from_desc_pairs(cls, pairs):
+        """Crea un polinomio a partir de pares (grado, coeficiente) ya ordenados y sin ceros."""
+        poly = cls()
+        poly.terms = TermArray(array('q', [degree for degree, _ in reversed(pairs)]),
+                               array('d', [coeff for _, coeff in reversed(pairs)]))
+        return poly
+
+    def save_binary(self, path):
+        """Guarda el polinomio en formato binario volcando directamente ambos arreglos."""
+        write_binary_arrays(path, self.terms.degrees, self.terms.coefficients)
+
+    @classmethod
+    def load_binary(cls, path):
+        """
+        Carga un polinomio binario sin copiar los datos: los arreglos quedan como vistas
+        sobre el archivo mapeado en memoria hasta la primera modificación.
+        """
+        poly = cls()
+        poly.terms = TermArray(*read_binary(path))
+        return poly
+
+    def clone(self):
+        """Crea y devuelve una copia de este polinomio copiando los arreglos."""
+        cloned_poly = ArrayPolynomial()
+        cloned_poly.terms = self.terms.copy()
+        cloned_poly._ascending = self._ascending
+        return cloned_poly
+
+class PersistentPolynomial(Polynomial):
+    """
+    Polinomio persistente sobre lista enlazada: los nodos nunca se modifican después de
+    enlazarse, así que varias versiones pueden compartir la parte de la lista que no cambió.
+    add_term y delete_term copian solo los nodos anteriores al término editado y reutilizan
+    el resto; snapshot() y clone() cuestan O(1) porque solo copian la referencia a la cabeza.
+
+    La lista se mantiene siempre de mayor a menor grado; el orden ascendente de
+    sort_terms es solo de presentación, como en ArrayPolynomial.
+    """
+
+    def __init__(self, backend="persistent"):
+        """Inicializa un polinomio persistente vacío."""
+        super().__init__(backend)
+        self._ascending = False
+
+    def add_term(self, coefficient, degree):
+        """
+        Añade un término creando una nueva versión de la lista.
+        Los nodos de mayor grado que el término se copian y los de menor grado se comparten.
+
+        Args:
+            coefficient (float): El coeficiente del término.
+            degree (int): El grado del término.
+        """
+        coefficient = float(coefficient)
+        degree = int(degree)
+        if coefficient == 0: return
+        prefix = []
+        current = self.terms.head
+        while current and degree < current.degree:
+            prefix.append(current)
+            current = current.next
+        if current and degree == current.degree:
+            total = current.coefficient + coefficient
+            tail = current.next if total == 0 else PolyNode(total, degree, current.next)
+        else:
+            tail = PolyNode(coefficient, degree, current)
+        self.terms.head = _relink(prefix, tail)
+
+    def delete_term(self, degree) -> bool:
+        """
+        Elimina un término creando una nueva versión de la lista que comparte los nodos posteriores.
+
+        Args:
+            degree (int): El grado del término a eliminar.
+
+        Returns:
+            bool: True si el término fue eliminado, False en caso contrario.
+        """
+        degree = int(degree)
+        prefix = []
+        current = self.terms.head
+        while current and degree < current.degree:
+            prefix.append(current)
+            current = current.next
+        if current is None or current.degree != degree:
+            return False
+        self.terms.head = _relink(prefix, current.next)
+        return True
+
+    def sort_terms(self, ascending=True):
+        """Cambia el orden de presentación de los términos sin tocar los nodos."""
+        self._ascending = ascending
+
+    def derivative(self):
+        """
+        Reemplaza el polinomio por su derivada. Los nodos pueden estar compartidos con otras
+        versiones, así que no se reescriben: la nueva versión se construye en una sola pasada.
+        """
+        self.terms.head = self._from_desc_pairs([(degree - 1, coefficient * degree)
+                                                 for degree, coefficient in _iter_nodes(self.terms.head)
+                                                 if degree != 0]).terms.head
+
+    def integral(self, constant=0.0):
+        """
+        Reemplaza el polinomio por su primitiva más constant, construyendo la nueva versión
+        en una sola pasada (los nodos de la versión anterior no se modifican).
+
+        Raises:
+            ValueError: Si hay un término x^-1.
+        """
+        constant = float(constant)
+        pairs = []
+        for degree, coefficient in _iter_nodes(self.terms.head):
+            if degree == -1:
+                raise ValueError("La primitiva de x^-1 no es un polinomio.")
+            if constant and degree < -1:
+                # La lista es descendente: la constante va antes del primer grado negativo.
+                pairs.append((0, constant))
+                constant = 0.0
+            pairs.append((degree + 1, coefficient / (degree + 1)))
+        if constant:
+            pairs.append((0, constant))
+        self.terms.head = self._from_desc_pairs(pairs).terms.head
+
+    def _iter_terms(self):
+        """Recorre los términos en el orden de presentación, como pares (coeficiente, grado)."""
+        if not self._ascending:
+            yield from super()._iter_terms()
+            return
+        yield from reversed(list(super()._iter_terms()))
+
+    def _desc_pairs(self):
+        """Devuelve los términos como pares (grado, coeficiente) en orden descendente."""
+        return list(_iter_nodes(self.terms.head))
+
+    def _changes_since(self, previous):
+        """
+        Devuelve los términos que cambiaron respecto a previous y la diferencia en el número de
+        términos. Si ambas versiones comparten nodos, el recorrido se detiene en el primer nodo
+        común: el costo es O(prefijo cambiado).
+        """
+        if not isinstance(previous, PersistentPolynomial):
+            return super()._changes_since(previous)
+        changes = []
+        delta = 0
+        old, new = previous.terms.head, self.terms.head
+        while old is not new:
+            if new is None or (old is not None and old.degree > new.degree):
+                changes.append((old.degree, 0.0))
+                delta -= 1
+                old = old.next
+            elif old is None or new.degree > old.degree:
+                changes.append((new.degree, new.coefficient))
+                delta += 1
+                new = new.next
+            else:
+                if old.coefficient != new.coefficient:
+                    changes.append((new.degree, new.coefficient))
+                old, new = old.next, new.next
+        return changes, delta
+
+    def snapshot(self):
+        """Devuelve otra versión que comparte todos los nodos con esta, en O(1)."""
+        version = type(self)()
+        version.terms.head = self.terms.head
+        version._ascending = self._ascending
+        return version
+
+    clone = snapshot
+
+# Clases de almacenamiento disponibles para Polynomial(backend=...).
+BACKENDS = {"linked": Polynomial, "array": ArrayPolynomial, "persistent": PersistentPolynomial}
+
+class FrozenPolynomial:
+    """
+    Valor inmutable de un polinomio, utilizable como clave de diccionario.
+    Guarda la forma canónica (grados de mayor a menor, sin repetidos ni coeficientes
+    nulos) en dos tuplas y calcula el hash una sola vez al construirse, de modo que
+    comparar dos valores distintos suele resolverse solo con el hash.
+    """
+    __slots__ = ("degrees", "coefficients", "_hash")
+
+    def __init__(self, terms=()):
+        """
+        Crea el valor a partir de términos en cualquier orden.
+
+        Args:
+            terms (iterable): Pares (coeficiente, grado).
+        """
+        pairs = Polynomial.from_terms(terms)._desc_pairs()
+        self._set_pairs(pairs)
+
+    @classmethod
+    def _from_desc_pairs(cls, pairs):
+        """Crea el valor a partir de pares (grado, coeficiente) ya en forma canónica."""
+        frozen = cls.__new__(cls)
+        frozen._set_pairs(pairs)
+        return frozen
+
+    def _set_pairs(self, pairs):
+        """Fija las tuplas canónicas y el hash (solo se usa durante la construcción)."""
+        degrees = tuple(degree for degree, _ in pairs)
+        coefficients = tuple(coeff for _, coeff in pairs)
+        object.__setattr__(self, "degrees", degrees)
+        object.__setattr__(self, "coefficients", coefficients)
+        object.__setattr__(self, "_hash", hash((degrees, coefficients)))
+
+    def __setattr__(self, name, value):
+        """Impide modificar el valor una vez creado."""
+        raise AttributeError("FrozenPolynomial es inmutable.")
+
+    def __reduce__(self):
+        """
+        Se serializa como sus pares canónicos: la restauración por defecto de los slots
+        pasaría por __setattr__. El hash se recalcula al reconstruirlo.
+        """
+        return (FrozenPolynomial._from_desc_pairs, (list(zip(self.degrees, self.coefficients)),))
+
+    def __copy__(self):
+        """Un valor inmutable es su propia copia."""
+        return self
+
+    def __deepcopy__(self, memo):
+        """Un valor inmutable es su propia copia profunda."""
+        return self
+
+    def __hash__(self):
+        """Devuelve el hash precalculado."""
+        return self._hash
+
+    def __eq__(self, other):
+        """Igualdad estructural: mismos grados y coeficientes en forma canónica."""
+        if not isinstance(other, FrozenPolynomial):
+            return NotImplemented
+        return (self._hash == other._hash and self.degrees == other.degrees
+                and self.coefficients == other.coefficients)
+
+    def __len__(self):
+        """Devuelve el número de términos."""
+        return len(self.degrees)
+
+    def __iter__(self):
+        """Recorre los términos de mayor a menor grado como pares (coeficiente, grado)."""
+        return zip(self.coefficients, self.degrees)
+
+    _iter_terms = __iter__
+    iter_render = Polynomial.iter_render
+    write_to = Polynomial.write_to
+    preview = Polynomial.preview
+    _preview = Polynomial._preview
+    __str__ = Polynomial.__str__
+    roots = Polynomial.roots
+    real_roots = Polynomial.real_roots
+
+    def __repr__(self):
+        """Representación para depuración."""
+        return f"FrozenPolynomial({str(self)!r})"
+
+    def thaw(self, backend="linked"):
+        """Devuelve un Polynomial mutable con los mismos términos en O(n)."""
+        return BACKENDS[backend]._from_desc_pairs(list(zip(self.degrees, self.coefficients)))
+
+# Operación de cada nombre, para el cálculo en vivo.
+_LIVE_OPERATIONS = {"add": add, "subtract": sub, "multiply": mul, "compose": lambda p, q: p.compose(q)}
+
+def _plan_queue(operations):
+    """
+    Planifica una lista de operaciones encoladas.
+
+    Returns:
+        tuple: (última suma/resta o None, cambios por grado, orden final o None). Cada cambio es
+        ("add", c) para sumar c al coeficiente, ("set", c) para reemplazarlo o ("delete", 0.0).
+    """
+    replace = None
+    patch = {}
+    ascending = None
+    for operation in operations:
+        operation_type, args, _ = operation
+        if operation_type in ("add", "subtract"):
+            # Reemplaza el resultado: lo anterior ya no influye.
+            replace, patch, ascending = operation, {}, None
+        elif operation_type == "add_term":
+            coeff, degree = args
+            if coeff == 0:
+                continue
+            action, value = patch.get(degree, ("add", 0.0))
+            patch[degree] = ("set" if action != "add" else "add", value + coeff)
+        elif operation_type == "delete_term":
+            patch[args[0]] = ("delete", 0.0)
+        elif operation_type in ("sort_asc", "sort_desc"):
+            ascending = operation_type == "sort_asc"
+    return replace, patch, ascending
+
+def _apply_patch(pairs, changes):
+    """Aplica en una sola mezcla cambios descendentes (ver _plan_queue) a pares descendentes."""
+    result = []
+    i = 0
+    for degree, (action, value) in changes:
+        while i < len(pairs) and pairs[i][0] > degree:
+            result.append(pairs[i])
+            i += 1
+        current = 0.0
+        if i < len(pairs) and pairs[i][0] == degree:
+            current = pairs[i][1]
+            i += 1
+        if action == "add":
+            value += current
+        if action != "delete" and value != 0:
+            result.append((degree, value))
+    result.extend(pairs[i:])
+    return result
+
+def _iter_nodes(head):
+    """Recorre una lista de PolyNode desde la cabeza como pares (grado, coeficiente)."""
+    while head:
+        yield head.degree, head.coefficient
+        head = head.next
+
+def _relink(prefix, tail):
+    """Copia los nodos de prefix (en orden de la lista) delante de tail y devuelve la nueva cabeza."""
+    for node in reversed(prefix):
+        tail = PolyNode(node.coefficient, node.degree, tail)
+    return tail
+
+def _shift_columns(terms, step):
+    """
+    Deriva (step=-1) o integra (step=1) en su lugar las columnas de un TermArray.
+    El orden de los grados no cambia, así que los arreglos siguen ordenados.
+    """
+    degrees, coefficients = terms.degrees, terms.coefficients
+    if not degrees:
+        return
+    if np is not None:
+        # Vistas escribibles sobre la memoria de los arreglos: no se copia nada.
+        degree_view = np.frombuffer(degrees, dtype=np.int64)
+        coefficient_view = np.frombuffer(coefficients, dtype=np.float64)
+        if step < 0:
+            coefficient_view *= degree_view
+            degree_view -= 1
+        else:
+            degree_view += 1
+            coefficient_view /= degree_view
+        return
+    for index in range(len(degrees)):
+        if step < 0:
+            coefficients[index] *= degrees[index]
+            degrees[index] -= 1
+        else:
+            degrees[index] += 1
+            coefficients[index] /= degrees[index]
+
+def _format_term(coeff, degree, is_first):
+    """Formatea un término con su signo: sin separador si es el primero, " + " o " - " si no."""
+    # Determina el signo del término.
+    sign = '' if is_first else (' + ' if coeff > 0 else ' - ')
+    if is_first and coeff < 0: sign = '-'
+
+    coeff_abs = abs(coeff)
+    # Formatea el coeficiente.
+    coeff_str = '' if coeff_abs == 1 and degree != 0 else str(round(coeff_abs, 2) if not float(coeff_abs).is_integer() else int(coeff_abs))
+
+    # Formatea el término según el grado.
+    if degree == 0: return f"{sign}{coeff_str}"
+    elif degree == 1: return f"{sign}{coeff_str}x"
+    return f"{sign}{coeff_str}x^{degree}"
+
+def _format_root(z):
+    """
+    Formatea una raíz compleja. Una parte imaginaria por debajo de ROOT_TOLERANCE·max(1, |z|)
+    se toma como cero (la raíz se muestra como real), igual que una parte real por debajo de
+    ROOT_TOLERANCE·|z|, que no borra raíces reales pequeñas; -0.0 se muestra como 0.
+    """
+    z = complex(z)
+    # Sumar 0.0 convierte -0.0 en 0.0.
+    real = 0.0 if abs(z.real) <= ROOT_TOLERANCE * abs(z) else z.real + 0.0
+    imag = 0.0 if abs(z.imag) <= ROOT_TOLERANCE * max(1.0, abs(z)) else z.imag + 0.0
+    if imag == 0:
+        return f"{real:.6g}"
+    return f"{real:.6g}{imag:+.6g}i"
+
+def _is_dense(pairs):
+    """Indica si unos términos descendentes ocupan suficientes grados de 0..n como para tratarlos como vector."""
+    if pairs[-1][0] < 0:
+        return False
+    return len(pairs) >= DENSE_DENSITY * (pairs[0][0] + 1)
+
+def _dense_coefficients(pairs):
+    """Convierte pares (grado, coeficiente) descendentes en un vector de coeficientes indexado por grado."""
+    if np is not None:
+        coefficients = np.zeros(pairs[0][0] + 1)
+    else:
+        coefficients = [0.0] * (pairs[0][0] + 1)
+    for degree, coefficient in pairs:
+        coefficients[degree] = coefficient
+    return coefficients
+
+def _convolve(a, b):
+    """Producto de dos vectores de coeficientes (convolución discreta)."""
+    if np is not None:
+        return np.convolve(a, b)
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, coeff_a in enumerate(a):
+        if coeff_a == 0:
+            continue
+        for j, coeff_b in enumerate(b):
+            result[i + j] += coeff_a * coeff_b
+    return result
+
+def _horner(pairs, x):
+    """Evalúa términos descendentes (grado, coeficiente) en un escalar con Horner por huecos."""
+    if not pairs:
+        return 0.0
+    prev_degree, acc = pairs[0]
+    for degree, coefficient in pairs[1:]:
+        acc = acc * x ** (prev_degree - degree) + coefficient
+        prev_degree = degree
+    return acc * x ** prev_degree if prev_degree else acc
+
+def _horner_vector(pairs, x):
+    """Versión vectorial de _horner: cada paso se aplica en el lugar sobre todo el arreglo x."""
+    acc = np.zeros_like(x, dtype=np.result_type(x, float))
+    if not pairs:
+        return acc
+    powers = {}
+    prev_degree, leading = pairs[0]
+    acc += leading
+    for degree, coefficient in pairs[1:]:
+        gap = prev_degree - degree
+        if gap == 1:
+            acc *= x
+        else:
+            if gap not in powers:
+                powers[gap] = x ** gap
+            acc *= powers[gap]
+        acc += coefficient
+        prev_degree = degree
+    if prev_degree:
+        acc *= x ** prev_degree
+    return acc
+
+def _power(poly, exponent, powers):
+    """Devuelve poly^exponent por cuadrados sucesivos, guardando en powers cada potencia calculada."""
+    if exponent not in powers:
+        half = _power(poly, exponent // 2, powers)
+        square = half * half
+        powers[exponent] = square * poly if exponent % 2 else square
+    return powers[exponent]
+
+def _compose_dense(p, q):
+    """
+    p(q(x)) para vectores de coeficientes indexados por grado (ver Polynomial.compose).
+    Las hojas son tramos de COMPOSE_LEAF coeficientes de p y se evalúan en q con un solo
+    producto de matrices; después se combinan por parejas con low + q^h·high, donde q^h
+    se eleva al cuadrado en cada nivel. El error de una FFT es relativo al mayor coeficiente:
+    si se usó alguna, lo que queda por debajo de COMPOSE_TOLERANCE se toma como cero.
+    Si algún coeficiente desborda, la FFT lo reparte como NaN por todo el vector, así que
+    se lanza ValueError en lugar de devolver un resultado sin sentido.
+    """
+    with np.errstate(over="ignore", invalid="ignore"):
+        result = _compose_dense_levels(p, q)
+    if not np.isfinite(result).all():
+        raise ValueError("Los coeficientes de la composición desbordan el rango de los números de punto flotante.")
+    return result
+
+def _compose_dense_levels(p, q):
+    """Calcula las hojas y las combina por niveles (ver _compose_dense)."""
+    leaf = min(COMPOSE_LEAF, len(p))
+    # Fila i: coeficientes de q^i, rellenados con ceros hasta la longitud de q^(leaf-1).
+    table = np.zeros((leaf, (leaf - 1) * (len(q) - 1) + 1))
+    power = np.ones(1)
+    for i in range(leaf):
+        table[i, :len(power)] = power
+        power = _fast_convolve(power, q)
+    used_fft = leaf > 1 and len(q) >= FFT_THRESHOLD
+    blocks = -(-len(p) // leaf)
+    padded = np.zeros(blocks * leaf)
+    padded[:len(p)] = p
+    level = list(padded.reshape(blocks, leaf) @ table)
+    step = power # q^leaf: desplaza un bloque del nivel actual
+    while len(level) > 1:
+        merged = []
+        for i in range(0, len(level) - 1, 2):
+            used_fft = used_fft or min(len(step), len(level[i + 1])) >= FFT_THRESHOLD
+            high = _fast_convolve(step, level[i + 1])
+            high[:len(level[i])] += level[i]
+            merged.append(high)
+        if len(level) % 2:
+            merged.append(level[-1]) # El último bloque sin pareja conserva su posición.
+        level = merged
+        if len(level) > 1:
+            step = _fast_convolve(step, step)
+    result = level[0]
+    if used_fft and np.isfinite(result).all():
+        result[np.abs(result) <= COMPOSE_TOLERANCE * _max_abs(result)] = 0.0
+    return result
+
+def _fast_convolve(a, b):
+    """Producto de vectores de coeficientes; por FFT cuando ambos superan FFT_THRESHOLD."""
+    if min(len(a), len(b)) < FFT_THRESHOLD:
+        return np.convolve(a, b)
+    size = len(a) + len(b) - 1
+    n = 1 << (size - 1).bit_length()
+    if np.iscomplexobj(a) or np.iscomplexobj(b):
+        return np.fft.ifft(np.fft.fft(a, n) * np.fft.fft(b, n))[:size]
+    return np.fft.irfft(np.fft.rfft(a, n) * np.fft.rfft(b, n), n)[:size]
+
+def _subproduct_tree(blocks, max_growth):
+    """
+    Construye el árbol de subproductos: la hoja i es ∏(x − p) para los puntos p del bloque i
+    y cada nodo es el producto de sus dos hijos. Devuelve los niveles desde las hojas a la raíz,
+    o None en cuanto un nivel tiene un coeficiente (en valor absoluto) mayor que max_growth:
+    los niveles superiores solo crecerían más y no hace falta construirlos.
+    """
+    level = _leaf_products(blocks)
+    tree = [level]
+    while True:
+        if not max(float(np.abs(node).max()) for node in level) <= max_growth:
+            return None # "not <=" también descarta los desbordamientos (inf y nan).
+        if len(level) == 1:
+            return tree
+        level = [_fast_convolve(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+        tree.append(level)
+
+def _leaf_products(blocks):
+    """
+    Devuelve ∏(x − p) de cada bloque como vector ascendente, multiplicando todas las hojas a la
+    vez por un factor (x − p) en cada paso; un bloque más corto deja de cambiar al agotar sus puntos.
+    """
+    width = max(len(block) for block in blocks)
+    grid = np.zeros((len(blocks), width), dtype=np.result_type(*blocks, float))
+    for i, block in enumerate(blocks):
+        grid[i, :len(block)] = block
+    lengths = np.array([len(block) for block in blocks])
+    rows = np.zeros((len(blocks), width + 1), dtype=grid.dtype)
+    rows[:, 0] = 1.0
+    for j in range(width):
+        active = lengths > j
+        # (x − p)·a: el coeficiente k pasa a ser a[k-1] − p·a[k].
+        rows[active, 1:j + 2] = rows[active, :j + 1] - grid[active, j:j + 1] * rows[active, 1:j + 2]
+        rows[active, 0] *= -grid[active, j]
+    return [rows[i, :length + 1] for i, length in enumerate(lengths)]
+
+def _multipoint_evaluate(coefficients, points):
+    """
+    Evalúa un vector de coeficientes en todos los puntos reduciendo por restos a lo largo
+    del árbol de subproductos: p mod (nodo) baja de la raíz a las hojas y en cada hoja
+    el resto (de grado < MULTIPOINT_LEAF) se evalúa con Horner en todos los bloques a la vez.
+
+    Los puntos se ordenan y se reparten en peine (hoja en la posición i toma los de índice
+    ≡ bitrev(i)), de modo que cada nodo agrupa puntos espaciados y no un racimo de puntos
+    vecinos, cuyo producto tendría coeficientes enormes. Si el mayor coeficiente del árbol
+    supera MULTIPOINT_MAX_GROWTH la reducción no sería fiable en coma flotante y se devuelve
+    None; el árbol se abandona en el primer nivel que la supera, sin avisos de desbordamiento.
+    También se devuelve None si algún valor no es finito: nunca se entregan NaN del árbol.
+    """
+    num_blocks = 1 << (-(-len(points) // MULTIPOINT_LEAF) - 1).bit_length()
+    order = np.argsort(np.angle(points) if np.iscomplexobj(points) else points, kind="stable")
+    bits = num_blocks.bit_length() - 1
+    indices = [order[int(format(i, f"0{bits}b")[::-1] or "0", 2)::num_blocks] for i in range(num_blocks)]
+    blocks = [points[index] for index in indices]
+    with np.errstate(over="ignore", invalid="ignore"):
+        tree = _subproduct_tree(blocks, MULTIPOINT_MAX_GROWTH)
+        if tree is None:
+            return None
+        remainders = [_reduce(coefficients, tree[-1][0])]
+        for level in reversed(tree[:-1]):
+            # El nodo i de un nivel es hijo del nodo i // 2 del nivel superior.
+            remainders = [_reduce(remainders[i // 2], node) for i, node in enumerate(level)]
+
+    # Horner simultáneo: una fila por bloque, rellenando con ceros los bloques más cortos.
+    width = max(len(block) for block in blocks)
+    dtype = np.result_type(points, coefficients, float)
+    table = np.zeros((num_blocks, width), dtype=dtype)
+    grid = np.zeros((num_blocks, width), dtype=dtype)
+    for i, (remainder, block) in enumerate(zip(remainders, blocks)):
+        table[i, :len(remainder)] = remainder
+        grid[i, :len(block)] = block
+    acc = np.repeat(table[:, -1:], width, axis=1)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for k in range(width - 2, -1, -1):
+            acc *= grid
+            acc += table[:, k:k + 1]
+    if not np.isfinite(acc).all():
+        return None
+    values = np.empty(len(points), dtype=dtype)
+    for i, index in enumerate(indices):
+        values[index] = acc[i, :len(index)]
+    return values
+
+def _reduce(coefficients, modulus):
+    """Resto de un vector de coeficientes módulo otro (sin dividir si ya es de grado menor)."""
+    if len(coefficients) < len(modulus):
+        return coefficients
+    return _divmod_dense(coefficients, modulus)[1]
+
+def _max_abs(coefficients):
+    """Devuelve el mayor valor absoluto de un vector de coeficientes."""
+    return max(abs(c) for c in coefficients) if np is None else float(np.abs(coefficients).max())
+
+def _divmod_dense(a, b):
+    """
+    Divide dos vectores de coeficientes indexados por grado (b con coeficiente principal no nulo).
+    Devuelve el cociente y el resto como vectores; el resto tiene longitud len(b) - 1.
+    """
+    n, m = len(a) - 1, len(b) - 1
+    if n < m:
+        return [0.0], a
+    if np is not None:
+        dtype = np.result_type(np.asarray(a), np.asarray(b), float)
+        if n - m + 1 > NEWTON_THRESHOLD:
+            return _divmod_newton(np.asarray(a, dtype=dtype), np.asarray(b, dtype=dtype))
+    lead = b[-1]
+    if np is not None:
+        remainder = np.array(a, dtype=dtype)
+        quotient = np.zeros(n - m + 1, dtype=dtype)
+        b_low = np.asarray(b[:-1], dtype=dtype)
+        for k in range(n - m, -1, -1):
+            coeff = remainder[k + m] / lead
+            quotient[k] = coeff
+            if coeff != 0:
+                remainder[k:k + m] -= coeff * b_low
+        return quotient, remainder[:m]
+    remainder = [float(c) for c in a]
+    quotient = [0.0] * (n - m + 1)
+    for k in range(n - m, -1, -1):
+        coeff = remainder[k + m] / lead
+        quotient[k] = coeff
+        if coeff != 0:
+            for j in range(m):
+                remainder[k + j] -= coeff * b[j]
+    return quotient, remainder[:m]
+
+def _series_inverse(f, length):
+    """Inverso de la serie de potencias f módulo x^length mediante la iteración de Newton g ← g·(2 − f·g)."""
+    g = np.array([1.0 / f[0]])
+    k = 1
+    while k < length:
+        k = min(2 * k, length)
+        correction = -_fast_convolve(f[:k], g)[:k]
+        correction[0] += 2.0
+        g = _fast_convolve(g, correction)[:k]
+    return g
+
+def _divmod_newton(a, b):
+    """División densa en O(M(n)) usando los polinomios recíprocos: rev(q) = rev(a)·rev(b)⁻¹ mod x^(n−m+1)."""
+    n, m = len(a) - 1, len(b) - 1
+    length = n - m + 1
+    inverse = _series_inverse(b[::-1], length)
+    quotient = _fast_convolve(a[::-1][:length], inverse)[:length][::-1]
+    remainder = a[:m] - _fast_convolve(b, quotient)[:m]
+    # La inversión en coma flotante deja residuos del orden del redondeo.
+    scale = max(_max_abs(a), 1.0)
+    remainder[np.abs(remainder) <= 1e-12 * scale] = 0.0
+    return quotient, remainder
+
+def _frozen_size(frozen):
+    """Estimación en bytes de la memoria que ocupa un FrozenPolynomial."""
+    # Tuplas más un int y un float por término.
+    return sys.getsizeof(frozen.degrees) + sys.getsizeof(frozen.coefficients) + 56 * len(frozen)
+
+def _frozen_is_dense(frozen):
+    """Indica si un FrozenPolynomial se multiplicaría como vector denso (ver _is_dense)."""
+    return bool(frozen.degrees) and frozen.degrees[-1] >= 0 and len(frozen) >= DENSE_DENSITY * (frozen.degrees[0] + 1)
+
+def _frozen_columns(frozen):
+    """Empaqueta un FrozenPolynomial en columnas ascendentes (array('q'), array('d'))."""
+    return array('q', reversed(frozen.degrees)), array('d', reversed(frozen.coefficients))
+
+class PolynomialModel:
+    """
+    Clase que representa el modelo de la aplicación.
+    Contiene la lógica de negocio y el estado de la calculadora de polinomios.
+    """
+    def __init__(self, backend="persistent", cache_bytes=CACHE_BYTES,
+                 history_entries=HISTORY_MAX_ENTRIES, history_bytes=HISTORY_MAX_BYTES, workers=None):
+        """Inicializa el modelo.
+
+        Args:
+            backend (str): Almacenamiento de los polinomios: "persistent", "linked" o "array".
+                Con "persistent" guardar y restaurar el historial cuesta O(1).
+            cache_bytes (int): Presupuesto total de las cachés de análisis y de resultados.
+            history_entries (int): Número máximo de entradas del historial.
+            history_bytes (int): Presupuesto estimado en bytes del historial.
+            workers (int, optional): Procesos para las operaciones grandes. Defaults to None (uno por núcleo).
+        """
+        self.backend = backend
+        # Caché de dos niveles: cadena normalizada -> operando, y
+        # (operación, operando 1, operando 2) -> resultado, ambos como FrozenPolynomial.
+        self.parse_cache = LRUCache(cache_bytes // 2)
+        self.result_cache = LRUCache(cache_bytes - cache_bytes // 2)
+        self._operand_keys = [None, None] # (polinomio, valor congelado) de cada operando
+        self.poly1 = Polynomial(backend)  # Primer polinomio operando
+        self.poly2 = Polynomial(backend)  # Segundo polinomio operando
+        self._edited_result = None # Texto del resultado editado en la vista y aún sin analizar
+        self.result = Polynomial(backend) # Polinomio resultado
+        # Cálculo en vivo: un analizador incremental por operando, el último polinomio que
+        # construyó cada uno (se actualiza solo en los términos editados) y cuántas veces
+        # aparece cada grado en el texto.
+        self._live_parsers = (IncrementalParser(), IncrementalParser())
+        self._live_operands = [None, None]
+        self._live_degrees = [None, None]
+        # Protege ese estado: el cálculo en vivo corre en hilos de temporizador sin tomar lock.
+        self._live_lock = threading.Lock()
+        # Pila acotada con el historial de resultados (para la función de deshacer).
+        self.history = PolynomialHistory(BACKENDS[backend], history_entries, history_bytes)
+        self.operations_queue = Queue() # Cola para las operaciones en espera
+        # Operaciones encoladas y sacadas desde el inicio: la operación en la posición i de la
+        # cola es la número _dequeued + i, lo que identifica su fila en la vista.
+        self._enqueued = 0
+        self._dequeued = 0
+        # La cola puede consumirse desde un hilo de trabajo (pol_worker) mientras la UI encola:
+        # _queue_lock protege la cola y lock el resto del estado (operandos, resultado, historial).
+        self._queue_lock = threading.Lock()
+        self.lock = threading.RLock()
+        # Procesos para las operaciones que superan los umbrales de pol_pool (se crean al primer uso).
+        self.pool = OffloadPool(workers)
+        self._initialize_queue()
+        # Se añade un polinomio vacío al historial como estado inicial.
+        self.history.push(Polynomial(backend))
+
+    @property
+    def result(self):
+        """El polinomio resultado. El modelo es la referencia: la vista solo muestra una copia en texto."""
+        return self._result
+
+    @result.setter
+    def result(self, poly):
+        """Reemplaza el resultado; una edición pendiente del texto anterior deja de tener efecto."""
+        self._result = poly
+        self._edited_result = None
+        self._live_pending = False # True si el resultado viene del cálculo en vivo y no está en el historial
+
+    @property
+    def result_dirty(self) -> bool:
+        """Indica si el usuario editó el texto del resultado y todavía no se analizó."""
+        return self._edited_result is not None
+
+    def edit_result(self, text: str):
+        """
+        Registra que el usuario editó el texto del resultado. No se analiza aquí, sino en
+        sync_result, justo antes de la próxima operación que use el resultado.
+        """
+        self._edited_result = text
+
+    def sync_result(self) -> bool:
+        """
+        Analiza el texto editado del resultado, solo si hubo una edición.
+
+        Returns:
+            bool: True si el resultado se reemplazó por el texto editado.
+
+        Raises:
+            ValueError: Si el texto editado no es un polinomio válido (la edición sigue pendiente).
+        """
+        if self._edited_result is None:
+            return False
+        self.result = self._parse_poly(self._edited_result or "0")
+        return True
+
+    def _initialize_queue(self):
+        """Inicializa la cola con operaciones predefinidas si es necesario."""
+        pass # Actualmente no se encolan operaciones iniciales.
+
+    def _parse_poly(self, poly_str: str) -> Polynomial:
+        """
+        Analiza una cadena de texto y la convierte en un objeto Polynomial.
+        El analizador léxico recorre la cadena una sola vez y sus términos se
+        construyen en bloque con Polynomial.from_terms.
+
+        Args:
+            poly_str (str): La cadena que representa el polinomio.
+
+        Returns:
+            Polynomial: El objeto Polynomial correspondiente.
+
+        Raises:
+            PolynomialSyntaxError: Si la cadena no es válida (indica la posición del error).
+        """
+        return BACKENDS[self.backend].from_terms(scan_terms(poly_str))
+
+    def set_polynomials(self, poly1_str: str, poly2_str: str = None):
+        """
+        Establece los polinomios operandos a partir de sus representaciones en cadena.
+
+        Args:
+            poly1_str (str): Cadena del primer polinomio.
+            poly2_str (str, optional): Cadena del segundo polinomio. Defaults to None.
+        """
+        self._use_operands(self._parse_cached(poly1_str),
+                           self._parse_cached(poly2_str) if poly2_str is not None else None)
+
+    def _use_operands(self, frozen1, frozen2=None):
+        """Establece los operandos a partir de sus valores congelados (frozen2=None conserva el segundo)."""
+        self.poly1 = frozen1.thaw(self.backend)
+        self._operand_keys[0] = (self.poly1, frozen1)
+        if frozen2 is not None:
+            self.poly2 = frozen2.thaw(self.backend)
+            self._operand_keys[1] = (self.poly2, frozen2)
+
+    def live_compute(self, operation: str, poly1_str: str, poly2_str: str, cancelled=None) -> bool:
+        """
+        Calcula el resultado mientras el usuario escribe, sin guardarlo en el historial.
+        Cada operando se analiza con su analizador incremental (solo se vuelven a analizar
+        los términos editados) y solo se actualiza el operando cuyo texto cambió. No se
+        usan las cachés: cada pulsación da operandos nuevos y congelarlos costaría O(n).
+        La operación se calcula sobre instantáneas sin tomar lock, para no bloquear a la cola
+        ni a los botones; el resultado se publica solo si no llegó una edición más reciente.
+
+        Args:
+            operation (str): "add", "subtract", "multiply" o "compose".
+            poly1_str (str): Texto del primer polinomio.
+            poly2_str (str): Texto del segundo polinomio.
+            cancelled (callable, optional): Devuelve True si llegó una edición más reciente;
+                se consulta entre etapas para abandonar un cálculo obsoleto.
+
+        Returns:
+            bool: True si se calculó el resultado, False si se abandonó.
+
+        Raises:
+            PolynomialSyntaxError: Si alguno de los textos no es válido.
+            ValueError: Si los operandos superan los límites del cálculo en vivo
+                (LIVE_MAX_PRODUCTS, LIVE_MAX_TERMS) o la operación no es posible.
+        """
+        cancelled = cancelled or (lambda: False)
+        with self._live_lock:
+            for index, text in enumerate((poly1_str, poly2_str)):
+                if cancelled():
+                    return False
+                parser = self._live_parsers[index]
+                if parser.update(text) or self._live_operands[index] is None:
+                    if not self._splice_live_operand(index):
+                        self._live_operands[index] = BACKENDS[self.backend].from_terms(parser.terms)
+                        self._live_degrees[index] = Counter(degree for _, degree in parser.terms)
+            if cancelled():
+                return False
+            if not self._live_affordable(operation):
+                raise ValueError("Operandos demasiado grandes para calcular en vivo: use el botón de la operación.")
+            # Instantáneas (O(1) con "persistent"): los operandos en vivo se modifican en la siguiente pulsación.
+            poly1, poly2 = (operand.snapshot() for operand in self._live_operands)
+        result = _LIVE_OPERATIONS[operation](poly1, poly2)
+        with self.lock:
+            if cancelled():
+                return False
+            self.poly1, self.poly2 = poly1, poly2
+            self.result = result
+            self._live_pending = True
+            return True
+
+    def _live_affordable(self, operation: str) -> bool:
+        """Indica si los operandos en vivo están dentro de LIVE_MAX_PRODUCTS y LIVE_MAX_TERMS."""
+        # Grados distintos del texto (los de coeficiente nulo también cuentan): basta para acotar.
+        sizes = [len(degrees) for degrees in self._live_degrees]
+        tops = [max(degrees, default=0) for degrees in self._live_degrees]
+        if operation == "compose":
+            return (tops[0] + 1) * (tops[1] + 1) <= LIVE_MAX_PRODUCTS
+        if operation == "multiply" and sizes[0] * sizes[1] > LIVE_MAX_PRODUCTS:
+            # Con NumPy, la multiplicación densa es una convolución que cuesta según los grados.
+            if np is None:
+                return False
+            lows = [min(degrees, default=0) for degrees in self._live_degrees]
+            dense = all(low >= 0 and size >= DENSE_DENSITY * (top + 1)
+                        for low, size, top in zip(lows, sizes, tops))
+            return dense and sum(tops) + 2 <= LIVE_MAX_TERMS
+        return sum(sizes) <= LIVE_MAX_TERMS
+
+    def _splice_live_operand(self, index: int) -> bool:
+        """
+        Lleva al operando en vivo los términos que el analizador acaba de reemplazar, en lugar
+        de reconstruirlo con from_terms: una pulsación cuesta lo que cuestan los términos editados.
+        Si un grado afectado aparece más de una vez en el texto, el coeficiente es una suma cuyo
+        redondeo depende del orden, así que se deja la reconstrucción para obtener el mismo valor.
+
+        Args:
+            index (int): 0 para el primer operando, 1 para el segundo.
+
+        Returns:
+            bool: True si se actualizó el operando, False si hay que reconstruirlo.
+        """
+        operand, degrees = self._live_operands[index], self._live_degrees[index]
+        replaced = self._live_parsers[index].replaced
+        if operand is None or replaced is None:
+            return False
+        # Los términos que el analizador volvió a leer sin cambios no tocan el operando.
+        unchanged = Counter(replaced[0]) & Counter(replaced[1])
+        removed, added = (list((Counter(terms) - unchanged).elements()) for terms in replaced)
+        if len(removed) + len(added) > LIVE_SPLICE_TERMS:
+            return False
+        affected = {degree for _, degree in removed + added}
+        if any(degrees[degree] > 1 for degree in affected):
+            return False
+        degrees.subtract(degree for _, degree in removed)
+        degrees.update(degree for _, degree in added)
+        for degree in affected:
+            if degrees[degree] <= 0:
+                del degrees[degree]
+        if any(degrees[degree] > 1 for degree in affected):
+            return False
+        for _, degree in removed:
+            operand.delete_term(degree)
+        for coeff, degree in added:
+            operand.add_term(coeff, degree)
+        return True
+
+    def load_operand(self, path: str, second: bool = False):
+        """
+        Carga un operando desde un archivo de texto (ver Polynomial.load_text).
+
+        Args:
+            path (str): Ruta del archivo.
+            second (bool): True para cargar el segundo polinomio en lugar del primero.
+        """
+        poly = BACKENDS[self.backend].load_text(path)
+        if second:
+            self.poly2 = poly
+        else:
+            self.poly1 = poly
+
+    def _parse_cached(self, poly_str: str) -> "FrozenPolynomial":
+        """Analiza una cadena usando la caché de análisis, indexada por la cadena sin espacios."""
+        key = poly_str.replace(" ", "")
+        frozen = self.parse_cache.get(key)
+        if frozen is None:
+            frozen = self._parse_poly(poly_str).freeze()
+            self.parse_cache.put(key, frozen, _frozen_size(frozen) + sys.getsizeof(key))
+        return frozen
+
+    def _operand_key(self, index):
+        """Devuelve el valor congelado del operando, reutilizándolo mientras sea el mismo objeto."""
+        poly = self.poly1 if index == 0 else self.poly2
+        cached = self._operand_keys[index]
+        if cached is None or cached[0] is not poly:
+            cached = (poly, poly.freeze())
+            self._operand_keys[index] = cached
+        return cached[1]
+
+    def _cached_operation(self, operation, compute):
+        """Calcula el resultado de una operación binaria o lo recupera de la caché de resultados."""
+        key = (operation, self._operand_key(0), self._operand_key(1))
+        frozen = self.result_cache.get(key)
+        if frozen is None:
+            self.result = compute()
+            frozen = self.result.freeze()
+            self.result_cache.put(key, frozen, _frozen_size(frozen) + _frozen_size(key[1]) + _frozen_size(key[2]))
+        else:
+            self.result = frozen.thaw(self.backend)
+
+    def cache_stats(self) -> dict:
+        """Devuelve los contadores de la caché de análisis y de la de resultados."""
+        return {"parse": self.parse_cache.stats(), "result": self.result_cache.stats()}
+
+    def add_term_to_poly1(self, coeff, degree):
+        """Añade un término al primer polinomio."""
+        self.poly1.add_term(coeff, degree)
+        self._operand_keys[0] = None # El operando cambió: su valor congelado ya no vale.
+
+    def add(self):
+        """Suma los dos polinomios operandos y guarda el resultado."""
+        self._cached_operation("add", lambda: self.poly1 + self.poly2)
+
+    def subtract(self):
+        """Resta el segundo polinomio del primero y guarda el resultado."""
+        self._cached_operation("subtract", lambda: self.poly1 - self.poly2)
+
+    def multiply(self):
+        """Multiplica los dos polinomios operandos y guarda el resultado."""
+        self._cached_operation("multiply", lambda: self._compute("multiply", lambda: self.poly1 * self.poly2))
+
+    def compose(self):
+        """
+        Compone los dos polinomios operandos, poly1(poly2(x)), y guarda el resultado.
+
+        Raises:
+            ValueError: Si alguno de los operandos tiene grados negativos o el resultado desborda.
+        """
+        self._cached_operation("compose", lambda: self.poly1.compose(self.poly2))
+
+    def _compute(self, operation, inline):
+        """
+        Calcula una operación binaria en este proceso o, si los operandos superan los umbrales
+        de pol_pool, repartiéndola entre procesos con los operandos como arreglos empaquetados.
+
+        Args:
+            operation (str): "multiply" (la única que pol_pool reparte).
+            inline (callable): Cálculo en el proceso actual.
+
+        Returns:
+            Polynomial: El resultado.
+        """
+        frozen1, frozen2 = self._operand_key(0), self._operand_key(1)
+        dense = operation == "multiply" and _frozen_is_dense(frozen1) and _frozen_is_dense(frozen2)
+        if not self.pool.should_offload(operation, len(frozen1), len(frozen2), dense):
+            return inline()
+        degrees, coefficients = self.pool.run(operation, _frozen_columns(frozen1), _frozen_columns(frozen2))
+        pairs = list(zip(degrees.tolist(), coefficients.tolist()))
+        pairs.reverse()
+        return BACKENDS[self.backend]._from_desc_pairs(pairs)
+
+    def undo(self):
+        """
+        Deshace la última operación.
+        Restaura el polinomio de resultado al estado anterior guardado en el historial.
+        Una edición del texto del resultado que aún no se analizó también se descarta.
+        """
+        self._edited_result = None
+        if self._live_pending:
+            # El resultado en vivo no se guardó: deshacer vuelve al último estado guardado sin quitarlo.
+            self.result = self.history.peek() or Polynomial(self.backend)
+            return
+        if not self.history.is_empty():
+            self.history.pop() # Elimina el estado actual.
+            if not self.history.is_empty():
+                # Restaura al estado anterior (la cima de la pila); peek ya devuelve una instantánea propia.
+                self.result = self.history.peek()
+            else:
+                # Si la pila queda vacía, el resultado es un polinomio cero.
+                self.result = Polynomial(self.backend)
+
+    def push_history(self):
+        """Guarda el resultado actual en el historial (el historial toma su propia instantánea)."""
+        self.history.push(self.result)
+        self._live_pending = False
 
     def clear_history(self):
         """Limpia el historial de operaciones."""
         print("clear_history in model called.")
-        self.history = Stack()
+        self.history.clear()
 
     def get_result_str(self) -> str:
         """Devuelve la representación en cadena del polinomio resultado."""
         return str(self.result)
 
+    def get_result_preview(self) -> str:
+        """Devuelve la vista previa acotada del polinomio resultado, para mostrarla en la UI."""
+        return self.result.preview()
+
+    def get_result_view(self) -> tuple[str, bool]:
+        """
+        Devuelve el texto a mostrar del resultado y si puede editarse: una vista previa
+        recortada no representa el polinomio completo, así que no se permite editarla.
+        """
+        text, truncated = self.result._preview()
+        return text, not truncated
+
+    def get_result_roots_view(self) -> str:
+        """
+        Devuelve un resumen de las raíces del resultado para mostrarlo como mensaje: las
+        primeras ROOTS_PREVIEW raíces complejas y, si el grado no supera EXACT_ROOTS_MAX_DEGREE,
+        las raíces reales distintas.
+
+        Raises:
+            ValueError: Si el resultado es cero, tiene grados negativos, coeficientes no finitos
+                o un grado excesivo.
+        """
+        roots = self.result.roots()
+        text = "Raíces: " + (", ".join(_format_root(z) for z in roots[:ROOTS_PREVIEW]) or "ninguna")
+        if len(roots) > ROOTS_PREVIEW:
+            text += f", … ({len(roots)} en total)"
+        if len(roots) <= EXACT_ROOTS_MAX_DEGREE:
+            real = self.result.real_roots()
+            text += f" | Reales distintas ({len(real)}): " + (", ".join(f"{r:.10g}" for r in real[:ROOTS_PREVIEW]) or "ninguna")
+            if len(real) > ROOTS_PREVIEW:
+                text += ", …"
+        return text
+
+    def export_result(self, path):
+        """
+        Escribe el texto completo del polinomio resultado en un archivo.
+
+        Args:
+            path (str): Ruta del archivo de destino.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            self.result.write_to(file)
+
     def get_history_list(self) -> list[str]:
         """
         Devuelve el historial de resultados como una lista de cadenas.
 
         Returns:
-            list[str]: Una lista con la representación en cadena de cada polinomio en el historial.
+            list[str]: Una lista con la vista previa de cada polinomio en el historial.
         """
-        items = []
-        current = self.history.head
-        while current:
-            items.append(str(current.value))
-            current = current.next
-        return items
+        # El historial tiene su propio candado: no se espera a que el hilo de trabajo termine su operación.
+        return self.history.previews()
+
+    def history_window(self, count: int) -> tuple[int, list[tuple[int, str]]]:
+        """
+        Devuelve lo necesario para mostrar las count entradas más recientes del historial.
+
+        Returns:
+            tuple: (total de entradas, lista de (número, vista previa) de la más reciente a la más antigua).
+        """
+        # Como get_history_list, no espera a model.lock; el candado del historial mantiene juntos ambos valores.
+        with self.history._lock:
+            return len(self.history), self.history.window(count)
+
+    def history_stats(self) -> dict:
+        """Devuelve el uso de memoria del historial (entradas, fotogramas clave, bytes y desalojos)."""
+        return self.history.memory_footprint()
 
     def enqueue_operation(self, operation_type: str, *args):
         """
         Encola una operación para su procesamiento posterior.
+        Los argumentos se validan y analizan al encolar: las sumas y restas guardan sus
+        operandos ya analizados, de modo que procesarlas no depende de lo que muestre la vista.
 
         Args:
             operation_type (str): El tipo de operación (ej. 'add', 'subtract').
             *args: Los argumentos para la operación.
+
+        Raises:
+            ValueError: Si algún argumento no es válido.
         """
-        self.operations_queue.enqueue((operation_type, args))
+        operands = None
+        if operation_type in ("add", "subtract"):
+            operands = (self._parse_cached(args[0]), self._parse_cached(args[1]))
+        elif operation_type == "add_term":
+            args = (float(args[0]), int(args[1]))
+        elif operation_type == "delete_term":
+            args = (int(args[0]),)
+        with self._queue_lock:
+            self.operations_queue.enqueue((operation_type, args, operands))
+            self._enqueued += 1
+
+    def dequeue_operation(self):
+        """Saca la siguiente operación de la cola, o devuelve None si está vacía."""
+        with self._queue_lock:
+            operation = self.operations_queue.dequeue()
+            if operation is not None:
+                self._dequeued += 1
+            return operation
+
+    def queued_operations(self) -> list:
+        """Devuelve una copia de las operaciones encoladas, de la primera a la última."""
+        items = []
+        with self._queue_lock:
+            current = self.operations_queue.head
+            while current:
+                items.append(current.value)
+                current = current.next
+        return items
+
+    def queued_count(self) -> int:
+        """Devuelve cuántas operaciones hay en la cola, en O(1) (sin recorrerla)."""
+        with self._queue_lock:
+            return self._enqueued - self._dequeued
+
+    @staticmethod
+    def describe_operation(operation) -> str:
+        """Devuelve el texto con que se muestra una operación encolada."""
+        op_type, op_args, _ = operation
+        return f"{op_type.capitalize()} {op_args}"
 
     def get_queue_list(self) -> list[str]:
         """
@@ -403,13 +2184,23 @@ class PolynomialModel:
         Returns:
             list[str]: Lista de operaciones encoladas.
         """
-        items = []
-        current = self.operations_queue.head
-        while current:
-            op_type, op_args = current.value
-            items.append(f"{op_type.capitalize()} {op_args}")
-            current = current.next
-        return items
+        return [self.describe_operation(operation) for operation in self.queued_operations()]
+
+    def queue_window(self, count: int) -> tuple[int, list[tuple[int, str]]]:
+        """
+        Devuelve lo necesario para mostrar las count primeras operaciones de la cola,
+        recorriendo solo esas operaciones.
+
+        Returns:
+            tuple: (total de operaciones, lista de (número, descripción) de la primera en adelante).
+        """
+        rows = []
+        with self._queue_lock:
+            current = self.operations_queue.head
+            while current and len(rows) < count:
+                rows.append((self._dequeued + len(rows), self.describe_operation(current.value)))
+                current = current.next
+            return self._enqueued - self._dequeued, rows
 
     def process_queue(self) -> bool:
         """
@@ -418,22 +2209,52 @@ class PolynomialModel:
         Returns:
             bool: True si una operación fue procesada, False si la cola estaba vacía.
         """
-        if self.operations_queue.is_empty():
-            return False
-
-        operation_data = self.operations_queue.dequeue()
+        operation_data = self.dequeue_operation()
         if not operation_data:
             return False
 
-        operation_type, args = operation_data
-        
-        # El controlador es responsable de establecer poly1 y poly2 desde la vista
-        # antes de llamar a process_queue.
+        self.execute_operation(operation_data)
+        return True
+
+    def drain_queue(self) -> int:
+        """
+        Procesa toda la cola de una vez, planificándola antes de ejecutarla:
+        - solo se ejecuta la última suma o resta, porque reemplaza el resultado;
+        - los add_term y delete_term posteriores se combinan en una sola mezcla con el
+          resultado, y un add_term seguido de delete_term del mismo grado se cancela;
+        - de varios ordenamientos solo se aplica el último.
+        El controlador guarda el resultado final en el historial una sola vez.
+
+        Returns:
+            int: Número de operaciones que había en la cola.
+        """
+        with self._queue_lock:
+            operations = []
+            while not self.operations_queue.is_empty():
+                operations.append(self.operations_queue.dequeue())
+            self._dequeued += len(operations)
+        if not operations:
+            return 0
+        replace, patch, ascending = _plan_queue(operations)
+        if replace is not None:
+            self.execute_operation(replace)
+        if ascending is None:
+            ascending = is_ascending(self.result) # Sin ordenamientos en la cola se conserva el orden actual.
+        if patch:
+            changes = sorted(patch.items(), key=itemgetter(0), reverse=True)
+            self.result = type(self.result)._from_desc_pairs(_apply_patch(self.result._desc_pairs(), changes))
+        self.result.sort_terms(ascending=ascending)
+        return len(operations)
 
-        if operation_type == "add":
-            self.add()
-        elif operation_type == "subtract":
-            self.subtract()
+    def execute_operation(self, operation):
+        """Ejecuta una operación encolada con los argumentos que se capturaron al encolarla."""
+        operation_type, args, operands = operation
+        if operation_type in ("add", "subtract"):
+            self._use_operands(*operands)
+            if operation_type == "add":
+                self.add()
+            else:
+                self.subtract()
         elif operation_type == "add_term":
             coeff, degree = args
             self.result.add_term(coeff, degree)
@@ -444,5 +2265,3 @@ class PolynomialModel:
             self.result.sort_terms(ascending=True)
         elif operation_type == "sort_desc":
             self.result.sort_terms(ascending=False)
-        
-        return True
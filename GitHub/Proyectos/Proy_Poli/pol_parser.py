@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo contiene el analizador léxico de polinomios en texto.
+Recorre la cadena una sola vez y emite los términos como pares (coeficiente, grado),
+sin construir listas intermedias de subcadenas.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+# Un término completo: signo, coeficiente y parte en x opcionales, con espacios entre ellos.
+# El análisis de cada término empieza exactamente donde terminó el anterior.
+_TERM = re.compile(r"""
+    [ \t\r\n]*
+    (?P<sign>[+-])?
+    [ \t\r\n]*
+    (?P<coeff>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)?
+    [ \t\r\n]*
+    (?:(?P<x>x) [ \t\r\n]* (?:\^ [ \t\r\n]* (?P<degree>\d+))?)?
+    [ \t\r\n]*
+""", re.VERBOSE)
+
+
+class PolynomialSyntaxError(ValueError):
+    """Error de sintaxis en la cadena de un polinomio, con la posición donde se detectó."""
+
+    def __init__(self, message, position):
+        """
+        Args:
+            message (str): Descripción del error.
+            position (int): Índice (desde 0) del carácter donde se detectó.
+        """
+        super().__init__(f"{message} (posición {position + 1})")
+        self.reason = message
+        self.position = position
+
+
+def scan_terms(text, start=0, end=None, first=True):
+    """
+    Recorre una cadena y genera sus términos en el orden en que aparecen.
+    Acepta términos como "3x^2", "-x", "+ 2.5 x", "7" o "1e3x^4"; solo el primero
+    puede omitir el signo. Los términos con coeficiente cero se omiten.
+
+    Args:
+        text (str): La cadena con el polinomio.
+        start (int): Índice donde empieza el análisis.
+        end (int, optional): Índice donde termina el análisis. Defaults to None (final de la cadena).
+        first (bool): Si el primer término analizado puede omitir el signo.
+
+    Yields:
+        tuple[float, int]: Pares (coeficiente, grado).
+
+    Raises:
+        PolynomialSyntaxError: Si la cadena no es un polinomio válido.
+    """
+    end = len(text) if end is None else end
+    pos = start
+    match_term = _TERM.match
+    while pos < end:
+        match = match_term(text, pos, end)
+        sign, coeff, x, degree = match.groups()
+        if coeff is None and x is None:
+            if match.end() >= end:
+                if sign is None:
+                    return # Solo quedaban espacios.
+                raise PolynomialSyntaxError("Término incompleto al final", end)
+            raise _unexpected(text, match.end())
+        if sign is None and not first:
+            raise _unexpected(text, match.start("coeff") if coeff is not None else match.start("x"))
+        first = False
+        pos = match.end()
+        value = float(coeff) if coeff is not None else 1.0
+        if value:
+            yield (-value if sign == "-" else value), (int(degree) if degree is not None else (1 if x else 0))
+
+
+def scan_spans(text, start=0, end=None, first=True):
+    """
+    Como scan_terms, pero genera también dónde termina cada término y no omite los de
+    coeficiente cero. Los términos son contiguos: cada uno empieza donde terminó el anterior.
+
+    Yields:
+        tuple[int, float, int]: Ternas (fin, coeficiente, grado).
+
+    Raises:
+        PolynomialSyntaxError: Si la cadena no es un polinomio válido.
+    """
+    end = len(text) if end is None else end
+    pos = start
+    match_term = _TERM.match
+    while pos < end:
+        match = match_term(text, pos, end)
+        sign, coeff, x, degree = match.groups()
+        if coeff is None and x is None:
+            if match.end() >= end:
+                if sign is None:
+                    return
+                raise PolynomialSyntaxError("Término incompleto al final", end)
+            raise _unexpected(text, match.end())
+        if sign is None and not first:
+            raise _unexpected(text, match.start("coeff") if coeff is not None else match.start("x"))
+        first = False
+        pos = match.end()
+        value = float(coeff) if coeff is not None else 1.0
+        yield pos, (-value if sign == "-" else value), (int(degree) if degree is not None else (1 if x else 0))
+
+
+class IncrementalParser:
+    """
+    Analizador que recuerda el último texto y dónde termina cada uno de sus términos.
+    Al recibir el texto editado compara ambos textos, localiza los términos que tocan
+    la zona cambiada y vuelve a analizar solo esos; el resto de los términos se reutiliza.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.terms = []  # Pares (coeficiente, grado) en el orden del texto, incluidos los nulos
+        # Términos quitados y añadidos en la última actualización (listas de pares), o None
+        # si se analizó el texto completo: con ellos se actualiza un polinomio sin reconstruirlo.
+        self.replaced = None
+        self._ends = []  # Posición donde termina cada término
+
+    def update(self, text) -> bool:
+        """
+        Analiza el texto editado reutilizando los términos que no cambiaron.
+        Si el análisis falla, el estado anterior se conserva.
+
+        Args:
+            text (str): El texto completo tras la edición.
+
+        Returns:
+            bool: True si el texto cambió.
+
+        Raises:
+            PolynomialSyntaxError: Si el texto no es un polinomio válido.
+        """
+        old = self.text
+        if text == old:
+            return False
+        ends = self._ends
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        # Términos afectados: del que termina en la zona cambiada (o justo antes) al que empieza en ella.
+        first = bisect_left(ends, prefix)
+        last = min(bisect_right(ends, len(old) - suffix), len(ends) - 1)
+        delta = len(text) - len(old)
+        start = ends[first - 1] if first else 0
+        stop = ends[last] + delta if ends else len(text)
+        if not ends or (stop < len(text) and text[stop - 1] in "eE"):
+            # Sin términos previos, o un exponente que podría continuar en el texto sin cambios: análisis completo.
+            self._reset(text)
+            return True
+        try:
+            spans = list(scan_spans(text, start, stop, first == 0))
+        except PolynomialSyntaxError:
+            # Los bordes de los términos se movieron (o el texto no es válido): análisis completo,
+            # que informa el error con su posición real.
+            self._reset(text)
+            return True
+        ends[first:last + 1] = [span[0] for span in spans]
+        moved = first + len(spans)
+        ends[moved:] = [position + delta for position in ends[moved:]]
+        added = [(coeff, degree) for _, coeff, degree in spans]
+        self.replaced = (self.terms[first:last + 1], added)
+        self.terms[first:last + 1] = added
+        self.text = text
+        return True
+
+    def _reset(self, text):
+        """Analiza el texto completo y reemplaza el estado (solo si el análisis tiene éxito)."""
+        spans = list(scan_spans(text))
+        self._ends = [span[0] for span in spans]
+        self.terms = [(coeff, degree) for _, coeff, degree in spans]
+        self.replaced = None
+        self.text = text
+
+
+def _common_prefix(a, b):
+    """Longitud del prefijo común, por búsqueda binaria con comparaciones de cadenas (en C)."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a, b, limit):
+    """Longitud del sufijo común, sin superar limit caracteres."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _unexpected(text, position):
+    """Construye el error para un carácter inesperado en la posición dada."""
+    char = text[position]
+    if char == "^":
+        return PolynomialSyntaxError("Falta el exponente entero después de '^'", position)
+    if char in "+-":
+        return PolynomialSyntaxError("Falta un coeficiente o 'x' después del signo", position)
+    if char.isdigit() or char in ".x":
+        return PolynomialSyntaxError("Se esperaba '+' o '-' antes del término", position)
+    return PolynomialSyntaxError(f"Carácter inesperado '{char}'", position)
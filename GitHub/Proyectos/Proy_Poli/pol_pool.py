@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo reparte las operaciones grandes entre varios procesos.
+Los hilos no aceleran la aritmética en Python puro por el GIL; un ProcessPoolExecutor sí.
+Los operandos viajan a los procesos como arreglos empaquetados (array('q') de grados y
+array('d') de coeficientes, en orden ascendente), que se serializan como bloques de
+bytes, y los resultados vuelven de la misma forma.
+
+Solo se reparte la multiplicación dispersa: el operando más largo se corta en trozos, cada
+proceso multiplica su trozo por el otro operando y los productos parciales se suman
+mezclándolos. La suma y la resta no se reparten: son mezclas lineales, y el proceso principal
+tendría que congelar, empaquetar y reconstruir O(n) términos igualmente (con 400 000 términos,
+2,5 s repartida frente a 1,6 s en el proceso actual).
+
+Los procesos no se crean con fork: el conjunto se crea desde el hilo de la cola o de un
+manejador de Flet mientras otros hilos sostienen candados, y un hijo copiado con fork
+heredaría esos candados tomados. Se usa forkserver donde existe y spawn en el resto.
+"""
+
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from data_structures import TermArray
+
+# Productos de términos (n·m) a partir de los cuales una multiplicación dispersa se reparte.
+OFFLOAD_PRODUCTS = 20_000_000
+# Forma de crear los procesos (ver la descripción del módulo).
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class OffloadPool:
+    """
+    Conjunto de procesos, creado la primera vez que se necesita, para las operaciones grandes.
+    Las operaciones pequeñas se calculan en el proceso actual: repartirlas cuesta más que hacerlas.
+    """
+
+    def __init__(self, workers=None, offload_products=OFFLOAD_PRODUCTS):
+        """
+        Args:
+            workers (int, optional): Número de procesos. Defaults to None (uno por núcleo).
+            offload_products (int): Umbral de n·m para repartir multiplicaciones dispersas.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.offload_products = offload_products
+        self._executor = None
+
+    def should_offload(self, operation, len1, len2, dense=False) -> bool:
+        """
+        Indica si conviene repartir una operación entre procesos.
+
+        Args:
+            operation (str): "multiply"; cualquier otra no se reparte.
+            len1 (int): Términos del primer operando.
+            len2 (int): Términos del segundo operando.
+            dense (bool): Si la multiplicación se haría con la convolución densa (ya vectorizada).
+        """
+        if self.workers < 2 or operation != "multiply":
+            return False
+        return not dense and len1 * len2 >= self.offload_products
+
+    def run(self, operation, columns1, columns2):
+        """
+        Calcula una operación repartiéndola entre los procesos.
+
+        Args:
+            operation (str): "multiply" (la única que se reparte).
+            columns1 (tuple): (grados, coeficientes) del primer operando, ascendentes.
+            columns2 (tuple): (grados, coeficientes) del segundo operando, ascendentes.
+
+        Returns:
+            tuple: (grados, coeficientes) del resultado como arreglos ascendentes.
+        """
+        if operation != "multiply":
+            raise ValueError(f"Operación que no se reparte: {operation}")
+        executor = self._get_executor()
+        # Se corta el operando más largo para que cada proceso haga una parte similar.
+        if len(columns1[0]) < len(columns2[0]):
+            columns1, columns2 = columns2, columns1
+        chunks = _split_even(columns1, self.workers)
+        futures = [executor.submit(_multiply_chunk, chunk, columns2) for chunk in chunks]
+        return _sum_columns([future.result() for future in futures])
+
+    def shutdown(self):
+        """Termina los procesos, si se llegaron a crear."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self):
+        """Crea el ProcessPoolExecutor la primera vez que se usa."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(START_METHOD))
+        return self._executor
+
+
+# --- Funciones que se ejecutan en los procesos (deben estar a nivel de módulo) ---
+
+def _multiply_chunk(columns1, columns2):
+    """Multiplica un trozo del primer operando por el segundo operando completo."""
+    product = _to_array_poly(columns1) * _to_array_poly(columns2)
+    return product.terms.degrees, product.terms.coefficients
+
+def _to_array_poly(columns):
+    """Envuelve columnas ascendentes en un ArrayPolynomial sin copiarlas."""
+    # Importación diferida: pol_model importa este módulo.
+    from pol_model import ArrayPolynomial
+    poly = ArrayPolynomial()
+    poly.terms = TermArray(*columns)
+    return poly
+
+
+# --- Reparto y combinación en el proceso principal ---
+
+def _split_even(columns, parts):
+    """Corta unas columnas en hasta parts trozos de tamaño similar."""
+    degrees, coefficients = columns
+    size = -(-len(degrees) // parts) or 1
+    return [(degrees[start:start + size], coefficients[start:start + size])
+            for start in range(0, len(degrees), size)]
+
+def _sum_columns(partials):
+    """Suma productos parciales mezclándolos por parejas, en log2(k) rondas."""
+    polys = [_to_array_poly(columns) for columns in partials]
+    if not polys:
+        return array('q'), array('d')
+    while len(polys) > 1:
+        merged = [polys[i]._merge(polys[i + 1], 1.0) for i in range(0, len(polys) - 1, 2)]
+        if len(polys) % 2:
+            merged.append(polys[-1])
+        polys = merged
+    return polys[0].terms.degrees, polys[0].terms.coefficients
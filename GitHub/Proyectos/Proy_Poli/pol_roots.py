@@ -0,0 +1,819 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo calcula las raíces de un polinomio.
+
+- Raíces complejas: hasta EIGEN_MAX_DEGREE, como valores propios de la matriz compañera
+  (numpy.roots, O(n³)); por encima, con la iteración simultánea de Aberth, que refina
+  todas las aproximaciones a la vez en O(n²) por iteración. Las aproximaciones iniciales
+  se reparten en círculos cuyos radios salen del polígono de Newton de los coeficientes.
+- Raíces reales: se cuentan y se aíslan en intervalos en aritmética entera exacta (cada
+  coeficiente float es un racional diádico exacto), así que el número de raíces no depende
+  del redondeo. Se usa la bisección de Descartes, que solo necesita desplazamientos de
+  Taylor, sobre la parte libre de cuadrados del polinomio (con raíces múltiples no termina).
+  Por encima de DESCARTES_MAX_DEGREE (con NumPy) se parte de las aproximaciones de Aberth:
+  si sus discos de inclusión son disjuntos, cada uno contiene una sola raíz, y las reales
+  se confirman con el signo exacto en los extremos de cada intervalo.
+- MCD: con los mismos coeficientes enteros exactos, por el método modular: el MCD módulo
+  varios primos (vectorizado con NumPy) se combina con el teorema chino del resto hasta
+  que el candidato se estabiliza y divide a ambos polinomios.
+
+Los resultados se guardan en una caché LRU por polinomio, con el FrozenPolynomial como clave:
+pedir dos veces las raíces del mismo valor no las vuelve a calcular.
+"""
+
+import cmath
+import math
+import sys
+from collections import namedtuple
+from fractions import Fraction
+from itertools import accumulate
+
+from data_structures import LRUCache
+
+try:
+    import numpy as np
+except ImportError: # NumPy es opcional: sin él, Aberth se ejecuta en Python puro.
+    np = None
+
+# Grado hasta el que las raíces complejas se calculan con la matriz compañera (ver pol_benchmark.py).
+EIGEN_MAX_DEGREE = 64
+# Grado máximo admitido: Aberth cuesta O(n²) por iteración y la matriz compañera O(n³).
+ROOTS_MAX_DEGREE = 20_000
+# Iteraciones máximas de Aberth; las raíces múltiples convergen linealmente y pueden agotarlas.
+ABERTH_MAX_ITERATIONS = 100
+# Una aproximación se da por buena cuando |p(z)| no supera el error de redondeo de evaluar
+# p en z con Horner, (2n + 1)·ε·Σ|a_k|·|z|^k: seguir iterando ya no la mejoraría.
+ABERTH_BACKWARD_ERROR = sys.float_info.epsilon
+# Desfase angular de las aproximaciones iniciales, para no empezar sobre ejes de simetría.
+ABERTH_ANGLE_OFFSET = 0.7
+# Coeficientes por bloque al evaluar p y p' en todas las aproximaciones (ver _evaluate_blocks).
+HORNER_BLOCK = 64
+# Filas de la matriz de diferencias que se procesan juntas en cada iteración de Aberth.
+REPULSION_BLOCK = 64
+# Grado hasta el que las raíces reales se aíslan con la bisección de Descartes: su costo crece
+# muy deprisa con el grado (0,65 s con grado 500 y 53 s con grado 2000, ver benchmark_roots).
+DESCARTES_MAX_DEGREE = 512
+# Factor de seguridad de los radios de inclusión frente al redondeo al calcularlos.
+INCLUSION_SAFETY = 2.0
+# Primo (de Mersenne) con el que se comprueba que un polinomio no tiene raíces múltiples.
+SQUAREFREE_PRIME = 2**61 - 1
+# Cota (exclusiva) de los primos del MCD modular: con primos de 31 bits, los productos de dos
+# restos caben en int64 y la división módulo p se vectoriza con NumPy.
+GCD_PRIME_LIMIT = 2**31
+# Primos adicionales con los que se comprueba que el candidato a MCD divide a ambos polinomios.
+GCD_CHECK_PRIMES = 2
+# Presupuesto (en bytes) de la caché de raíces.
+ROOTS_CACHE_BYTES = 16 * 2**20
+
+# Datos de las raíces reales de un polinomio:
+#   coefficients: Coeficientes enteros de la parte libre de cuadrados, de mayor a menor grado,
+#                 sin la raíz en 0: con ellos se evalúan los signos.
+#   intervals:    Intervalos aislados (ver isolate_real_roots).
+_RealRoots = namedtuple("_RealRoots", "coefficients intervals")
+
+_cache = LRUCache(ROOTS_CACHE_BYTES) # Segura entre hilos: las raíces se piden desde la UI y el hilo de trabajo.
+
+
+def complex_roots(poly, method="auto"):
+    """
+    Calcula todas las raíces complejas del polinomio, repetidas según su multiplicidad.
+
+    Args:
+        poly (Polynomial | FrozenPolynomial): El polinomio.
+        method (str): "eigen" (matriz compañera), "aberth" o "auto" (según EIGEN_MAX_DEGREE).
+
+    Returns:
+        numpy.ndarray | list: Las raíces ordenadas por parte real y luego imaginaria (un arreglo
+        de solo lectura, o una lista sin NumPy).
+
+    Raises:
+        ValueError: Si el polinomio es cero, tiene grados negativos o coeficientes no finitos,
+            o supera ROOTS_MAX_DEGREE.
+    """
+    if method not in ("auto", "eigen", "aberth"):
+        raise ValueError(f"Método desconocido: {method}")
+    frozen = _frozen(poly)
+    _check_polynomial(frozen)
+    key = ("roots", method, frozen)
+    roots = _cache.get(key)
+    if roots is None:
+        roots = _complex_roots(frozen, method)
+        if np is not None:
+            roots.flags.writeable = False # Se comparte entre quien lo pide y la caché.
+            size = roots.nbytes
+        else:
+            size = 32 * len(roots)
+        _cache.put(key, roots, size + _frozen_bytes(frozen))
+    return roots if np is not None else list(roots)
+
+def count_real_roots(poly, a=None, b=None) -> int:
+    """
+    Cuenta las raíces reales distintas en el intervalo (a, b]. Se decide con los intervalos
+    aislados: si a o b cae dentro de uno, el signo del polinomio en ese punto y en el
+    extremo del intervalo dice a qué lado está la raíz.
+
+    Args:
+        poly (Polynomial | FrozenPolynomial): El polinomio.
+        a (float | Fraction, optional): Extremo inferior. Defaults to None (-∞).
+        b (float | Fraction, optional): Extremo superior. Defaults to None (+∞).
+
+    Returns:
+        int: Número de raíces reales distintas en (a, b].
+
+    Raises:
+        ValueError: Si el polinomio es cero, tiene grados negativos o coeficientes no
+            finitos, o si a > b.
+            Por encima del grado DESCARTES_MAX_DEGREE, también sin NumPy o si hay raíces
+            múltiples o tan próximas que sus discos de inclusión se solapan.
+    """
+    lower = None if a is None else Fraction(a)
+    upper = None if b is None else Fraction(b)
+    if lower is not None and upper is not None and lower > upper:
+        raise ValueError("El extremo inferior es mayor que el superior.")
+    data = _real_roots_data(poly)
+    return sum(1 for interval in data.intervals
+               if (lower is None or _exceeds(data.coefficients, interval, lower))
+               and not (upper is not None and _exceeds(data.coefficients, interval, upper)))
+
+def isolate_real_roots(poly) -> list[tuple[Fraction, Fraction]]:
+    """
+    Aísla las raíces reales distintas en intervalos disjuntos con extremos racionales.
+    Hasta el grado DESCARTES_MAX_DEGREE, las positivas y las negativas se aíslan por separado
+    con la bisección de Descartes sobre la parte libre de cuadrados del polinomio; por encima,
+    con los discos de inclusión de las aproximaciones de Aberth (requiere NumPy).
+
+    Args:
+        poly (Polynomial | FrozenPolynomial): El polinomio.
+
+    Returns:
+        list: Pares (inferior, superior) de Fraction, ordenados. Cada intervalo abierto
+        contiene exactamente una raíz y sus extremos no lo son; una raíz que cae justo en un
+        punto de corte se devuelve como el intervalo degenerado (r, r).
+
+    Raises:
+        ValueError: Si el polinomio es cero o tiene grados negativos o coeficientes no finitos.
+            Por encima del grado DESCARTES_MAX_DEGREE, también sin NumPy o si hay raíces
+            múltiples o tan próximas que sus discos de inclusión se solapan.
+    """
+    return list(_real_roots_data(poly).intervals)
+
+def real_roots(poly, tolerance=1e-12) -> list[float]:
+    """
+    Calcula las raíces reales distintas, refinando cada intervalo aislado por bisección
+    hasta que mide menos de tolerance.
+
+    Args:
+        poly (Polynomial | FrozenPolynomial): El polinomio.
+        tolerance (float): Ancho máximo del intervalo de cada raíz. Defaults to 1e-12.
+
+    Returns:
+        list[float]: Las raíces reales distintas, de menor a mayor.
+
+    Raises:
+        ValueError: Si tolerance no es positiva o por lo mismo que isolate_real_roots.
+    """
+    if tolerance <= 0:
+        raise ValueError("La tolerancia debe ser positiva.")
+    data = _real_roots_data(poly)
+    tolerance = Fraction(tolerance)
+    return [float(_refine(data, lower, upper, tolerance)) for lower, upper in data.intervals]
+
+def gcd_coefficients(poly1, poly2) -> list[int]:
+    """
+    Calcula el MCD exacto de dos polinomios no nulos, tomando cada coeficiente float como el
+    racional que representa exactamente (no hay tolerancia que elegir ni ceros que adivinar).
+    Para cada primo p que no divide a γ = MCD de los coeficientes principales, el MCD módulo p
+    (escalado para tener coeficiente principal γ) tiene grado mayor o igual que el verdadero;
+    los de menor grado se combinan con el teorema chino del resto y se levantan a enteros
+    simétricos. Cuando dos levantamientos seguidos coinciden, el candidato se acepta si divide a
+    ambos polinomios módulo GCD_CHECK_PRIMES primos más; si no, se sigue con otros primos.
+
+    Args:
+        poly1 (Polynomial | FrozenPolynomial): El primer polinomio.
+        poly2 (Polynomial | FrozenPolynomial): El segundo polinomio.
+
+    Returns:
+        list[int]: Coeficientes primitivos del MCD, de mayor a menor grado, con el principal positivo.
+
+    Raises:
+        ValueError: Si alguno de los polinomios es cero o tiene grados negativos o
+            coeficientes no finitos.
+    """
+    a, b = (_integer_coefficients(_checked(_frozen(poly))) for poly in (poly1, poly2))
+    gamma = math.gcd(a[0], b[0])
+    primes = _gcd_primes()
+    degree = min(len(a), len(b)) - 1
+    combined, modulus, previous = None, 1, None
+    for prime in primes:
+        if gamma % prime == 0:
+            continue
+        residues = _gcd_mod(a, b, prime)
+        if len(residues) - 1 > degree:
+            continue # Primo desafortunado: el MCD módulo p tiene grado de más.
+        if len(residues) == 1:
+            return [1]
+        if len(residues) - 1 < degree or combined is None:
+            degree, combined, modulus, previous = len(residues) - 1, [0] * len(residues), 1, None
+        scale = gamma % prime
+        inverse = pow(modulus, -1, prime)
+        combined = [c + modulus * ((scale * r - c) * inverse % prime) for c, r in zip(combined, residues)]
+        modulus *= prime
+        half = modulus // 2
+        candidate = _primitive([c - modulus if c > half else c for c in combined])
+        if candidate[0] < 0:
+            candidate = [-c for c in candidate]
+        if candidate == previous and _divides_mod(candidate, (a, b), primes):
+            return candidate
+        previous = candidate
+
+def _gcd_primes():
+    """Genera los primos menores que GCD_PRIME_LIMIT, de mayor a menor."""
+    candidate = GCD_PRIME_LIMIT - 1
+    while candidate > 2:
+        if _is_prime(candidate):
+            yield candidate
+        candidate -= 2
+
+def _is_prime(n):
+    """Miller–Rabin determinista para n < 4 759 123 141 (bases 2, 7 y 61)."""
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for base in (2, 7, 61):
+        if base % n == 0:
+            continue
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _divides_mod(candidate, polys, primes):
+    """Comprueba que candidate divide a cada polinomio módulo los siguientes GCD_CHECK_PRIMES primos."""
+    checked = 0
+    for prime in primes:
+        if candidate[0] % prime == 0:
+            continue
+        divisor = _monic_mod(_reduce(candidate, prime), prime)
+        if any(len(_remainder_mod(_reduce(poly, prime), divisor, prime)) for poly in polys):
+            return False
+        checked += 1
+        if checked == GCD_CHECK_PRIMES:
+            return True
+
+def _gcd_mod(a, b, prime):
+    """MCD mónico de dos polinomios enteros descendentes módulo un primo (lista de enteros)."""
+    a, b = _strip(_reduce(a, prime)), _strip(_reduce(b, prime))
+    if len(a) < len(b):
+        a, b = b, a
+    while len(b):
+        b = _monic_mod(b, prime)
+        a, b = b, _remainder_mod(a, b, prime)
+    return [int(c) for c in _monic_mod(a, prime)]
+
+def _reduce(descending, prime):
+    """Reduce los coeficientes módulo un primo; con NumPy (y primos de 31 bits), como arreglo int64."""
+    residues = [c % prime for c in descending]
+    if np is not None and prime < GCD_PRIME_LIMIT:
+        return np.array(residues, dtype=np.int64)
+    return residues
+
+def _monic_mod(descending, prime):
+    """Divide módulo un primo entre el coeficiente principal (no nulo)."""
+    inverse = pow(int(descending[0]), -1, prime)
+    if isinstance(descending, list):
+        return [c * inverse % prime for c in descending]
+    return descending * inverse % prime
+
+def _remainder_mod(dividend, divisor, prime):
+    """Resto de dividir módulo un primo entre un divisor mónico, sin ceros al principio."""
+    remainder = dividend.copy()
+    width = len(divisor)
+    for shift in range(len(dividend) - width + 1):
+        factor = int(remainder[shift])
+        if factor:
+            if isinstance(remainder, list):
+                for k, c in enumerate(divisor, shift):
+                    remainder[k] = (remainder[k] - factor * c) % prime
+            else:
+                remainder[shift:shift + width] = (remainder[shift:shift + width] - factor * divisor) % prime
+    return _strip(remainder[max(len(dividend) - width + 1, 0):])
+
+def cache_stats() -> dict:
+    """Devuelve los contadores de la caché de raíces."""
+    return _cache.stats()
+
+
+# --- Raíces complejas ---
+
+def _complex_roots(frozen, method):
+    """Calcula las raíces de un valor congelado: separa las nulas y resuelve el resto."""
+    zeros = frozen.degrees[-1] # x^k divide al polinomio: 0 es raíz de multiplicidad k.
+    degree = frozen.degrees[0] - zeros
+    # Coeficientes densos de p(x) / x^k, de menor a mayor grado.
+    ascending = [0.0] * (degree + 1)
+    for exponent, coefficient in zip(frozen.degrees, frozen.coefficients):
+        ascending[exponent - zeros] = coefficient
+    if method == "auto":
+        method = "eigen" if degree <= EIGEN_MAX_DEGREE else "aberth"
+    if np is None:
+        roots = [0j] * zeros + (_aberth_python(ascending) if degree else [])
+        return sorted(roots, key=lambda z: (z.real, z.imag))
+    ascending = np.asarray(ascending, dtype=float)
+    if not degree:
+        roots = np.empty(0, dtype=complex)
+    elif method == "eigen":
+        roots = np.roots(ascending[::-1]).astype(complex)
+    else:
+        roots = _aberth(ascending)
+    return np.sort(np.concatenate((np.zeros(zeros, dtype=complex), roots)))
+
+def _initial_approximations(ascending):
+    """
+    Reparte n aproximaciones iniciales en círculos (método de Bini): cada arista de la
+    envolvente convexa superior de los puntos (k, log|a_k|) de i a j aporta j - i puntos
+    en un círculo de radio (|a_i| / |a_j|)^(1/(j - i)), que aproxima el módulo de otras
+    tantas raíces.
+    """
+    n = len(ascending) - 1
+    hull = []
+    for k, coefficient in enumerate(ascending):
+        if coefficient == 0:
+            continue
+        point = (k, math.log(abs(coefficient)))
+        # Se quita el último punto mientras quede por debajo (o sobre) la recta al nuevo.
+        while len(hull) >= 2 and ((hull[-1][0] - hull[-2][0]) * (point[1] - hull[-2][1])
+                                  - (hull[-1][1] - hull[-2][1]) * (point[0] - hull[-2][0])) >= 0:
+            hull.pop()
+        hull.append(point)
+    approximations = []
+    for (i, log_i), (j, log_j) in zip(hull, hull[1:]):
+        count = j - i
+        radius = math.exp((log_i - log_j) / count)
+        start = 2 * math.pi * i / n + ABERTH_ANGLE_OFFSET
+        approximations.extend(cmath.rect(radius, start + 2 * math.pi * step / count) for step in range(count))
+    return approximations
+
+def _aberth(ascending):
+    """
+    Iteración de Aberth vectorizada. En cada paso, para cada aproximación z_i sin converger:
+        N_i = p(z_i) / p'(z_i),   z_i ← z_i − N_i / (1 − N_i · Σ_{j≠i} 1 / (z_i − z_j)).
+    La suma con las demás aproximaciones se calcula como una matriz (activas × todas), y las
+    aproximaciones que ya cumplen el criterio de error hacia atrás dejan de actualizarse.
+    """
+    z = np.array(_initial_approximations(ascending), dtype=complex)
+    active = np.arange(len(z))
+    for _ in range(ABERTH_MAX_ITERATIONS):
+        ratio, converged = _newton_ratios(ascending, z[active])
+        active, ratio = active[~converged], ratio[~converged]
+        if not active.size:
+            break
+        current = z[active]
+        z[active] = current - ratio / (1.0 - ratio * _repulsion(current, active, z))
+    return z
+
+def _repulsion(current, active, z):
+    """
+    Calcula Σ_{j≠i} 1 / (z_i − z_j) para cada aproximación activa. La matriz de diferencias
+    se recorre por bloques de REPULSION_BLOCK filas reutilizando un mismo búfer, que cabe en
+    caché, en lugar de crear una matriz activas × todas de una vez.
+    """
+    repulsion = np.empty(len(current), dtype=complex)
+    buffer = np.empty((min(REPULSION_BLOCK, len(current)), len(z)), dtype=complex)
+    for start in range(0, len(current), REPULSION_BLOCK):
+        rows = current[start:start + REPULSION_BLOCK]
+        differences = buffer[:len(rows)]
+        np.subtract(rows[:, None], z[None, :], out=differences)
+        differences[np.arange(len(rows)), active[start:start + REPULSION_BLOCK]] = np.inf # Sin el término j = i.
+        np.reciprocal(differences, out=differences)
+        differences.sum(axis=1, out=repulsion[start:start + len(rows)])
+    return repulsion
+
+def _newton_ratios(ascending, z):
+    """
+    Devuelve p(z)/p'(z) en cada punto y si el punto ya es una raíz dentro del error de redondeo.
+    Los puntos con |z| > 1 se evalúan sobre el polinomio recíproco R(w) = w^n·p(1/w) con
+    w = 1/z, de modo que ninguna potencia supera 1 y no hay desbordamiento a grados altos:
+    p(z)/p'(z) = z / (n − w·R'(w)/R(w)).
+    """
+    n = len(ascending) - 1
+    ratios = np.empty(len(z), dtype=complex)
+    converged = np.empty(len(z), dtype=bool)
+    outer = np.abs(z) > 1
+    for mask, coefficients in ((~outer, ascending), (outer, ascending[::-1])):
+        if not mask.any():
+            continue
+        points = 1.0 / z[mask] if mask is outer else z[mask]
+        value, derivative, bound = _evaluate_blocks(coefficients, points)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if mask is outer:
+                ratios[mask] = z[mask] / (n - points * derivative / value)
+            else:
+                ratios[mask] = value / derivative
+        # Evaluar p acumula como mucho unos 2n errores de redondeo de tamaño ε·Σ|a_k|·|x|^k.
+        converged[mask] = np.abs(value) <= ABERTH_BACKWARD_ERROR * (2 * n + 1) * bound
+    return ratios, converged
+
+def _evaluate_blocks(ascending, points):
+    """
+    Evalúa un polinomio, su derivada y la cota Σ|a_k|·|x|^k del error de redondeo en
+    puntos con |x| ≤ 1, por bloques de HORNER_BLOCK coeficientes: p(x) = Σ_j B_j(x)·x^(jL).
+    Todos los B_j (de p, de p' y de |p|) se evalúan en todos los puntos con un producto de
+    la tabla de potencias x^0..x^(L-1) por la matriz de bloques, y se combinan con Horner
+    en x^L, así que el bucle en Python tiene n / L pasos en lugar de n.
+    """
+    n = len(ascending) - 1
+    size = HORNER_BLOCK
+    count = -(-(n + 1) // size)
+    table = np.zeros((3, count * size))
+    table[0, :n + 1] = ascending
+    table[1, :n] = ascending[1:] * np.arange(1, n + 1)
+    table[2, :n + 1] = np.abs(ascending)
+    blocks = table.reshape(3 * count, size).T # Columna j: coeficientes ascendentes de un bloque.
+    powers = np.empty((len(points), size), dtype=complex)
+    powers[:, 0] = 1.0
+    powers[:, 1:] = points[:, None]
+    np.cumprod(powers, axis=1, out=powers)
+    # Dos productos reales en lugar de uno complejo: los coeficientes son reales.
+    partial = powers.real @ blocks[:, :2 * count] + 1j * (powers.imag @ blocks[:, :2 * count])
+    bound_partial = np.abs(powers) @ blocks[:, 2 * count:]
+    step = powers[:, -1] * points
+    abs_step = np.abs(step)
+    value = partial[:, count - 1].copy()
+    derivative = partial[:, 2 * count - 1].copy()
+    bound = bound_partial[:, count - 1].copy()
+    for j in range(count - 2, -1, -1):
+        value *= step
+        value += partial[:, j]
+        derivative *= step
+        derivative += partial[:, count + j]
+        bound *= abs_step
+        bound += bound_partial[:, j]
+    return value, derivative, bound
+
+def _aberth_python(ascending):
+    """Iteración de Aberth en Python puro (sin NumPy), con Horner sobre p o sobre su recíproco."""
+    n = len(ascending) - 1
+    descending = ascending[::-1]
+    z = _initial_approximations(ascending)
+    active = set(range(n))
+    for _ in range(ABERTH_MAX_ITERATIONS):
+        for i in list(active):
+            point = z[i]
+            outer = abs(point) > 1
+            x = 1 / point if outer else point
+            value = derivative = 0j
+            bound = 0.0
+            for coefficient in (ascending if outer else descending):
+                derivative = derivative * x + value
+                value = value * x + coefficient
+                bound = bound * abs(x) + abs(coefficient)
+            if abs(value) <= ABERTH_BACKWARD_ERROR * (2 * n + 1) * bound:
+                active.discard(i)
+                continue
+            if derivative == 0:
+                continue
+            ratio = point / (n - x * derivative / value) if outer else value / derivative
+            repulsion = sum(1 / (point - other) for j, other in enumerate(z) if j != i and other != point)
+            z[i] = point - ratio / (1 - ratio * repulsion)
+        if not active:
+            break
+    return z
+
+
+# --- Raíces reales (aritmética entera exacta) ---
+
+def _real_roots_data(poly):
+    """
+    Devuelve (de la caché o calculándolos) los datos de las raíces reales del polinomio:
+    los coeficientes enteros con los que se evalúan los signos y los intervalos aislados.
+    """
+    frozen = _frozen(poly)
+    _check_polynomial(frozen)
+    key = ("real", frozen)
+    data = _cache.get(key)
+    if data is None:
+        coefficients = _integer_coefficients(frozen)
+        zeros = frozen.degrees[-1] # x^k divide al polinomio: 0 es raíz (múltiple si k > 1).
+        core = coefficients[:len(coefficients) - zeros]
+        if len(core) - 1 <= DESCARTES_MAX_DEGREE:
+            if not _is_squarefree(core):
+                core = _squarefree_part(core)
+            intervals = _descartes_isolate(core)
+        else:
+            intervals = _inclusion_isolate(frozen, core)
+        if zeros:
+            intervals = sorted(intervals + [(Fraction(0), Fraction(0))])
+        data = _RealRoots(core, tuple(intervals))
+        _cache.put(key, data, _integers_bytes(core) + 200 * len(intervals) + _frozen_bytes(frozen))
+    return data
+
+def _inclusion_isolate(frozen, core):
+    """
+    Aísla las raíces no nulas de un polinomio de grado alto a partir de las aproximaciones de
+    Aberth z_i. Con W_i = p(z_i) / (a_n·∏_{j≠i}(z_i − z_j)), cada componente conexa de la unión
+    de los discos |z − z_i| ≤ n·|W_i| contiene tantas raíces como discos (Smith); si todos los
+    discos son disjuntos, cada uno tiene exactamente una raíz simple. Si el signo exacto de p
+    cambia entre los extremos de la cuerda real de un disco, su raíz es real (una raíz no real
+    arrastraría a su conjugada al mismo disco); si no, no lo es.
+
+    Raises:
+        ValueError: Si no se puede (sin NumPy, o con raíces múltiples o muy próximas).
+    """
+    degree = len(core) - 1
+    if np is None:
+        raise ValueError(f"Sin NumPy, las raíces reales se aíslan solo hasta el grado {DESCARTES_MAX_DEGREE}.")
+    zeros = frozen.degrees[-1]
+    ascending = np.zeros(degree + 1)
+    for exponent, coefficient in zip(frozen.degrees, frozen.coefficients):
+        ascending[exponent - zeros] = coefficient
+    z = _aberth(ascending)
+    radii = _inclusion_radii(ascending, z)
+    if not _disjoint(z, radii):
+        raise ValueError("No se pudieron separar las raíces reales (hay raíces múltiples o muy próximas) "
+                         f"y el aislamiento exacto se limita al grado {DESCARTES_MAX_DEGREE}.")
+    intervals = []
+    for center, radius in zip(z, radii):
+        if abs(center.imag) > radius:
+            continue
+        half = math.sqrt(radius * radius - center.imag * center.imag)
+        lower, upper = Fraction(center.real - half), Fraction(center.real + half)
+        lower_sign, upper_sign = _sign_at(core, lower), _sign_at(core, upper)
+        if not lower_sign or not upper_sign:
+            root = lower if not lower_sign else upper
+            intervals.append((root, root))
+        elif lower_sign != upper_sign:
+            intervals.append((lower, upper))
+    return sorted(intervals)
+
+def _inclusion_radii(ascending, z):
+    """
+    Radios INCLUSION_SAFETY·n·|W_i| de los discos de inclusión (ver _inclusion_isolate),
+    calculados con logaritmos para que ni p(z_i) ni el producto de diferencias desborden.
+    |p(z_i)| se aumenta con la cota de su error de redondeo, como en _newton_ratios.
+    """
+    n = len(ascending) - 1
+    log_value = np.empty(len(z))
+    outer = np.abs(z) > 1
+    with np.errstate(divide="ignore"):
+        for mask, coefficients in ((~outer, ascending), (outer, ascending[::-1])):
+            if not mask.any():
+                continue
+            points = 1.0 / z[mask] if mask is outer else z[mask]
+            value, _, bound = _evaluate_blocks(coefficients, points)
+            log_value[mask] = np.log(np.abs(value) + ABERTH_BACKWARD_ERROR * (2 * n + 1) * bound)
+            if mask is outer:
+                log_value[mask] += n * np.log(np.abs(z[mask])) # p(z) = z^n·R(1/z)
+        log_distances = np.empty(len(z))
+        for start in range(0, len(z), REPULSION_BLOCK):
+            rows = z[start:start + REPULSION_BLOCK]
+            differences = np.abs(rows[:, None] - z[None, :])
+            differences[np.arange(len(rows)), np.arange(start, start + len(rows))] = 1.0 # Sin el término j = i.
+            log_distances[start:start + len(rows)] = np.log(differences).sum(axis=1)
+    log_radii = math.log(INCLUSION_SAFETY * n) + log_value - math.log(abs(ascending[-1])) - log_distances
+    with np.errstate(over="ignore"):
+        return np.exp(log_radii)
+
+def _disjoint(z, radii):
+    """Comprueba que los discos |z − z_i| ≤ r_i son disjuntos dos a dos (y de radio finito)."""
+    if not np.isfinite(radii).all():
+        return False
+    for start in range(0, len(z), REPULSION_BLOCK):
+        rows = z[start:start + REPULSION_BLOCK]
+        gaps = np.abs(rows[:, None] - z[None, :]) - radii[None, :] - radii[start:start + len(rows), None]
+        gaps[np.arange(len(rows)), np.arange(start, start + len(rows))] = np.inf
+        if not (gaps > 0).all():
+            return False
+    return True
+
+def _integer_coefficients(frozen):
+    """
+    Convierte los coeficientes a enteros (de mayor a menor grado) multiplicando por una
+    potencia de dos común: cada float es m / 2^e exacto, así que las raíces no cambian.
+    """
+    degree = frozen.degrees[0]
+    ratios = [coefficient.as_integer_ratio() for coefficient in frozen.coefficients]
+    scale = max(denominator for _, denominator in ratios)
+    descending = [0] * (degree + 1)
+    for exponent, (numerator, denominator) in zip(frozen.degrees, ratios):
+        descending[degree - exponent] = numerator * (scale // denominator)
+    return _primitive(descending)
+
+def _is_squarefree(descending):
+    """
+    Comprueba que el polinomio no tiene raíces múltiples: si MCD(p, p') es constante módulo
+    un primo que no divide al coeficiente principal, también lo es sobre los racionales.
+    El MCD modular cuesta O(n²) operaciones con enteros pequeños, mientras que los restos
+    del MCD exacto crecen con cada paso. Un resultado False solo significa que no se pudo
+    descartar (el primo puede ser desafortunado); entonces se usa _squarefree_part, que es exacto.
+    """
+    prime = SQUAREFREE_PRIME
+    degree = len(descending) - 1
+    if degree < 2:
+        return True
+    if descending[0] % prime == 0:
+        return False
+    derivative = [c * (degree - k) for k, c in enumerate(descending[:-1])]
+    return len(_gcd_mod(descending, derivative, prime)) == 1
+
+def _squarefree_part(descending):
+    """
+    Devuelve p / MCD(p, p'), que tiene las mismas raíces que p pero todas simples. El MCD se
+    calcula con pseudorrestos enteros reducidos a su parte primitiva, y la división es exacta
+    en los enteros por el lema de Gauss (el MCD es primitivo y divide a p).
+    """
+    degree = len(descending) - 1
+    a, b = descending, _primitive([c * (degree - k) for k, c in enumerate(descending[:-1])])
+    while len(b) > 1:
+        remainder = _pseudo_remainder(a, b)
+        if not remainder:
+            break
+        a, b = b, _primitive(remainder)
+    if len(b) == 1:
+        return descending # El MCD es constante: ya no había raíces múltiples.
+    quotient = []
+    remainder = list(descending)
+    for shift in range(len(descending) - len(b) + 1):
+        factor = remainder[shift] // b[0]
+        quotient.append(factor)
+        if factor:
+            for k, c in enumerate(b, shift):
+                remainder[k] -= factor * c
+    return _primitive(quotient)
+
+def _descartes_isolate(descending):
+    """
+    Aísla las raíces no nulas de un polinomio sin raíces múltiples ni raíz en 0: las
+    positivas son las de p(x) y las negativas, cambiadas de signo, las de p(−x).
+    """
+    ascending = descending[::-1]
+    positive = _positive_intervals(ascending)
+    negative = _positive_intervals([-c if k % 2 else c for k, c in enumerate(ascending)])
+    return [(-upper, -lower) for lower, upper in reversed(negative)] + positive
+
+def _positive_intervals(ascending):
+    """
+    Bisección de Descartes (Vincent–Collins–Akritas) sobre las raíces positivas.
+    Con x = 2^s·t, las raíces en (0, 2^s) pasan a (0, 1). Para cada intervalo, los cambios
+    de signo de los coeficientes de (t + 1)^n·g(1/(t + 1)) acotan las raíces de g en (0, 1):
+    con 0 no hay ninguna y con 1 hay exactamente una; si no, se parte por la mitad con
+    g(t/2) y g((t + 1)/2), que se obtienen con un reescalado y un desplazamiento de Taylor.
+    """
+    if len(ascending) < 2:
+        return []
+    # Cota de Cauchy: toda raíz cumple |r| < 1 + max|a_k / a_n| < 2^s.
+    lead = abs(ascending[-1])
+    shift = (2 + max(abs(c) for c in ascending) // lead).bit_length()
+    g = _primitive([c << (shift * k) for k, c in enumerate(ascending)])
+    # (g, c, d, raíz a la izquierda): g describe el intervalo (c / 2^d, (c + 1) / 2^d) de t, y el
+    # indicador dice si su extremo izquierdo es una raíz ya guardada (un punto medio exacto).
+    stack = [(g, 0, 0, False)]
+    intervals = []
+    while stack:
+        g, numerator, depth, left_root = stack.pop()
+        variations = _count_changes(_taylor_shift(g[::-1]))
+        if not variations:
+            continue
+        # Con una raíz dentro y ninguna en los extremos (g(1) ≠ 0), el intervalo la aísla.
+        if variations == 1 and not left_root and sum(g):
+            intervals.append((Fraction(numerator << shift, 1 << depth),
+                              Fraction((numerator + 1) << shift, 1 << depth)))
+            continue
+        degree = len(g) - 1
+        left = _primitive([c << (degree - k) for k, c in enumerate(g)]) # 2^n·g(t/2)
+        right = _taylor_shift(left)                                      # 2^n·g((t + 1)/2)
+        middle_root = not right[0]
+        if middle_root:
+            # El punto medio es raíz: se guarda exacto y se divide entre t.
+            intervals.append((Fraction((2 * numerator + 1) << shift, 1 << (depth + 1)),) * 2)
+            right = right[1:]
+        stack.append((right, 2 * numerator + 1, depth + 1, middle_root))
+        stack.append((left, 2 * numerator, depth + 1, left_root))
+    return sorted(intervals)
+
+def _taylor_shift(ascending):
+    """
+    Devuelve los coeficientes ascendentes de g(t + 1) con el esquema de Horner repetido:
+    cada pasada reemplaza los coeficientes a_i..a_n por sus sumas desde el final, que
+    itertools.accumulate calcula sin un bucle en Python por coeficiente (O(n²) sumas).
+    """
+    coefficients = list(ascending)
+    for i in range(len(coefficients) - 1):
+        coefficients[i:] = list(accumulate(reversed(coefficients[i:])))[::-1]
+    return coefficients
+
+def _exceeds(descending, interval, point):
+    """
+    Indica si la raíz aislada en interval es mayor que point, para un polinomio sin raíces
+    múltiples: si point cae dentro del intervalo, la raíz está a su derecha cuando el signo
+    cambia entre point y el extremo superior.
+    """
+    lower, upper = interval
+    if point < lower:
+        return True
+    if point >= upper:
+        return False
+    sign = _sign_at(descending, point)
+    return sign != 0 and sign != _sign_at(descending, upper)
+
+def _refine(data, lower, upper, tolerance):
+    """
+    Estrecha por bisección un intervalo aislado hasta que mide menos de tolerance y devuelve
+    su centro. La raíz es simple y los extremos no son raíces: el signo cambia en ella.
+    """
+    if lower == upper:
+        return lower
+    lower_sign = _sign_at(data.coefficients, lower)
+    while upper - lower > tolerance:
+        middle = (lower + upper) / 2
+        sign = _sign_at(data.coefficients, middle)
+        if not sign:
+            return middle
+        if sign == lower_sign:
+            lower = middle
+        else:
+            upper = middle
+    return (lower + upper) / 2
+
+def _pseudo_remainder(dividend, divisor):
+    """Pseudorresto entero lc(b)^(δ+1)·a mod b de dos polinomios descendentes, sin ceros al principio."""
+    remainder = list(dividend)
+    lead = divisor[0]
+    for shift in range(len(dividend) - len(divisor) + 1):
+        factor = remainder[shift]
+        remainder = [lead * c for c in remainder]
+        if factor:
+            for k, c in enumerate(divisor):
+                remainder[shift + k] -= factor * c
+    return _strip(remainder[len(dividend) - len(divisor) + 1:])
+
+def _primitive(coefficients):
+    """Divide los coeficientes por su máximo común divisor positivo (no cambia ningún signo)."""
+    divisor = math.gcd(*coefficients)
+    return [c // divisor for c in coefficients] if divisor > 1 else coefficients
+
+def _strip(descending):
+    """Quita los coeficientes nulos del principio de un polinomio descendente."""
+    start = 0
+    while start < len(descending) and not descending[start]:
+        start += 1
+    return descending[start:]
+
+def _sign_at(descending, point):
+    """Signo (−1, 0 o 1) de un polinomio entero en un racional p/q, sin fracciones: Σ c_k·p^k·q^(n−k)."""
+    numerator, denominator = point.numerator, point.denominator
+    value = descending[0]
+    scale = denominator
+    for coefficient in descending[1:]:
+        value = value * numerator + coefficient * scale
+        scale *= denominator
+    return (value > 0) - (value < 0)
+
+def _count_changes(values):
+    """Cuenta los cambios de signo de una sucesión de números, ignorando los ceros."""
+    changes = 0
+    previous = None
+    for value in values:
+        if value:
+            positive = value > 0
+            if previous is not None and positive != previous:
+                changes += 1
+            previous = positive
+    return changes
+
+
+# --- Utilidades ---
+
+def _frozen(poly):
+    """Devuelve el FrozenPolynomial de un polinomio (o el propio valor si ya lo es)."""
+    return poly.freeze() if hasattr(poly, "freeze") else poly
+
+def _checked(frozen):
+    """Comprueba el polinomio con _check_polynomial y lo devuelve."""
+    _check_polynomial(frozen)
+    return frozen
+
+def _check_polynomial(frozen):
+    """Comprueba que el polinomio admite el cálculo de raíces (y el MCD exacto)."""
+    if not frozen.degrees:
+        raise ValueError("El polinomio cero se anula en todos los puntos.")
+    if frozen.degrees[-1] < 0:
+        raise ValueError("Las raíces requieren grados no negativos.")
+    if frozen.degrees[0] > ROOTS_MAX_DEGREE:
+        raise ValueError(f"El grado supera el máximo admitido ({ROOTS_MAX_DEGREE}).")
+    # inf y nan (por ejemplo, tras desbordar una multiplicación) no tienen raíces ni valor entero.
+    if not all(math.isfinite(coefficient) for coefficient in frozen.coefficients):
+        raise ValueError("Los coeficientes deben ser finitos (alguno desbordó el rango de float).")
+
+def _frozen_bytes(frozen):
+    """Estimación del tamaño del valor congelado que hace de clave."""
+    return 100 + 16 * len(frozen.degrees)
+
+def _integers_bytes(coefficients):
+    """Estimación del tamaño de una lista de enteros grandes."""
+    return 64 + sum(sys.getsizeof(c) + 8 for c in coefficients)
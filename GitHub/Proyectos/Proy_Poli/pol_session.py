@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo guarda y restaura el estado completo de PolynomialModel (operandos,
+resultado, historial y cola de operaciones) en un único archivo binario.
+
+Los términos se guardan como columnas empaquetadas (int64 y float64, little-endian),
+igual que en el formato binario de pol_io. Al restaurar, el archivo se mapea en
+memoria y las entradas del historial apuntan directamente a sus columnas: solo se
+leen cuando se deshace hasta ellas. Las vistas previas se guardan como texto para
+poder mostrar el historial sin reconstruir ningún polinomio; una entrada cuya vista
+previa aún no se había calculado se guarda con el texto vacío y se calcula al mostrarla.
+
+Formato (versión 1):
+    cabecera   "PLYS" | versión (uint16) | backend (texto)
+    operandos  poly1, poly2 y resultado como bloques de términos
+    historial  límites, número de entradas y cada entrada con su vista previa y columnas
+    cola       número de operaciones y cada una como texto JSON
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from pol_history import HistoryEntry, is_ascending
+from pol_model import BACKENDS, PolynomialModel
+
+SESSION_MAGIC = b"PLYS"
+SESSION_VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_LENGTH = struct.Struct("<I")
+_TERMS = struct.Struct("<QB")          # número de términos, orden ascendente
+_HISTORY = struct.Struct("<QQI")       # máximo de entradas, máximo de bytes, número de entradas
+_ENTRY = struct.Struct("<BBQ")         # fotograma clave, orden ascendente, número de términos
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def save_session(model: PolynomialModel, path):
+    """
+    Guarda el estado del modelo en un archivo binario.
+    Se escribe primero en un archivo temporal que luego reemplaza al anterior, de modo que
+    una sesión a medio escribir nunca sustituye a una válida.
+
+    Args:
+        model (PolynomialModel): El modelo a guardar.
+        path (str): Ruta del archivo de sesión.
+    """
+    # Las entradas restauradas pueden seguir leyendo del archivo que se va a reemplazar.
+    model.history.detach()
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_HEADER.pack(SESSION_MAGIC, SESSION_VERSION))
+        _write_text(file, model.backend)
+        for poly in (model.poly1, model.poly2, model.result):
+            pairs = poly._desc_pairs()
+            file.write(_TERMS.pack(len(pairs), is_ascending(poly)))
+            _write_columns(file, array('q', [degree for degree, _ in pairs]),
+                           array('d', [coeff for _, coeff in pairs]))
+        entries = model.history.entries()
+        file.write(_HISTORY.pack(model.history.max_entries, model.history.max_bytes, len(entries)))
+        for entry in entries:
+            file.write(_ENTRY.pack(entry.keyframe, entry.ascending, len(entry.degrees)))
+            _write_text(file, entry.preview or "")
+            _write_columns(file, entry.degrees, entry.coefficients)
+        operations = model.queued_operations()
+        file.write(_LENGTH.pack(len(operations)))
+        for operation_type, args, _ in operations:
+            # Los operandos analizados no se guardan: se vuelven a analizar desde sus cadenas al restaurar.
+            _write_text(file, json.dumps([operation_type, list(args)]))
+    os.replace(temp_path, path)
+
+
+def load_session(path) -> PolynomialModel:
+    """
+    Restaura un modelo guardado con save_session.
+    Los operandos y el resultado se reconstruyen de inmediato; las entradas del historial
+    quedan como vistas sobre el archivo mapeado y se decodifican al deshacer.
+
+    Args:
+        path (str): Ruta del archivo de sesión.
+
+    Returns:
+        PolynomialModel: El modelo restaurado.
+
+    Raises:
+        ValueError: Si el archivo no es una sesión válida.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _HEADER.size:
+            raise ValueError("Archivo de sesión incompleto.")
+        # El mmap sigue abierto mientras el historial tenga vistas sobre él.
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    reader = _Reader(memoryview(mapped))
+    try:
+        magic, version = reader.unpack(_HEADER)
+        if magic != SESSION_MAGIC:
+            raise ValueError("El archivo no es una sesión de la calculadora de polinomios.")
+        if version != SESSION_VERSION:
+            raise ValueError(f"Versión de sesión no soportada: {version}")
+        backend = reader.text()
+        if backend not in BACKENDS:
+            raise ValueError(f"Almacenamiento desconocido en la sesión: {backend}")
+        polys = []
+        for _ in range(3):
+            count, ascending = reader.unpack(_TERMS)
+            degrees, coefficients = reader.columns(count)
+            poly = BACKENDS[backend]._from_desc_pairs(list(zip(degrees.tolist(), coefficients.tolist())))
+            if ascending:
+                poly.sort_terms(ascending=True)
+            polys.append(poly)
+        max_entries, max_bytes, entry_count = reader.unpack(_HISTORY)
+        entries = []
+        for _ in range(entry_count):
+            keyframe, ascending, count = reader.unpack(_ENTRY)
+            preview = reader.text() or None # Vacía: se calcula al mostrar la entrada.
+            degrees, coefficients = reader.columns(count)
+            entries.append(HistoryEntry.from_columns(bool(keyframe), degrees, coefficients, bool(ascending), preview))
+        (operation_count,) = reader.unpack(_LENGTH)
+        operations = []
+        for _ in range(operation_count):
+            operation_type, args = json.loads(reader.text())
+            operations.append((operation_type, tuple(args)))
+    except struct.error:
+        raise ValueError("Archivo de sesión incompleto.") from None
+    if entries and not entries[0].keyframe:
+        raise ValueError("El historial de la sesión no empieza con un fotograma clave.")
+
+    model = PolynomialModel(backend, history_entries=max_entries, history_bytes=max_bytes)
+    model.poly1, model.poly2, model.result = polys
+    model.history.restore(entries)
+    for operation_type, args in operations:
+        model.enqueue_operation(operation_type, *args)
+    return model
+
+
+class _Reader:
+    """Cursor de lectura sobre el contenido mapeado de un archivo de sesión."""
+
+    def __init__(self, view):
+        self.view = view
+        self.offset = 0
+
+    def unpack(self, layout):
+        """Lee una estructura de tamaño fijo."""
+        values = layout.unpack_from(self.view, self.offset)
+        self.offset += layout.size
+        return values
+
+    def text(self):
+        """Lee un texto UTF-8 precedido por su longitud."""
+        (length,) = self.unpack(_LENGTH)
+        data = self.view[self.offset:self.offset + length]
+        if len(data) < length:
+            raise struct.error("texto incompleto")
+        self.offset += length
+        return str(data, "utf-8")
+
+    def columns(self, count):
+        """Devuelve las columnas de grados y coeficientes de count términos sin copiarlas."""
+        size = 8 * count
+        if self.offset + 2 * size > len(self.view):
+            raise struct.error("columnas incompletas")
+        degrees = self.view[self.offset:self.offset + size].cast("q")
+        coefficients = self.view[self.offset + size:self.offset + 2 * size].cast("d")
+        self.offset += 2 * size
+        if not _NATIVE_LITTLE_ENDIAN:
+            degrees, coefficients = array('q', degrees), array('d', coefficients)
+            degrees.byteswap()
+            coefficients.byteswap()
+        return degrees, coefficients
+
+
+def _write_text(file, text):
+    """Escribe un texto UTF-8 precedido por su longitud."""
+    data = text.encode("utf-8")
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+
+def _write_columns(file, degrees, coefficients):
+    """Escribe las columnas de grados y coeficientes en little-endian."""
+    for column, typecode in ((degrees, 'q'), (coefficients, 'd')):
+        if _NATIVE_LITTLE_ENDIAN:
+            file.write(column)
+        else:
+            swapped = array(typecode, column)
+            swapped.byteswap()
+            swapped.tofile(file)
+
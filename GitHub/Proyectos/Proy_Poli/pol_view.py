@@ -5,6 +5,9 @@ Este módulo contiene la implementación de la vista para la aplicación de poli
 
 import flet as ft
 
+# Filas que muestra cada panel (historial y cola); "Mostrar más" amplía la ventana en otras tantas.
+PANEL_PAGE = 100
+
 
 class PolynomialView:
     """
@@ -13,21 +16,30 @@ class PolynomialView:
     utilizando la biblioteca Flet.
     """
 
-    def __init__(self, on_add, on_subtract, on_delete, on_search, on_sort_asc, on_sort_desc, on_add_term, on_clear_history, on_undo, on_enqueue_add, on_enqueue_subtract, on_enqueue_add_term, on_enqueue_delete_term, on_enqueue_sort_asc, on_enqueue_sort_desc, on_process_queue):
+    def __init__(self, on_add, on_subtract, on_multiply, on_compose, on_delete, on_search, on_sort_asc, on_sort_desc, on_derivative, on_integral, on_roots, on_add_term, on_clear_history, on_undo, on_enqueue_add, on_enqueue_subtract, on_enqueue_add_term, on_enqueue_delete_term, on_enqueue_sort_asc, on_enqueue_sort_desc, on_process_queue, on_drain_queue, on_export, on_export_result, on_result_edit, on_show_more, on_poly_input):
         """
         Inicializa la vista y todos sus componentes de UI.
 
         Args:
             Todos los parámetros 'on_*' son funciones (manejadores de eventos) del controlador
-            que se asignan a los eventos 'on_click' de los botones correspondientes.
+            que se asignan a los eventos 'on_click' de los botones correspondientes
+            (on_export_result se asigna al 'on_result' del selector de archivos y
+            on_result_edit al 'on_change' del campo del resultado, on_poly_input al 'on_change'
+            de los dos polinomios, y on_show_more se llama después de ampliar la ventana
+            visible del historial o de la cola).
         """
         # Asignación de los manejadores de eventos del controlador a los atributos de la vista.
         self.on_add = on_add
         self.on_subtract = on_subtract
+        self.on_multiply = on_multiply
+        self.on_compose = on_compose
         self.on_delete = on_delete
         self.on_search = on_search
         self.on_sort_asc = on_sort_asc
         self.on_sort_desc = on_sort_desc
+        self.on_derivative = on_derivative
+        self.on_integral = on_integral
+        self.on_roots = on_roots
         self.on_add_term = on_add_term
         self.on_clear_history = on_clear_history
         self.on_undo = on_undo
@@ -38,23 +50,34 @@ class PolynomialView:
         self.on_enqueue_sort_asc = on_enqueue_sort_asc
         self.on_enqueue_sort_desc = on_enqueue_sort_desc
         self.on_process_queue = on_process_queue
+        self.on_drain_queue = on_drain_queue
+        self.on_export = on_export
+        self.on_export_result = on_export_result
+        self.on_result_edit = on_result_edit
+        self.on_show_more = on_show_more
+        self.on_poly_input = on_poly_input
 
         # --- Definición de todos los Controles de la UI ---
 
         self.title = ft.Text("Calculadora de Polinomios", size=28,
                              weight=ft.FontWeight.BOLD, text_align=ft.TextAlign.CENTER)
 
-        # Campos de texto para la entrada de los dos polinomios.
+        # Campos de texto para la entrada de los dos polinomios (el resultado se recalcula al escribir).
         self.poly1_input = ft.TextField(
-            label="Polinomio 1", hint_text="Ej: 3x^2 + 2x - 5", border_radius=10)
+            label="Polinomio 1", hint_text="Ej: 3x^2 + 2x - 5", border_radius=10, on_change=self.on_poly_input)
         self.poly2_input = ft.TextField(
-            label="Polinomio 2", hint_text="Ej: x^2 - 1", border_radius=10)
+            label="Polinomio 2", hint_text="Ej: x^2 - 1", border_radius=10, on_change=self.on_poly_input)
 
         # Botones para operaciones directas.
         self.add_button = ft.ElevatedButton(
             text="Sumar", on_click=self.on_add, icon=ft.Icons.ADD, width=180, height=40)
         self.subtract_button = ft.ElevatedButton(
             text="Restar", on_click=self.on_subtract, icon=ft.Icons.REMOVE, width=180, height=40)
+        self.multiply_button = ft.ElevatedButton(
+            text="Multiplicar", on_click=self.on_multiply, icon=ft.Icons.CLOSE, width=180, height=40)
+        self.compose_button = ft.ElevatedButton(
+            text="Componer", on_click=self.on_compose, icon=ft.Icons.FUNCTIONS, width=180, height=40,
+            tooltip="Polinomio 1 evaluado en el Polinomio 2: p1(p2(x))")
         self.undo_button = ft.ElevatedButton(
             text="Deshacer", on_click=self.on_undo, icon=ft.Icons.UNDO, width=180, height=40)
 
@@ -89,6 +112,14 @@ class PolynomialView:
             text="Ordenar Asc", on_click=self.on_sort_asc, icon=ft.Icons.ARROW_UPWARD, width=180, height=40)
         self.sort_desc_button = ft.ElevatedButton(
             text="Ordenar Desc", on_click=self.on_sort_desc, icon=ft.Icons.ARROW_DOWNWARD, width=180, height=40)
+        # Derivada y primitiva del polinomio de resultado (se reescriben en su lugar).
+        self.derivative_button = ft.ElevatedButton(
+            text="Derivar", on_click=self.on_derivative, icon=ft.Icons.TRENDING_DOWN, width=180, height=40)
+        self.integral_button = ft.ElevatedButton(
+            text="Integrar", on_click=self.on_integral, icon=ft.Icons.TRENDING_UP, width=180, height=40)
+        # Raíces del polinomio de resultado (se muestran como mensaje).
+        self.roots_button = ft.ElevatedButton(
+            text="Raíces", on_click=self.on_roots, icon=ft.Icons.SCATTER_PLOT, width=180, height=40)
 
         # Botones para encolar operaciones de ordenamiento.
         self.enqueue_sort_asc_button = ft.ElevatedButton(
@@ -99,18 +130,34 @@ class PolynomialView:
         # Controles para mostrar el resultado y mensajes al usuario.
         self.result_title = ft.Text(
             "Resultado:", size=20, weight=ft.FontWeight.W_500)
-        self.result_value = ft.Text(
-            "", size=24, weight=ft.FontWeight.BOLD, selectable=True)
+        # El resultado se puede editar a mano; si solo se muestra una vista previa recortada, queda de solo lectura.
+        self.result_value = ft.TextField(
+            value="", text_size=24, text_style=ft.TextStyle(weight=ft.FontWeight.BOLD),
+            multiline=True, border=ft.InputBorder.NONE, on_change=self.on_result_edit)
         self.user_message = ft.Text("", size=16, color=ft.Colors.GREEN_500)
 
+        # Exportación del resultado completo (la etiqueta de resultado solo muestra una vista previa).
+        self.export_picker = ft.FilePicker(on_result=self.on_export_result)
+        self.export_button = ft.ElevatedButton(
+            text="Exportar", on_click=self.on_export, icon=ft.Icons.SAVE_ALT, width=180, height=40)
+
         # Controles para la visualización y procesamiento de la cola de operaciones.
+        # Los paneles solo muestran una ventana de filas; las claves permiten actualizarlos por diferencias.
         self.queue_view = ft.ListView(height=80, spacing=10)
+        self.queue_keys = []
+        self.queue_limit = PANEL_PAGE
+        self.queue_more_button = ft.TextButton(visible=False, on_click=lambda e: self._show_more("queue", e))
         self.process_queue_button = ft.ElevatedButton(
             text="Procesar Cola", on_click=self.on_process_queue, icon=ft.Icons.PLAY_ARROW, width=180, height=40)
+        self.drain_queue_button = ft.ElevatedButton(
+            text="Procesar Todo", on_click=self.on_drain_queue, icon=ft.Icons.FAST_FORWARD, width=180, height=40)
 
         # --- Panel de Historial (Derecha) ---
         self.history_view = ft.ListView(
             expand=True, spacing=5, auto_scroll=True)
+        self.history_keys = []
+        self.history_limit = PANEL_PAGE
+        self.history_more_button = ft.TextButton(visible=False, on_click=lambda e: self._show_more("history", e))
         self.clear_history_button = ft.IconButton(
             icon=ft.Icons.DELETE_FOREVER, on_click=self.on_clear_history, tooltip="Limpiar historial")
 
@@ -126,6 +173,7 @@ class PolynomialView:
                     alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 ),
                 ft.Divider(),
+                self.history_more_button,
                 self.history_view,
             ],
             width=350,
@@ -139,8 +187,8 @@ class PolynomialView:
                 self.title,
                 self.poly1_input,
                 self.poly2_input,
-                ft.Row([self.add_button, self.subtract_button, self.undo_button],
-                       alignment=ft.MainAxisAlignment.CENTER, spacing=20),
+                ft.Row([self.add_button, self.subtract_button, self.multiply_button, self.compose_button, self.undo_button],
+                       alignment=ft.MainAxisAlignment.CENTER, spacing=20, wrap=True),
                 ft.Row([self.enqueue_add_button, self.enqueue_subtract_button],
                        alignment=ft.MainAxisAlignment.CENTER, spacing=20),
                 ft.Divider(),
@@ -157,15 +205,19 @@ class PolynomialView:
                        alignment=ft.MainAxisAlignment.CENTER, spacing=20),
                 ft.Row([self.enqueue_sort_asc_button, self.enqueue_sort_desc_button],
                        alignment=ft.MainAxisAlignment.CENTER, spacing=20),
+                ft.Row([self.derivative_button, self.integral_button, self.roots_button],
+                       alignment=ft.MainAxisAlignment.CENTER, spacing=20),
                 ft.Divider(),
-                self.result_title,
+                ft.Row([self.result_title, self.export_button],
+                       alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
                 self.result_value,
                 self.user_message,
                 ft.Divider(),
                 ft.Text("Cola de Operaciones:", size=16),
                 self.queue_view,
-                ft.Row([self.process_queue_button],
-                       alignment=ft.MainAxisAlignment.CENTER),
+                self.queue_more_button,
+                ft.Row([self.process_queue_button, self.drain_queue_button],
+                       alignment=ft.MainAxisAlignment.CENTER, spacing=20),
             ],
             alignment=ft.MainAxisAlignment.START,
             spacing=15,
@@ -196,27 +248,98 @@ class PolynomialView:
 
     # --- Métodos para actualizar la UI ---
 
-    def update_result(self, result_str: str):
-        """Actualiza el campo de texto del resultado."""
+    def update_result(self, result_str: str, editable: bool = True):
+        """Actualiza el campo de texto del resultado.
+
+        Args:
+            result_str (str): Texto a mostrar.
+            editable (bool): False si el texto es una vista previa recortada que no debe editarse.
+        """
         self.result_value.value = result_str
+        self.result_value.read_only = not editable
         self.result_value.update()
 
+    def ask_export_path(self):
+        """Abre el diálogo para elegir el archivo donde se exportará el resultado."""
+        self.export_picker.save_file(
+            dialog_title="Exportar resultado", file_name="resultado.txt", allowed_extensions=["txt"])
+
     def update_message(self, message_str: str):
         """Muestra un mensaje informativo al usuario."""
         self.user_message.value = message_str
         self.user_message.update()
 
-    def update_history(self, history_items: list[str]):
-        """Actualiza la vista del historial con una lista de elementos."""
-        self.history_view.controls.clear()
-        # Muestra el historial en orden inverso (el más reciente arriba).
-        for item in reversed(history_items):
-            self.history_view.controls.append(ft.Text(item, selectable=True))
-        self.history_view.update()
-
-    def update_queue(self, queue_items: list[str]):
-        """Actualiza la vista de la cola con una lista de operaciones."""
-        self.queue_view.controls.clear()
-        for item in queue_items:
-            self.queue_view.controls.append(ft.Text(item))
-        self.queue_view.update()
+    def update_history(self, total: int, rows: list[tuple[int, str]]):
+        """
+        Actualiza la vista del historial solo en las filas que cambiaron.
+
+        Args:
+            total (int): Número total de entradas del historial.
+            rows (list): (número, vista previa) de las entradas visibles, de la más reciente a la más antigua.
+        """
+        # Se muestra de la más antigua a la más reciente; auto_scroll deja visible la última.
+        if _sync_rows(self.history_view, self.history_keys, rows[::-1],
+                      lambda text: ft.Text(text, selectable=True)):
+            self.history_view.update()
+        _update_more_button(self.history_more_button, total - len(rows), "anteriores")
+
+    def update_queue(self, total: int, rows: list[tuple[int, str]]):
+        """
+        Actualiza la vista de la cola solo en las filas que cambiaron.
+
+        Args:
+            total (int): Número total de operaciones en la cola.
+            rows (list): (número, descripción) de las operaciones visibles, de la primera en adelante.
+        """
+        if _sync_rows(self.queue_view, self.queue_keys, rows, ft.Text):
+            self.queue_view.update()
+        _update_more_button(self.queue_more_button, total - len(rows), "más")
+
+    def _show_more(self, panel: str, e):
+        """Amplía la ventana visible del historial o de la cola y pide al controlador que la rellene."""
+        if panel == "history":
+            self.history_limit += PANEL_PAGE
+        else:
+            self.queue_limit += PANEL_PAGE
+        self.on_show_more(e)
+
+
+def _sync_rows(list_view, keys, rows, make_row) -> bool:
+    """
+    Ajusta los controles de una lista a las filas nuevas tocando solo el tramo que cambió.
+    Cada fila se identifica por su número y su texto no cambia, así que basta con
+    conservar el prefijo y el sufijo comunes y reemplazar lo que queda entre ambos.
+
+    Args:
+        list_view (ft.ListView): La lista a actualizar.
+        keys (list): Números de las filas mostradas (se actualiza en el lugar).
+        rows (list): Pares (número, texto) en el orden en que deben mostrarse.
+        make_row (callable): Crea el control de una fila a partir de su texto.
+
+    Returns:
+        bool: True si la lista cambió.
+    """
+    new_keys = [key for key, _ in rows]
+    start = 0
+    limit = min(len(keys), len(new_keys))
+    while start < limit and keys[start] == new_keys[start]:
+        start += 1
+    old_end, new_end = len(keys), len(new_keys)
+    while old_end > start and new_end > start and keys[old_end - 1] == new_keys[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    if start == old_end and start == new_end:
+        return False
+    list_view.controls[start:old_end] = [make_row(text) for _, text in rows[start:new_end]]
+    keys[start:old_end] = new_keys[start:new_end]
+    return True
+
+
+def _update_more_button(button, hidden: int, label: str):
+    """Muestra el botón "Mostrar más" con el número de filas ocultas, o lo oculta si no hay ninguna."""
+    visible = hidden > 0
+    text = f"Mostrar más ({hidden} {label})" if visible else ""
+    if button.visible != visible or button.text != text:
+        button.visible = visible
+        button.text = text
+        button.update()
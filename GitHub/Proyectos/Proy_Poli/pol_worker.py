@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Este módulo contiene el hilo de trabajo que consume la cola de operaciones del modelo.
+Procesar la cola dentro del manejador de un clic bloquea la ventana mientras dura la
+operación; el hilo la procesa en segundo plano, publica el progreso de cada operación
+por un canal seguro entre hilos (por ejemplo, page.pubsub de Flet) y permite seguir
+encolando mientras trabaja.
+"""
+
+import threading
+from collections import namedtuple
+
+# Evento publicado por el hilo de trabajo.
+#   kind:        "start", "done", "error" o "idle".
+#   description: Texto de la operación (vacío en "idle").
+#   processed:   Operaciones terminadas desde que se pidió procesar la cola.
+#   pending:     Operaciones que quedan en la cola.
+#   result:      (vista previa, editable) del resultado tras la operación ("done"), o el mensaje de error ("error").
+WorkerEvent = namedtuple("WorkerEvent", "kind description processed pending result")
+
+
+class QueueWorker:
+    """
+    Hilo que procesa la cola de operaciones de un PolynomialModel.
+    La cola se lee con los métodos del modelo, que la protegen con su propio candado, y cada
+    operación se ejecuta sosteniendo model.lock para que la UI no modifique el estado a la vez.
+    """
+
+    def __init__(self, model, publish):
+        """
+        Args:
+            model (PolynomialModel): El modelo cuya cola se procesa.
+            publish (callable): Función segura entre hilos que recibe cada WorkerEvent.
+        """
+        self.model = model
+        self.publish = publish
+        self._wake = threading.Condition()
+        self._requested = None # Pedido aún no atendido: None, "step" (una a una) o "drain" (cola completa planificada)
+        self._running = None   # Modo que se está procesando, o None
+        self._stopping = False
+        self._thread = None
+
+    def process(self):
+        """Pide procesar la cola operación por operación, guardando cada resultado en el historial."""
+        self._request("step")
+
+    def drain(self):
+        """Pide procesar la cola completa con PolynomialModel.drain_queue (un solo guardado en el historial)."""
+        self._request("drain")
+
+    def stop(self):
+        """Detiene el hilo cuando termine la operación en curso."""
+        with self._wake:
+            self._stopping = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def is_busy(self) -> bool:
+        """Indica si hay un procesamiento pedido o en curso."""
+        with self._wake:
+            return self._requested is not None or self._running is not None
+
+    def _request(self, mode):
+        """Registra el pedido y despierta al hilo, creándolo la primera vez."""
+        with self._wake:
+            # Un drenado pendiente ya procesará lo que un pedido paso a paso encontraría en la cola.
+            if self._requested != "drain":
+                self._requested = mode
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pol-queue-worker", daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def _run(self):
+        """Bucle del hilo: espera pedidos y procesa la cola hasta vaciarla."""
+        while True:
+            with self._wake:
+                while self._requested is None and not self._stopping:
+                    self._wake.wait()
+                if self._stopping:
+                    return
+                # El pedido se atiende ahora: uno que llegue durante el procesamiento (por ejemplo,
+                # pasos pedidos mientras un drenado ya tomó su plan) se atiende en la siguiente vuelta.
+                mode, self._requested = self._requested, None
+                self._running = mode
+            if mode == "drain":
+                self._drain()
+            else:
+                self._process_steps()
+            with self._wake:
+                self._running = None
+            self.publish(WorkerEvent("idle", "", 0, self.model.queued_count(), None))
+
+    def _process_steps(self):
+        """Procesa las operaciones de una en una, incluidas las que se encolen mientras tanto."""
+        processed = 0
+        while not self._stopping:
+            operation = self.model.dequeue_operation()
+            if operation is None:
+                return
+            description = self.model.describe_operation(operation)
+            self.publish(WorkerEvent("start", description, processed, self.model.queued_count(), None))
+            try:
+                with self.model.lock:
+                    self.model.execute_operation(operation)
+                    self.model.push_history()
+                    preview = self.model.get_result_view()
+            except Exception as error: # El hilo debe sobrevivir a una operación fallida.
+                self.publish(WorkerEvent("error", description, processed, self.model.queued_count(), str(error)))
+                continue
+            processed += 1
+            self.publish(WorkerEvent("done", description, processed, self.model.queued_count(), preview))
+
+    def _drain(self):
+        """Procesa la cola completa como un solo plan."""
+        self.publish(WorkerEvent("start", "Procesar todo", 0, self.model.queued_count(), None))
+        try:
+            with self.model.lock:
+                processed = self.model.drain_queue()
+                if processed:
+                    self.model.push_history()
+                preview = self.model.get_result_view()
+        except Exception as error:
+            self.publish(WorkerEvent("error", "Procesar todo", 0, self.model.queued_count(), str(error)))
+            return
+        self.publish(WorkerEvent("done", "Procesar todo", processed, self.model.queued_count(), preview))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del modelo de polinomios (se ejecutan con pytest desde este directorio).
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+import pol_roots
+from pol_model import BACKENDS, MULTIPOINT_THRESHOLD, Polynomial
+
+
+def _random_poly(cls, degree, rng):
+    """Polinomio denso de coeficientes enteros aleatorios no nulos."""
+    return cls.from_terms([(float(rng.choice([-3, -2, -1, 1, 2, 3])), d) for d in range(degree + 1)])
+
+
+def test_gcd_recovers_common_factor():
+    """El MCD de c·d1 y c·d2 con cofactores aleatorios de grado 200 es c mónico, no 1."""
+    rng = random.Random(0)
+    for cls in BACKENDS.values():
+        common = cls.from_terms([(1.0, 1), (-1.0, 0)])
+        a = _random_poly(cls, 200, rng) * common
+        b = _random_poly(cls, 200, rng) * common
+        assert list(a.gcd(b)._desc_pairs()) == [(1, 1.0), (0, -1.0)]
+
+
+def test_gcd_high_degree_common_factor():
+    """Un factor común de grado 250 en polinomios de grado 500 se recupera exactamente."""
+    rng = random.Random(1)
+    cls = BACKENDS["persistent"]
+    common = _random_poly(cls, 250, rng)
+    a = common * _random_poly(cls, 250, rng)
+    b = common * _random_poly(cls, 250, rng)
+    pairs = list(common._desc_pairs())
+    lead = pairs[0][1]
+    assert list(a.gcd(b)._desc_pairs()) == [(degree, c / lead) for degree, c in pairs]
+
+
+def test_multipoint_auto_close_to_horner():
+    """En modo "auto" (árbol de subproductos) el error relativo frente a Horner no pasa de 1e-4."""
+    rng = np.random.default_rng(0)
+    n = MULTIPOINT_THRESHOLD
+    poly = Polynomial._from_dense(rng.standard_normal(n))
+    points = np.exp(2j * np.pi * (np.arange(n) + rng.uniform(-0.3, 0.3, n)) / n)
+    horner = poly.evaluate(points, method="horner")
+    auto = poly.evaluate(points)
+    assert not np.array_equal(auto, horner) # Se usó el árbol, no Horner.
+    assert np.abs(auto - horner).max() <= 1e-4 * np.abs(horner).max()
+
+
+def test_multipoint_never_returns_nan():
+    """Con puntos aleatorios en la circunferencia, "multipoint" lanza ValueError y "auto" usa Horner."""
+    rng = np.random.default_rng(1)
+    poly = Polynomial._from_dense(rng.standard_normal(4096))
+    points = np.exp(2j * np.pi * rng.uniform(0, 1, 4096))
+    with pytest.raises(ValueError):
+        poly.evaluate(points, method="multipoint")
+    assert np.isfinite(poly.evaluate(points)).all()
+
+
+def test_real_roots_high_degree_match_descartes(monkeypatch):
+    """Por encima de DESCARTES_MAX_DEGREE (discos de Aberth) salen las mismas raíces que con Descartes."""
+    rng = np.random.default_rng(2)
+    coefficients = rng.standard_normal(pol_roots.DESCARTES_MAX_DEGREE + 89)
+    fast = Polynomial._from_dense(coefficients).real_roots()
+    monkeypatch.setattr(pol_roots, "DESCARTES_MAX_DEGREE", len(coefficients))
+    exact = Polynomial._from_dense(2 * coefficients).real_roots() # Otro polinomio para no usar la caché.
+    assert fast == pytest.approx(exact, abs=1e-11) # Ambas a menos de tolerance=1e-12 de la raíz.
+
+
+def test_real_roots_high_degree_multiple_root_raises():
+    """Con una raíz doble por encima de DESCARTES_MAX_DEGREE se lanza ValueError en lugar de tardar minutos."""
+    rng = np.random.default_rng(3)
+    poly = Polynomial._from_dense(rng.standard_normal(pol_roots.DESCARTES_MAX_DEGREE + 1))
+    with pytest.raises(ValueError):
+        (poly * Polynomial._from_dense(np.array([1.0, -2.0, 1.0]))).real_roots()
@@ -10,18 +10,53 @@ Incluye:
 import collections
 import re
 
+import numpy as np
+
+# Densidad (términos / (grado + 1)) a partir de la cual un polinomio pasa a un vector denso.
+DENSE_THRESHOLD = 0.5
+# Densidad por debajo de la cual un vector denso vuelve al diccionario disperso.
+# La diferencia con DENSE_THRESHOLD evita que el polinomio oscile entre ambas formas.
+SPARSE_THRESHOLD = 0.25
+# Número mínimo de términos para que compense usar el vector denso.
+MIN_DENSE_TERMS = 32
+
 
 class DynamicPolynomial:
-    """Implementación dinámica de un polinomio."""
+    """
+    Implementación dinámica de un polinomio.
+
+    Guarda los coeficientes en un diccionario grado -> coeficiente mientras el
+    polinomio es disperso, y en un vector de NumPy indexado por grado cuando la
+    mayoría de los grados 0..n están ocupados. La representación se ajusta sola
+    tras las operaciones en bloque (suma, resta y análisis de cadenas).
+    """
 
     def __init__(self):
         """Inicializa un polinomio dinámico vacío."""
         self._coefficients = collections.defaultdict(float)
+        self._dense = None  # Vector de coeficientes cuando la representación es densa.
+
+    def is_dense(self):
+        """Indica si el polinomio usa actualmente la representación densa."""
+        return self._dense is not None
 
     def set_coefficient(self, degree, coefficient):
         """Establece el coeficiente para un grado específico."""
         degree = int(degree)
         coefficient = float(coefficient)
+        if self._dense is not None:
+            if 0 <= degree < len(self._dense):
+                self._dense[degree] = coefficient
+                self._trim()
+                return
+            if coefficient == 0:
+                return
+            if 0 <= degree < 2 * len(self._dense):
+                self._dense = np.concatenate((self._dense, np.zeros(degree + 1 - len(self._dense))))
+                self._dense[degree] = coefficient
+                return
+            # Un grado negativo o muy alejado no cabe bien en el vector.
+            self._to_sparse()
         if coefficient != 0:
             self._coefficients[degree] = coefficient
         elif degree in self._coefficients:
@@ -29,44 +64,128 @@ class DynamicPolynomial:
 
     def get_coefficient(self, degree):
         """Retorna el coeficiente para un grado específico."""
+        if self._dense is not None:
+            return float(self._dense[degree]) if 0 <= degree < len(self._dense) else 0
         return self._coefficients.get(degree, 0)
 
     def get_degree(self):
         """Retorna el grado del polinomio."""
+        if self._dense is not None:
+            return max(len(self._dense) - 1, 0)
         return max(self._coefficients.keys()) if self._coefficients else 0
 
     def __add__(self, other):
         """Suma dos polinomios dinámicos."""
-        result = DynamicPolynomial()
-        all_degrees = set(self._coefficients.keys()) | set(
-            other._coefficients.keys())
-        for degree in all_degrees:
-            coeff1 = self.get_coefficient(degree)
-            coeff2 = other.get_coefficient(degree)
-            result.set_coefficient(degree, coeff1 + coeff2)
-        return result
+        return self._combine(other, 1.0)
 
     def __sub__(self, other):
         """Resta dos polinomios dinámicos."""
+        return self._combine(other, -1.0)
+
+    def _combine(self, other, sign):
+        """
+        Calcula self + sign·other eligiendo la ruta según la representación:
+        dos vectores densos se suman directamente, un operando disperso se
+        dispersa sobre una copia del vector denso, y dos dispersos se mezclan
+        por diccionario recorriendo solo los grados presentes.
+        """
         result = DynamicPolynomial()
-        all_degrees = set(self._coefficients.keys()) | set(
-            other._coefficients.keys())
-        for degree in all_degrees:
-            coeff1 = self.get_coefficient(degree)
-            coeff2 = other.get_coefficient(degree)
-            result.set_coefficient(degree, coeff1 - coeff2)
+        dense = self._dense_combine(other, sign)
+        if dense is not None:
+            result._dense = dense
+            result._trim()
+        else:
+            coefficients = dict(self._sparse_items())
+            for degree, coeff in other._sparse_items():
+                value = coefficients.get(degree, 0) + sign * coeff
+                if value != 0:
+                    coefficients[degree] = value
+                else:
+                    coefficients.pop(degree, None)
+            result._coefficients.update(coefficients)
+        result._adapt()
+        return result
+
+    def _dense_combine(self, other, sign):
+        """Devuelve el vector de self + sign·other si algún operando es denso y el resto cabe en él; si no, None."""
+        if self._dense is None and other._dense is None:
+            return None
+        if self._dense is not None and other._dense is not None:
+            result = np.zeros(max(len(self._dense), len(other._dense)))
+            result[:len(self._dense)] += self._dense
+            result[:len(other._dense)] += sign * other._dense
+            return result
+
+        if self._dense is not None:
+            dense, dense_sign, sparse, sparse_sign = self._dense, 1.0, other._coefficients, sign
+        else:
+            dense, dense_sign, sparse, sparse_sign = other._dense, sign, self._coefficients, 1.0
+        if not sparse:
+            return dense_sign * dense
+        # Los grados negativos o muy alejados del vector se dejan a la ruta dispersa.
+        if min(sparse) < 0 or max(sparse) >= 2 * (len(dense) + len(sparse)):
+            return None
+        degrees = np.fromiter(sparse.keys(), dtype=np.int64, count=len(sparse))
+        values = np.fromiter(sparse.values(), dtype=float, count=len(sparse))
+        result = np.zeros(max(len(dense), int(degrees.max()) + 1))
+        result[:len(dense)] = dense_sign * dense
+        result[degrees] += sparse_sign * values
         return result
 
+    def _sparse_items(self):
+        """Recorre los pares (grado, coeficiente) no nulos sin orden particular."""
+        if self._dense is not None:
+            degrees = np.flatnonzero(self._dense)
+            return zip(degrees.tolist(), self._dense[degrees].tolist())
+        return self._coefficients.items()
+
+    def _items_desc(self):
+        """Devuelve los pares (grado, coeficiente) no nulos de mayor a menor grado."""
+        if self._dense is not None:
+            degrees = np.flatnonzero(self._dense)[::-1]
+            return list(zip(degrees.tolist(), self._dense[degrees].tolist()))
+        return sorted(self._coefficients.items(), reverse=True)
+
+    def _trim(self):
+        """Quita los ceros finales del vector denso."""
+        if len(self._dense) and self._dense[-1] != 0:
+            return
+        nonzero = np.flatnonzero(self._dense)
+        self._dense = self._dense[:nonzero[-1] + 1] if len(nonzero) else self._dense[:0]
+
+    def _to_sparse(self):
+        """Pasa a la representación dispersa."""
+        self._coefficients = collections.defaultdict(float, self._sparse_items())
+        self._dense = None
+
+    def _to_dense(self):
+        """Pasa a la representación densa (requiere grados no negativos)."""
+        dense = np.zeros(max(self._coefficients) + 1)
+        degrees = np.fromiter(self._coefficients.keys(), dtype=np.int64, count=len(self._coefficients))
+        dense[degrees] = np.fromiter(self._coefficients.values(), dtype=float, count=len(self._coefficients))
+        self._dense = dense
+        self._coefficients = collections.defaultdict(float)
+
+    def _adapt(self):
+        """Elige la representación según la densidad actual de los términos."""
+        if self._dense is not None:
+            size = len(self._dense)
+            if not size or np.count_nonzero(self._dense) < SPARSE_THRESHOLD * size:
+                self._to_sparse()
+        elif len(self._coefficients) >= MIN_DENSE_TERMS:
+            if (min(self._coefficients) >= 0
+                    and len(self._coefficients) >= DENSE_THRESHOLD * (max(self._coefficients) + 1)):
+                self._to_dense()
+
     def __str__(self):
         """Representación en cadena del polinomio."""
-        if not self._coefficients:
+        items = self._items_desc()
+        if not items:
             return "0"
 
         terms = []
-        sorted_degrees = sorted(self._coefficients.keys(), reverse=True)
 
-        for i, degree in enumerate(sorted_degrees):
-            coeff = self._coefficients[degree]
+        for i, (degree, coeff) in enumerate(items):
             
             # Formato del coeficiente
             if coeff.is_integer():
@@ -150,7 +269,8 @@ class PolynomialModel:
             # Suma al coeficiente existente para manejar términos como '2x + 3x'
             existing_coeff = poly.get_coefficient(degree)
             poly.set_coefficient(degree, existing_coeff + coeff)
-            
+
+        poly._adapt()
         return poly
 
     def set_polynomials(self, poly1_str: str, poly2_str: str):
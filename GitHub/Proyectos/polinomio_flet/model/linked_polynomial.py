@@ -55,12 +55,17 @@ class LinkedPolynomial:
             self.insert_term(sign * coef, exp)
 
     def evaluate(self, x):
-        total = 0
-        curr = self.head
+        """Horner sobre la lista descendente: x^hueco entre grados consecutivos."""
+        if not self.head:
+            return 0
+        total = self.head.coef
+        prev_exp = self.head.exp
+        curr = self.head.next
         while curr:
-            total += curr.coef * (x ** curr.exp)
+            total = total * x ** (prev_exp - curr.exp) + curr.coef
+            prev_exp = curr.exp
             curr = curr.next
-        return total
+        return total * x ** prev_exp
 
     @staticmethod
     def add(p1, p2):